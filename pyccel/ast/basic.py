@@ -8,16 +8,44 @@ This module contains classes from which all pyccel nodes inherit.
 They are:
 - Basic, which provides a python AST
 - PyccelAstNode which describes each PyccelAstNode
+- Visitor, which finds the methods used to treat each node
 """
 import ast
 
-__all__ = ('Basic', 'PyccelAstNode')
+__all__ = ('Basic', 'PyccelAstNode', 'Visitor')
 
 dict_keys   = type({}.keys())
 dict_values = type({}.values())
 iterable_types = (list, tuple, dict_keys, dict_values, set)
 iterable = lambda x : isinstance(x, iterable_types)
 
+# All the types which have been found in the type indexes of the nodes
+_indexed_types  = set()
+# The indexed types which are instances of each searched type
+_matching_types = {}
+# Shared copies of the type indexes, which are often identical
+_interned_types = {}
+
+def _get_matching_types(search_type):
+    """ Get the indexed types which match the type (or tuple of types)
+    used in a get_attribute_nodes or get_user_nodes query
+    """
+    try:
+        return _matching_types[search_type]
+    except KeyError:
+        matching = frozenset(t for t in _indexed_types if issubclass(t, search_type))
+        _matching_types[search_type] = matching
+        return matching
+
+def _intern_types(types):
+    """ Save a set of types in the indexes and return a shared frozenset
+    """
+    types = frozenset(types)
+    if not types <= _indexed_types:
+        _indexed_types.update(types)
+        _matching_types.clear()
+    return _interned_types.setdefault(types, types)
+
 #==============================================================================
 class Immutable:
     """ Superclass for classes which cannot inherit
@@ -26,8 +54,16 @@ class Immutable:
 
 #==============================================================================
 class Basic:
-    """Basic class for Pyccel AST."""
-    __slots__ = ('_user_nodes', '_fst', '_recursion_in_progress')
+    """Basic class for Pyccel AST.
+
+    Each node can hold a type index of the nodes which it contains and a
+    type index of the nodes which use it. These indexes are built by the
+    first get_attribute_nodes or get_user_nodes query which needs them
+    and are discarded when the tree is modified. They allow the queries
+    to skip the parts of the tree which cannot contain any result.
+    """
+    __slots__ = ('_user_nodes', '_fst', '_recursion_in_progress',
+                 '_attribute_types', '_user_types')
     _ignored_types = (Immutable, type)
     _attribute_nodes = None
 
@@ -35,6 +71,8 @@ class Basic:
         self._user_nodes = []
         self._fst = []
         self._recursion_in_progress = False
+        self._attribute_types = None
+        self._user_types = None
         for c_name in self._my_attribute_nodes:
             c = getattr(self, c_name)
 
@@ -113,7 +151,8 @@ class Basic:
                                                        not isinstance(p, excluded_nodes)]
 
             results += [r for p in self._user_nodes if not self.ignore(p) and \
-                                                       not isinstance(p, (search_type, excluded_nodes)) \
+                                                       not isinstance(p, (search_type, excluded_nodes)) and \
+                                                       p._is_used_by_type(search_type) \
                           for r in p.get_user_nodes(search_type, excluded_nodes = excluded_nodes)]
             self._recursion_in_progress = False
             return results
@@ -139,32 +178,130 @@ class Basic:
         self._recursion_in_progress = True
 
         results = []
-        for n in self._my_attribute_nodes:
-            v = getattr(self, n)
-
+        for v in self._attribute_values():
             if isinstance(v, excluded_nodes):
                 continue
 
             elif isinstance(v, search_type):
                 results.append(v)
 
-            elif isinstance(v, tuple):
-                for vi in v:
-                    if isinstance(vi, excluded_nodes):
-                        continue
-                    elif isinstance(vi, search_type):
-                        results.append(vi)
-                    elif not self.ignore(vi):
-                        results.extend(vi.get_attribute_nodes(
-                            search_type, excluded_nodes=excluded_nodes))
-
-            elif not self.ignore(v):
+            elif not self.ignore(v) and v._contains_type(search_type):
                 results.extend(v.get_attribute_nodes(
                     search_type, excluded_nodes = excluded_nodes))
 
         self._recursion_in_progress = False
         return results
 
+    def _attribute_values(self):
+        """ Iterate over the objects stored in the attribute nodes
+        """
+        for c_name in self._my_attribute_nodes:
+            c = getattr(self, c_name)
+            if isinstance(c, tuple):
+                yield from (ci for ci in c if ci is not None)
+            elif c is not None:
+                yield c
+
+    def _user_values(self):
+        """ Iterate over the user nodes
+        """
+        return iter(self._user_nodes)
+
+    def _contains_type(self, search_type):
+        """ Indicates whether an object of the requested type may
+        be found in the attribute nodes of the current object.
+        The type index is built if necessary
+        """
+        if self._recursion_in_progress:
+            return False
+        types = self._attribute_types
+        if types is None:
+            types, _ = self._build_type_index('_attribute_types', Basic._attribute_values)
+        return types is True or not types.isdisjoint(_get_matching_types(search_type))
+
+    def _is_used_by_type(self, search_type):
+        """ Indicates whether an object of the requested type may
+        be found in the user nodes of the current object.
+        The type index is built if necessary
+        """
+        if self._recursion_in_progress:
+            return False
+        types = self._user_types
+        if types is None:
+            types, _ = self._build_type_index('_user_types', Basic._user_values)
+        return types is True or not types.isdisjoint(_get_matching_types(search_type))
+
+    def _build_type_index(self, index_name, neighbours):
+        """ Build the index of the types of all the objects which can be
+        reached from the current object, either through the attribute nodes
+        or through the user nodes. The indexes of the nodes on the way are
+        also built.
+
+        The index of a node which belongs to a cycle (e.g. the call to a
+        recursive function) can only be saved by the first node of the
+        cycle which is visited. The other nodes of the cycle save True,
+        which indicates that any type may be found.
+
+        Parameters
+        ----------
+        index_name : str
+                     '_attribute_types' or '_user_types'
+        neighbours : function
+                     Basic._attribute_values or Basic._user_values
+
+        Results
+        -------
+        types  : frozenset or bool
+                 The types which can be found, or True if they are unknown
+        cycles : set
+                 The ids of the nodes being visited which were found again
+        """
+        self._recursion_in_progress = True
+        types   = set()
+        cycles  = set()
+        unknown = False
+        for n in neighbours(self):
+            types.add(type(n))
+            if Basic.ignore(self, n):
+                continue
+            elif n._recursion_in_progress:
+                cycles.add(id(n))
+                continue
+            n_types = getattr(n, index_name)
+            if n_types is None:
+                n_types, n_cycles = n._build_type_index(index_name, neighbours)
+                cycles.update(n_cycles)
+            if n_types is True:
+                unknown = True
+            else:
+                types.update(n_types)
+        self._recursion_in_progress = False
+
+        types = True if unknown else _intern_types(types)
+        cycles.discard(id(self))
+        setattr(self, index_name, True if cycles else types)
+        return types, cycles
+
+    def _discard_attribute_types(self):
+        """ Discard the type index of the attribute nodes of the current
+        object and of all the objects which use it
+        """
+        if self._attribute_types is not None:
+            self._attribute_types = None
+            for p in self._user_nodes:
+                if not Basic.ignore(self, p):
+                    p._discard_attribute_types()
+
+    def _discard_user_types(self):
+        """ Discard the type index of the user nodes of the current
+        object and of all the objects which it uses
+        """
+        if self._user_types is not None:
+            self._user_types = None
+            for c in self._attribute_values():
+                if not Basic.ignore(self, c):
+                    c._discard_user_types()
+
     def substitute(self, original, replacement, excluded_nodes = ()):
         """
         Substitute object 'original' for object 'replacement' in the code.
@@ -280,6 +417,10 @@ class Basic:
         """ Inform the class about the most recent user of the node
         """
         self._user_nodes.append(user_nodes)
+        # Update the type indexes
+        self._discard_user_types()
+        if not Basic.ignore(self, user_nodes):
+            user_nodes._discard_attribute_types()
 
     def remove_user_node(self, user_node):
         """ Indicate that the current node is no longer used
@@ -293,6 +434,10 @@ class Basic:
         """
         assert(user_node in self._user_nodes)
         self._user_nodes.remove(user_node)
+        # Update the type indexes
+        self._discard_user_types()
+        if not Basic.ignore(self, user_node):
+            user_node._discard_attribute_types()
         if self.is_unused:
             self.invalidate_node()
 
@@ -353,3 +498,47 @@ class PyccelAstNode(Basic):
         self._precision = x.precision
         self._order     = x.order
 
+#==============================================================================
+class Visitor:
+    """
+    Class from which the objects visiting the AST inherit (the semantic
+    parser and the code printers).
+
+    A node is treated by the first method called `<prefix>X` found in the
+    visitor, where X is the name of a class in the method resolution order
+    of the node. The method found for each type of node is saved in a
+    dispatch table which belongs to the visitor class, so the search is
+    only done once per type of node.
+    """
+    __slots__ = ()
+    _visitor_prefix = None
+    _dispatch_table = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch_table = {}
+
+    @classmethod
+    def _add_to_dispatch_table(cls, node_type):
+        """
+        Find the method which treats a type of node and save it in the
+        dispatch table.
+
+        Parameters
+        ----------
+        node_type : type
+                    The type of the visited node
+
+        Returns
+        -------
+        method : function
+                 The method, which must be called with the visitor as its
+                 first argument, or None if the type of node is not handled
+        """
+        method = None
+        for node_cls in node_type.__mro__:
+            method = getattr(cls, cls._visitor_prefix + node_cls.__name__, None)
+            if method is not None:
+                break
+        cls._dispatch_table[node_type] = method
+        return method
@@ -7,9 +7,6 @@
 
 from collections     import OrderedDict
 
-from sympy.logic.boolalg      import And as sp_And
-
-
 from pyccel.errors.errors import Errors
 from pyccel.errors.messages import RECURSIVE_RESULTS_REQUIRED
 
@@ -76,6 +73,7 @@ __all__ = (
     'Return',
     'SeparatorComment',
     'StarredArguments',
+    'SubModule',
     'SymbolicAssign',
     'SymbolicPrint',
     'SympyFunction',
@@ -662,6 +660,7 @@ class CodeBlock(Basic):
         return self.body[-1].lhs
 
     def insert2body(self, obj):
+        obj.set_current_user_node(self)
         self._body = tuple(self.body + (obj,))
 
     def __str__(self):
@@ -1079,6 +1078,10 @@ class Module(Basic):
     imports: list, tuple
         list of needed imports
 
+    submodules: list
+        a list of SubModule instances which contain the implementations of
+        the other functions of the module
+
     Examples
     --------
     >>> from pyccel.ast.core import Variable, Assign
@@ -1099,8 +1102,10 @@ class Module(Basic):
     >>> Module('my_module', [], [incr, decr], classes = [Point])
     Module(my_module, [], [FunctionDef(), FunctionDef()], [], [ClassDef(Point, (x, y), (FunctionDef(),), [public], (), [], [])], ())
     """
-    __slots__ = ('_name','_variables','_funcs','_interfaces','_classes','_imports')
-    _attribute_nodes = ('_variables','_funcs','_interfaces','_classes','_imports')
+    __slots__ = ('_name','_variables','_funcs','_interfaces','_classes','_imports',
+                 '_submodules')
+    _attribute_nodes = ('_variables','_funcs','_interfaces','_classes','_imports',
+                        '_submodules')
 
     def __init__(
         self,
@@ -1110,6 +1115,7 @@ class Module(Basic):
         interfaces=(),
         classes=(),
         imports=(),
+        submodules=(),
         ):
         if not isinstance(name, str):
             raise TypeError('name must be a string')
@@ -1148,12 +1154,19 @@ class Module(Basic):
         imports = set(imports)  # for unicity
         imports = tuple(imports)
 
+        if not iterable(submodules):
+            raise TypeError('submodules must be an iterable')
+        for i in submodules:
+            if not isinstance(i, SubModule):
+                raise TypeError('Only a SubModule instance is allowed.')
+
         self._name = name
         self._variables = variables
         self._funcs = funcs
         self._interfaces = interfaces
         self._classes = classes
         self._imports = imports
+        self._submodules = tuple(submodules)
         super().__init__()
 
     @property
@@ -1180,6 +1193,10 @@ class Module(Basic):
     def imports(self):
         return self._imports
 
+    @property
+    def submodules(self):
+        return self._submodules
+
     @property
     def declarations(self):
         return [Declare(i.dtype, i) for i in self.variables]
@@ -1191,6 +1208,47 @@ class Module(Basic):
     def set_name(self, new_name):
         self._name = new_name
 
+class SubModule(Module):
+
+    """Represents a submodule of a module. The functions of a submodule
+    are declared in its parent module, and they can use all the variables
+    and functions of the parent module, but they are compiled separately.
+
+    Parameters
+    ----------
+    name: str
+        name of the submodule
+
+    parent: str
+        name of the parent module
+
+    funcs: list
+        a list of FunctionDef instances
+
+    Examples
+    --------
+    >>> from pyccel.ast.core import Variable, Assign
+    >>> from pyccel.ast.core import FunctionDef, Module, SubModule
+    >>> x = Variable('real', 'x')
+    >>> y = Variable('real', 'y')
+    >>> incr = FunctionDef('incr', [x], [y], [Assign(y,x+1)])
+    >>> decr = FunctionDef('decr', [x], [y], [Assign(y,x-1)])
+    >>> sub = SubModule('my_module_fast', 'my_module', [decr])
+    >>> Module('my_module', [], [incr], submodules = [sub])
+    """
+    __slots__ = ('_parent',)
+
+    def __init__(self, name, parent, funcs):
+        if not isinstance(parent, str):
+            raise TypeError('parent must be a string')
+
+        self._parent = parent
+        super().__init__(name, [], funcs)
+
+    @property
+    def parent(self):
+        return self._parent
+
 class ModuleHeader(Basic):
 
     """Represents the header file for a module
@@ -3661,6 +3719,7 @@ def get_iterable_ranges(it, var_name=None):
     # ...
 
     def doit(expr, targets):
+        from sympy.logic.boolalg import And as sp_And
         if isinstance(expr, Relational):
             if str(expr.lhs) in targets and expr.rel_op in ['<', '<=']:
                 return expr.rhs
@@ -12,7 +12,6 @@ from collections import namedtuple
 from numpy import pi
 
 import pyccel.decorators as pyccel_decorators
-from pyccel.symbolic import lambdify
 from pyccel.errors.errors import Errors
 
 from .core          import (AsName, Import, FunctionDef, FunctionCall,
@@ -65,6 +64,7 @@ def builtin_function(expr, args=None):
         return PythonMap(expr.args[0], *args[1:])
 
     if name == 'lambdify':
+        from pyccel.symbolic import lambdify
         return lambdify(expr, args)
 
     return None
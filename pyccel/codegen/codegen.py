@@ -5,11 +5,17 @@
 # go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
 #------------------------------------------------------------------------------------------#
 
+import os
+from collections import OrderedDict
+
 from pyccel.codegen.printing.fcode  import FCodePrinter
 from pyccel.codegen.printing.ccode  import CCodePrinter
 from pyccel.codegen.printing.pycode import PythonCodePrinter
+from pyccel.codegen.utilities      import write_file, optimisation_profiles
+from pyccel.codegen.utilities      import isa_levels as all_isa_levels, default_isa_levels
+from pyccel.codegen.utilities      import multiversioning_available
 
-from pyccel.ast.core      import FunctionDef, Module, Program, Interface, ModuleHeader
+from pyccel.ast.core      import FunctionDef, Module, SubModule, Program, Interface, ModuleHeader
 from pyccel.ast.core      import EmptyNode, Comment, CommentBlock
 from pyccel.ast.headers   import Header
 from pyccel.errors.errors import Errors
@@ -43,6 +49,10 @@ class Codegen(object):
         self._kind     = None
         self._code     = None
         self._language = None
+        self._profile_files = OrderedDict()
+        self._multiversions = OrderedDict()
+        self._isa_files     = OrderedDict()
+        self._isa_variants  = {}
 
         #TODO verify module name != function name
         #it generates a compilation error
@@ -134,6 +144,63 @@ class Codegen(object):
 
         return self.kind == 'program'
 
+    @property
+    def profile_routines(self):
+        """Returns an OrderedDict mapping each optimisation profile chosen
+        with the opt_profile decorator to the functions which use it."""
+
+        routines = OrderedDict()
+        if self.is_module:
+            for f in self.routines:
+                profile = f.decorators.get('opt_profile', None)
+                if profile:
+                    routines.setdefault(profile, []).append(f)
+        return routines
+
+    @property
+    def profile_files(self):
+        """Returns an OrderedDict mapping each optimisation profile to the
+        exported file containing its functions."""
+
+        return self._profile_files
+
+    def profile_module_name(self, profile):
+        """Returns the name of the submodule containing the functions
+        compiled with an optimisation profile."""
+
+        return '{}_{}'.format(self.name, profile)
+
+    @property
+    def multiversions(self):
+        """Returns an OrderedDict mapping each instruction set level, from
+        the most to the least capable, to the functions decorated with
+        multiversion which are compiled for it. It is filled by export."""
+
+        return self._multiversions
+
+    @property
+    def isa_files(self):
+        """Returns an OrderedDict mapping each instruction set level to the
+        exported file containing the versions of the functions compiled for
+        it."""
+
+        return self._isa_files
+
+    def isa_module_name(self, level):
+        """Returns the name of the submodule containing the versions of the
+        functions compiled for an instruction set level."""
+
+        return '{}_{}'.format(self.name, level)
+
+    def isa_variant(self, func, level):
+        """Returns the version of a function compiled for an instruction
+        set level. It is a clone of the function which shares its body."""
+
+        name = '{}_{}'.format(func.name, level)
+        if name not in self._isa_variants:
+            self._isa_variants[name] = func.clone(name)
+        return self._isa_variants[name]
+
     @property
     def ast(self):
         """Returns the AST."""
@@ -253,25 +320,118 @@ class Codegen(object):
         self._code = self._printer.doprint(self.expr)
         return self._code
 
-    def export(self, filename=None, **settings):
-        """Export code in filename"""
+    def _collect_multiversions(self, isa_levels):
+        """Collects the instruction set levels of the functions decorated
+        with multiversion."""
+
+        self._multiversions.clear()
+        if not self.is_module or self._language == 'python' or not multiversioning_available():
+            return
+
+        for level in all_isa_levels:
+            funcs = [f for f in self.routines if 'multiversion' in f.decorators and \
+                        level in (f.decorators['multiversion'] or isa_levels)]
+            if funcs:
+                self._multiversions[level] = funcs
+
+    def export(self, filename=None, isa_levels=None, **settings):
+        """Export code in filename
+
+        The functions decorated with opt_profile are also exported to the
+        files '{filename}.{profile}.{ext}' (see profile_files) and the
+        versions of the functions decorated with multiversion are exported
+        to the files '{filename}.{level}.{ext}' (see isa_files), so that
+        they can be compiled with their own flags.
+
+        isa_levels: the instruction set levels of the functions decorated
+        with multiversion without arguments. Default is default_isa_levels
+        """
         self.set_printer(**settings)
         ext = _extension_registry[self._language]
         header_ext = _header_extension_registry[self._language]
 
         if filename is None: filename = self.name
         header_filename = '{name}.{ext}'.format(name=filename, ext=header_ext)
+        unit_filename = '{name}.{{unit}}.{ext}'.format(name=filename, ext=ext)
         filename = '{name}.{ext}'.format(name=filename, ext=ext)
 
         if header_ext is not None and self.is_module:
             code = self._printer.doprint(ModuleHeader(self.expr))
-            with open(header_filename, 'w') as f:
-                for line in code:
-                    f.write(line)
+            write_file(header_filename, ''.join(code))
+
+        # print the functions which are compiled with their own optimisation profile
+        expr = self.expr
+        submodules = []
+        self._profile_files.clear()
+        profile_routines = self.profile_routines if self._language != 'python' else {}
+        for profile, funcs in profile_routines.items():
+            unit = self._get_profile_module(profile, funcs)
+            if isinstance(unit, SubModule):
+                submodules.append(unit)
+            code = self._printer.doprint(unit)
+            self._profile_files[profile] = unit_filename.format(unit=profile)
+            write_file(self._profile_files[profile], ''.join(code))
+
+        # print the versions of the functions compiled for several instruction set levels
+        self._collect_multiversions(default_isa_levels if isa_levels is None else isa_levels)
+        self._isa_files.clear()
+        self._printer.set_function_variants({self.isa_variant(f, level).name : f
+                                             for level, funcs in self._multiversions.items()
+                                             for f in funcs})
+        for level, funcs in self._multiversions.items():
+            unit = self._get_isa_module(level, funcs)
+            if isinstance(unit, SubModule):
+                submodules.append(unit)
+            code = self._printer.doprint(unit)
+            self._isa_files[level] = unit_filename.format(unit=level)
+            write_file(self._isa_files[level], ''.join(code))
+
+        # The functions must only be defined once. The C functions are
+        # declared in the header of the module and the Fortran functions are
+        # declared in the module and defined in its submodules
+        if profile_routines or submodules:
+            moved = [f for funcs in profile_routines.values() for f in funcs]
+            expr = Module(self.name,
+                          self.variables,
+                          [f for f in self.routines if f not in moved],
+                          self.interfaces,
+                          self.classes,
+                          imports=self.imports,
+                          submodules=submodules)
+
+        # Remove the files of the profiles and levels which are no longer used
+        for unit in (*optimisation_profiles, *all_isa_levels):
+            stale_filename = unit_filename.format(unit=unit)
+            if unit not in self._profile_files and unit not in self._isa_files \
+                    and os.path.isfile(stale_filename):
+                os.remove(stale_filename)
+
         # print module or program code
-        self._code = self._printer.doprint(self.expr)
-        with open(filename, 'w') as f:
-            for line in self._code:
-                f.write(line)
+        self._code = self._printer.doprint(expr)
+        write_file(filename, ''.join(self._code))
 
         return filename
+
+    def _get_profile_module(self, profile, funcs):
+        """Returns the module containing the functions compiled with an
+        optimisation profile."""
+
+        if self._language == 'c':
+            # The functions are declared in the header of the module
+            return Module(self.name, [], funcs, imports=self.imports)
+
+        # The Fortran functions are defined in a submodule, which can use all
+        # the variables and functions of the module
+        return SubModule(self.profile_module_name(profile), self.name, funcs)
+
+    def _get_isa_module(self, level, funcs):
+        """Returns the module containing the versions of the functions
+        compiled for an instruction set level."""
+
+        variants = [self.isa_variant(f, level) for f in funcs]
+        if self._language == 'c':
+            return Module(self.name, [], variants, imports=self.imports)
+
+        # The Fortran functions are defined in a submodule, which can use all
+        # the variables and functions of the module
+        return SubModule(self.isa_module_name(level), self.name, variants)
@@ -0,0 +1,152 @@
+# coding: utf-8
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+"""
+Module containing the BuildManifest class which records the inputs of the
+files built in a __pyccel__ folder, in order to avoid rebuilding them when
+nothing has changed
+"""
+
+import hashlib
+import json
+import os
+
+from pyccel.version import __version__
+
+__all__ = ['BuildManifest', 'hash_file']
+
+#==============================================================================
+def hash_file(filename):
+    """
+    Compute the hash of the contents of a file.
+
+    Parameters
+    ----------
+    filename : str
+               The path to the file
+
+    Returns
+    -------
+    hash : str
+           The hexadecimal SHA-256 hash of the file, or None if the
+           file cannot be read
+    """
+    hasher = hashlib.sha256()
+    try:
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                hasher.update(chunk)
+    except OSError:
+        return None
+    return hasher.hexdigest()
+
+def _normalise(value):
+    """ Convert a value to the form it takes once saved in a JSON file
+    """
+    return json.loads(json.dumps(value, default=str))
+
+#==============================================================================
+class BuildManifest:
+    """
+    Manifest of the units built in a folder.
+
+    For each unit (usually a translated Python file) the manifest records
+    the options used for the build, the hashes of all the files which
+    were used as inputs (the source file, the imported files and the
+    objects it is linked with) and the list of files which were
+    generated. A unit whose options and inputs are unchanged and whose
+    outputs still exist does not need to be rebuilt.
+
+    The manifest is saved in the file 'manifest.json' in the folder. It is
+    re-read before each update and replaced atomically, so a concurrent
+    build can at worst lose an entry, which only causes the corresponding
+    unit to be rebuilt.
+
+    Parameters
+    ----------
+    folder : str
+             The folder where the manifest is saved (e.g. __pyccel__)
+    """
+    filename = 'manifest.json'
+
+    def __init__(self, folder):
+        self._path    = os.path.join(folder, self.filename)
+        self._entries = self._load()
+
+    def _load(self):
+        """ Read the entries saved in the manifest file
+        """
+        try:
+            with open(self._path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == __version__:
+                return data['units']
+        except (OSError, ValueError, KeyError):
+            pass
+        return {}
+
+    def __contains__(self, unit):
+        return unit in self._entries
+
+    def is_up_to_date(self, unit, **options):
+        """
+        Indicate whether a unit can be used without being rebuilt.
+
+        Parameters
+        ----------
+        unit    : str
+                  The name of the unit (usually the path to its source file)
+        options : dict
+                  The options of the current build. Only the options which
+                  are provided are compared with the recorded options
+
+        Returns
+        -------
+        up_to_date : bool
+                  True if the options and the hashes of the inputs are
+                  unchanged and all the outputs exist
+        """
+        entry = self._entries.get(unit, None)
+        if entry is None:
+            return False
+
+        recorded = entry['options']
+        if any(k not in recorded or recorded[k] != v for k, v in _normalise(options).items()):
+            return False
+
+        if any(hash_file(f) != h for f, h in entry['inputs'].items()):
+            return False
+
+        return all(os.path.exists(f) for f in entry['outputs'])
+
+    def update(self, unit, inputs, outputs, **options):
+        """
+        Record the build of a unit and save the manifest.
+
+        Parameters
+        ----------
+        unit    : str
+                  The name of the unit (usually the path to its source file)
+        inputs  : iterable
+                  The files which were used to build the unit
+        outputs : iterable
+                  The files which were generated by the build
+        options : dict
+                  The options of the build
+        """
+        self._entries = self._load()
+        self._entries[unit] = {
+                'options' : _normalise(options),
+                'inputs'  : {f : hash_file(f) for f in inputs},
+                'outputs' : list(outputs),
+            }
+
+        tmp_path = '{}.{}.tmp'.format(self._path, os.getpid())
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({'version' : __version__, 'units' : self._entries}, f, indent=1)
+            os.replace(tmp_path, self._path)
+        except OSError:
+            pass
@@ -0,0 +1,250 @@
+# coding: utf-8
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+"""
+Module containing the functions which drive a profile-guided optimisation
+(PGO) build: the code is first compiled with instrumentation, a training
+workload is run on the instrumented build to record a profile, and the code
+is then compiled again using this profile
+"""
+
+import importlib
+import os
+import pickle
+import runpy
+import shutil
+import subprocess
+import sys
+import types
+
+__all__ = ['get_profile_dir', 'has_profile', 'build_with_pgo',
+           'run_training_script', 'run_training_function', 'FunctionTraining']
+
+# name of the file which identifies the build that a profile was recorded for
+_key_filename = 'profile.key'
+
+# name under which the main script of the caller is run by the training process
+_main_name = '__pyccel_main__'
+
+# indicates whether the current process is running a training function
+_in_training = False
+
+#==============================================================================
+def get_profile_dir(pyccel_dirpath, module_name):
+    """
+    Get the folder where the profile of a module is stored.
+
+    The profile is stored with the other build artefacts, so later builds
+    of the same module reuse it.
+
+    Parameters
+    ----------
+    pyccel_dirpath : str
+                     The '__pyccel__' folder where the module is built
+    module_name    : str
+                     The name of the module
+
+    Returns
+    -------
+    folder : str
+             The absolute path to the folder containing the profile
+    """
+    return os.path.join(os.path.abspath(pyccel_dirpath), '__pgo__', module_name)
+
+def has_profile(profile_dir, key):
+    """
+    Indicate whether a profile was recorded for a build.
+
+    Parameters
+    ----------
+    profile_dir : str
+                  The folder containing the profile
+    key         : str
+                  A string identifying the code and the options of the build
+
+    Returns
+    -------
+    bool
+          True if the training was completed for this key
+    """
+    try:
+        with open(os.path.join(profile_dir, _key_filename), 'r') as f:
+            return f.read() == key
+    except OSError:
+        return False
+
+#==============================================================================
+def build_with_pgo(build, train, profile_dir, key, verbose = False):
+    """
+    Carry out a profile-guided optimisation build.
+
+    If no profile was recorded for this key, the code is built with
+    instrumentation and the training is run to record the profile. The code
+    is then built with the profile. The two builds must use the same files
+    and folders, as the compilers match the profile data to the object files.
+
+    Parameters
+    ----------
+    build       : callable
+                  Function building the code, which accepts the arguments
+                  profile_generate and profile_use of execute_pyccel
+    train       : callable
+                  Function without arguments running the training workload
+                  on the instrumented build
+    profile_dir : str
+                  The folder where the profile is stored
+    key         : str
+                  A string identifying the code and the options of the build
+                  (a profile recorded with another key is discarded)
+    verbose     : bool
+                  Print the stages of the build
+    """
+    if not has_profile(profile_dir, key):
+        # Discard any outdated or incomplete profile
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        os.makedirs(profile_dir)
+
+        if verbose:
+            print('> Building the instrumented code')
+        build(profile_generate = profile_dir)
+
+        if verbose:
+            print('> Running the training workload')
+        train()
+
+        with open(os.path.join(profile_dir, _key_filename), 'w') as f:
+            f.write(key)
+
+    elif verbose:
+        print('> Reusing the profile saved in {}'.format(profile_dir))
+
+    build(profile_use = profile_dir)
+
+#==============================================================================
+def run_training_script(script, cwd = None):
+    """
+    Run a Python script which trains the instrumented code.
+
+    Parameters
+    ----------
+    script : str
+             The path to the Python script
+    cwd    : str
+             The folder where the script is run
+
+    Raises
+    ------
+    RuntimeError
+             If the script fails
+    """
+    p = subprocess.run([sys.executable, os.path.abspath(script)], cwd=cwd)
+    if p.returncode != 0:
+        raise RuntimeError('The training script {} failed with exit code {}'.format(
+                                script, p.returncode))
+
+def run_training_function(training, module_name, dirpath):
+    """
+    Run a training function on the instrumented module.
+
+    The function is run in a separate process, so that the instrumented
+    module is never imported by the current process (the optimised module
+    has the same name) and so that the profile is saved when the process
+    exits. If the function is defined in the main script, the script is
+    run in the process under a different name (as is done by the spawn
+    method of multiprocessing) so that the function can be found. The
+    script must therefore protect its entry point with
+    `if __name__ == '__main__':`.
+
+    Parameters
+    ----------
+    training    : callable
+                  Function taking the instrumented module as its only
+                  argument. It must be defined at the top level of an
+                  importable module or of the main script so that it can
+                  be sent to the process
+    module_name : str
+                  The name of the instrumented module
+    dirpath     : str
+                  The folder containing the instrumented module
+
+    Raises
+    ------
+    TypeError
+             If the training function cannot be sent to the process
+    RuntimeError
+             If the training fails
+    """
+    if _in_training:
+        raise RuntimeError('A build was started while the main script was imported by a training '
+                           "process. Protect the entry point of the script with "
+                           "`if __name__ == '__main__':`")
+
+    func = training.training if isinstance(training, FunctionTraining) else training
+    if getattr(func, '__module__', None) == '__main__':
+        main_path = getattr(sys.modules['__main__'], '__file__', None)
+        if main_path is None:
+            raise TypeError('A training function defined in an interactive session cannot be '
+                            'sent to the training process')
+        main_path = os.path.abspath(main_path)
+    else:
+        main_path = None
+
+    try:
+        # The function is unpickled once the path is set in the process
+        request = pickle.dumps((list(sys.path), dirpath, module_name, main_path,
+                                pickle.dumps(training)))
+    except (pickle.PicklingError, AttributeError, TypeError) as e:
+        raise TypeError('The training function must be defined at the top level of a module') from e
+
+    p = subprocess.run([sys.executable, '-c',
+            'from pyccel.codegen.pgo import _train_in_subprocess; _train_in_subprocess()'],
+            input = request)
+    if p.returncode != 0:
+        raise RuntimeError('The training of {} failed with exit code {}'.format(
+                                module_name, p.returncode))
+
+def _train_in_subprocess():
+    """
+    Run a training function in a process started by run_training_function.
+    The request is read from the standard input.
+    """
+    global _in_training # pylint: disable=global-statement
+    _in_training = True
+
+    path, dirpath, module_name, main_path, training = pickle.loads(sys.stdin.buffer.read())
+    sys.path[:] = [dirpath, *path]
+    if main_path is not None:
+        # Re-create the main module of the caller, which defines the function
+        main_module = types.ModuleType(_main_name)
+        main_module.__dict__.update(runpy.run_path(main_path, run_name = _main_name))
+        sys.modules['__main__'] = sys.modules[_main_name] = main_module
+    training = pickle.loads(training)
+    training(importlib.import_module(module_name))
+
+#==============================================================================
+class FunctionTraining:
+    """
+    Training which is run on a function of the instrumented module rather
+    than on the module itself.
+
+    Parameters
+    ----------
+    training : callable
+               Function taking the instrumented function as its only argument
+    name     : str
+               The name of the function in the module
+    """
+    def __init__(self, training, name):
+        self._training = training
+        self._name     = name
+
+    @property
+    def training(self):
+        """ The function taking the instrumented function as its only argument
+        """
+        return self._training
+
+    def __call__(self, module):
+        return self._training(getattr(module, self._name))
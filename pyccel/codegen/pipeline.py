@@ -10,21 +10,30 @@ Contains the execute_pyccel function which carries out the main steps required t
 import os
 import sys
 import shutil
+import tempfile
 from collections import OrderedDict
-from filelock import FileLock
+from functools import partial
 
 from pyccel.errors.errors          import Errors, PyccelError
 from pyccel.errors.errors          import PyccelSyntaxError, PyccelSemanticError, PyccelCodegenError
 from pyccel.errors.messages        import PYCCEL_RESTRICTION_TODO
 from pyccel.parser.parser          import Parser
 from pyccel.codegen.codegen        import Codegen
+from pyccel.codegen.manifest       import BuildManifest
+from pyccel.codegen.runtime        import get_runtime_library, build_runtime_library
+from pyccel.codegen.runtime        import library_filename
 from pyccel.codegen.utilities      import construct_flags
 from pyccel.codegen.utilities      import compile_files
+from pyccel.codegen.utilities      import run_tasks_in_parallel
+from pyccel.codegen.utilities      import get_lto_flags, get_pgo_flags
+from pyccel.codegen.utilities      import optimisation_profiles, replace_profile_flags
+from pyccel.codegen.utilities      import isa_levels as all_isa_levels, get_isa_flags
 from pyccel.codegen.python_wrapper import create_shared_library
+from pyccel.utilities.profiling    import profile_stage
 
 import pyccel.stdlib as stdlib_folder
 
-__all__ = ['execute_pyccel']
+__all__ = ['execute_pyccel', 'get_compiler_settings']
 
 # map internal libraries to their folders inside pyccel/stdlib
 internal_libs = {
@@ -38,6 +47,121 @@ lang_ext_dict = {
     "fortran": ".f90",
 }
 
+#==============================================================================
+def get_unit_objects(obj_root, language):
+    """
+    Get the objects containing the functions of a module which are compiled
+    separately: the functions which use their own optimisation profile (see
+    the opt_profile decorator) and the versions of the functions compiled
+    for several instruction set levels (see the multiversion decorator).
+
+    Parameters
+    ----------
+    obj_root : str
+               The path to the object of the module without its extension
+    language : str
+               The language of the generated code
+
+    Returns
+    -------
+    obj_roots : list of str
+                The paths to the objects without their extension
+    """
+    ext = lang_ext_dict.get(language, None)
+    if ext is None:
+        return []
+    return ['{}.{}'.format(obj_root, u) for u in (*optimisation_profiles, *all_isa_levels)
+            if os.path.isfile('{}.{}{}'.format(obj_root, u, ext))]
+
+#==============================================================================
+def get_compiler_settings(language, compiler, mpi_compiler, fflags, accelerator,
+                          debug, lto, libs, opt_profile = None):
+    """
+    Choose the compiler, the flags and the libraries used to build the
+    code generated in a language.
+
+    Parameters
+    ----------
+    language     : str
+                   The language which pyccel is translating to
+    compiler     : str
+                   The compiler chosen by the user, or None
+    mpi_compiler : str
+                   The compiler used when mpi is needed, or None
+    fflags       : str
+                   The flags chosen by the user, or None
+    accelerator  : str
+                   Tool used to accelerate the code (e.g. openmp)
+    debug        : bool
+                   Indicates whether the code is compiled in debug mode
+    lto          : bool
+                   Indicates whether the code is compiled with link-time optimisation
+    libs         : list
+                   The libraries chosen by the user
+    opt_profile  : str
+                   The optimisation profile used when no flags are chosen
+                   by the user (see codegen.utilities.get_profile_flags)
+                   Default : 'safe'
+
+    Returns
+    -------
+    compiler : str
+               The compiler (None for the 'python' language)
+    f90exec  : str
+               The command which compiles the generated code
+    fflags   : list
+               The compiler flags
+    libs     : list
+               The libraries which are linked
+    """
+    if opt_profile is not None and opt_profile not in optimisation_profiles:
+        raise ValueError("Unknown optimisation profile : {}. Only {} are available.".format(
+                         opt_profile, optimisation_profiles))
+
+    # Choose Fortran compiler
+    if compiler is None:
+        if language == 'fortran':
+            compiler = 'gfortran'
+        elif language == 'c':
+            compiler = 'gcc'
+
+    f90exec = mpi_compiler if mpi_compiler else compiler
+
+    libs = [*libs]
+    if (language == "c"):
+        libs = libs + ['m']
+    if accelerator == 'openmp':
+        if compiler in ["gcc","gfortran"]:
+            if sys.platform == "darwin" and compiler == "gcc":
+                libs = libs + ['omp']
+            else:
+                libs = libs + ['gomp']
+
+        elif compiler == 'ifort':
+            libs.append('iomp5')
+
+    # ...
+    # Construct flags for the compiler (if one is required)
+    if fflags is None and compiler:
+        fflags = construct_flags(f90exec,
+                                 fflags=None,
+                                 debug=debug,
+                                 accelerator=accelerator,
+                                 includes=(),
+                                 lto=lto,
+                                 profile=opt_profile)
+    elif fflags is not None:
+        fflags = fflags.split()
+        if lto:
+            fflags.extend(f for f in get_lto_flags(f90exec) if f not in fflags)
+    else:
+        fflags = [] # Used for python
+
+    # Build position-independent code, suited for use in shared library
+    fflags.append('-fPIC')
+
+    return compiler, f90exec, fflags, libs
+
 #==============================================================================
 # NOTE:
 # [..]_dirname is the name of a directory
@@ -61,13 +185,22 @@ def execute_pyccel(fname, *,
                    libs          = (),
                    debug         = False,
                    accelerator   = None,
-                   output_name   = None):
+                   output_name   = None,
+                   jobs          = None,
+                   lto           = False,
+                   profile_generate = None,
+                   profile_use   = None,
+                   opt_profile   = None,
+                   isa_levels    = None,
+                   shared_runtime = False):
     """
     Carries out the main steps required to execute pyccel
     - Parses the python file (syntactic stage)
     - Annotates the abstract syntax tree (semantic stage)
     - Generates the translated file(s) (codegen stage)
+    - Generates the imported modules which have not yet been compiled
     - Compiles the files to generate an executable and/or a shared library
+      (independent files are compiled in parallel)
 
     Parameters
     ----------
@@ -137,6 +270,46 @@ def execute_pyccel(fname, *,
     output_name   : str
                     Name of the generated module
                     Default : Same name as the file which was translated
+
+    jobs          : int
+                    Maximum number of files compiled simultaneously
+                    Default : number of processors on the machine
+
+    lto           : bool
+                    Boolean indicating whether the generated code, its interface and
+                    its wrapper should be compiled with link-time optimisation
+                    Default : False
+
+    profile_generate : str
+                    Folder where the generated code, instrumented for profile-guided
+                    optimisation, saves its profile when it is run
+                    Default : None (no instrumentation)
+
+    profile_use   : str
+                    Folder containing the profile used to optimise the generated code
+                    (see pyccel.codegen.pgo)
+                    Default : None (no profile-guided optimisation)
+
+    opt_profile   : str
+                    Optimisation profile used to choose the compiler flags when they
+                    are not given by fflags. One among ('safe', 'fast', 'native', 'debug').
+                    The opt_profile decorator chooses a different profile for a function
+                    Default : 'safe'
+
+    isa_levels    : iterable
+                    Instruction set levels for which the functions decorated with
+                    multiversion (without arguments) are also compiled. The wrapper
+                    uses the best version for the processor. Each one among
+                    ('avx512', 'avx2', 'sse4')
+                    Default : ('avx512', 'avx2')
+
+    shared_runtime : bool
+                    Boolean indicating whether the generated code is linked with a
+                    shared runtime library (built from pyccel/stdlib) stored in the
+                    cache folder, instead of a static one. The outputs then load the
+                    library from the cache folder, so they cannot be moved to another
+                    machine and they break if the runtime is evicted from the cache
+                    Default : False
     """
 
     # Reset Errors singleton before parsing a new file
@@ -190,48 +363,65 @@ def execute_pyccel(fname, *,
     if language is None:
         language = 'fortran'
 
-    # Choose Fortran compiler
-    if compiler is None:
-        if language == 'fortran':
-            compiler = 'gfortran'
-        elif language == 'c':
-            compiler = 'gcc'
-
-    f90exec = mpi_compiler if mpi_compiler else compiler
-
-    if (language == "c"):
-        libs = libs + ['m']
-    if accelerator == 'openmp':
-        if compiler in ["gcc","gfortran"]:
-            if sys.platform == "darwin" and compiler == "gcc":
-                libs = libs + ['omp']
-            else:
-                libs = libs + ['gomp']
-
-        elif compiler == 'ifort':
-            libs.append('iomp5')
-
+    if isa_levels is not None:
+        isa_levels = tuple(isa_levels)
+        if any(l not in all_isa_levels for l in isa_levels):
+            raise ValueError("Unknown instruction set level in {}. Only {} are available.".format(
+                             isa_levels, all_isa_levels))
+
+    # The profile whose flags are replaced for the functions decorated with opt_profile
+    base_profile = None if fflags else (opt_profile or 'safe')
+
+    compiler, f90exec, fflags, libs = get_compiler_settings(language, compiler, mpi_compiler,
+                                                            fflags, accelerator, debug, lto, libs,
+                                                            opt_profile)
+
+    # Flags for profile-guided optimisation. They are only used for the
+    # generated code, not for the runtime libraries
+    pgo_flags = []
+    if compiler and profile_generate:
+        pgo_flags = get_pgo_flags(f90exec, 'generate', profile_generate)
+    elif compiler and profile_use:
+        pgo_flags = get_pgo_flags(f90exec, 'use', profile_use)
     # ...
-    # Construct flags for the compiler (if one is required)
-    if fflags is None and compiler:
-        fflags = construct_flags(f90exec,
-                                 fflags=None,
-                                 debug=debug,
-                                 accelerator=accelerator,
-                                 includes=())
-    elif fflags is not None:
-        fflags = fflags.split()
-    else:
-        fflags = [] # Used for python
 
-    # Build position-independent code, suited for use in shared library
-    fflags.append('-fPIC')
-    # ...
+    # Skip the build if the file, its imports and the options are unchanged
+    build_options = dict(language     = language,
+                         compiler     = compiler,
+                         mpi_compiler = mpi_compiler,
+                         fflags       = tuple(fflags),
+                         includes     = tuple(includes),
+                         libdirs      = tuple(libdirs),
+                         modules      = tuple(modules),
+                         libs         = tuple(libs),
+                         debug        = debug,
+                         accelerator  = accelerator,
+                         output_name  = output_name,
+                         folder       = folder,
+                         convert_only = convert_only,
+                         lto          = lto,
+                         pgo_flags    = tuple(pgo_flags),
+                         opt_profile  = opt_profile,
+                         isa_levels   = isa_levels,
+                         shared_runtime = shared_runtime)
+    # The imported modules are rebuilt when the options which affect their
+    # objects change. The other options only describe the main module
+    dependency_options = {k : v for k, v in build_options.items()
+                          if k not in ('output_name', 'folder', 'convert_only')}
+
+    manifest = BuildManifest(pyccel_dirpath)
+    if not (syntax_only or semantic_only) and \
+            manifest.is_up_to_date(pymod_filepath, **build_options):
+        if verbose:
+            print('> {} is up to date'.format(pymod_filepath))
+        os.chdir(base_dirpath)
+        return
 
     # Parse Python file
     try:
-        parser = Parser(pymod_filepath, show_traceback=verbose)
-        parser.parse(verbose=verbose)
+        with profile_stage('syntax', module=module_name):
+            parser = Parser(pymod_filepath, show_traceback=verbose)
+            parser.parse(verbose=verbose)
     except NotImplementedError as error:
         msg = str(error)
         errors.report(msg+'\n'+PYCCEL_RESTRICTION_TODO,
@@ -249,7 +439,8 @@ def execute_pyccel(fname, *,
     # Annotate abstract syntax Tree
     try:
         settings = {'verbose':verbose}
-        parser.annotate(**settings)
+        with profile_stage('semantic', module=module_name):
+            parser.annotate(**settings)
     except NotImplementedError as error:
         msg = str(error)
         errors.report(msg+'\n'+PYCCEL_RESTRICTION_TODO,
@@ -266,6 +457,19 @@ def execute_pyccel(fname, *,
     if semantic_only:
         return
 
+    # Collect the source files of all the imported modules
+    def get_source_files(parser, files):
+        for son in parser.sons:
+            if son.filename not in files:
+                if os.path.isfile(son.filename):
+                    files.append(son.filename)
+                get_source_files(son, files)
+        return files
+
+    source_files = get_source_files(parser, [pymod_filepath])
+    linked_files = []
+    output_files = []
+
     if parser.module_parser:
         parsers = [parser.module_parser, parser]
         program_name = os.path.basename(os.path.splitext(parser.filename)[0])
@@ -280,14 +484,185 @@ def execute_pyccel(fname, *,
 
     internal_libs_name = set()
     internal_libs_path = []
-    internal_libs_files = []
+    runtime_libs = []
+    runtime_libdirs = []
+
+    # Iterate over the internal_libs list and determine if the printer
+    # requires an internal lib to be included. For a conversion the
+    # libraries which are needed are copied to the __pyccel__ directory.
+    # Otherwise the generated code is linked with the runtime library
+    # built from the internal lib (a static library unless shared_runtime
+    # is requested), and the construction of this library (which only
+    # happens the first time it is used) is added to the dictionary of tasks
+    def add_internal_lib_tasks(codegen, tasks):
+        for lib in internal_libs:
+            if lib in codegen.get_printer_imports():
+                # get the include folder path and library files
+                if lib not in internal_libs_name:
+                    # get the library folder name
+                    lib_name = internal_libs[lib]
+
+                    # Internal lib are added to internal_libs_name set
+                    internal_libs_name.add(lib)
+
+                    if convert_only:
+                        # get lib path (stdlib_path/lib_name)
+                        lib_path = os.path.join(stdlib_path, lib_name)
+                        # copy library folder from pyccel stdlib
+                        lib_dest_path = os.path.join(pyccel_dirpath, lib_name)
+                        if not os.path.exists(lib_dest_path):
+                            # Copy to a private folder which is then renamed
+                            # so that concurrent builds never see a partial copy
+                            tmp_path = tempfile.mkdtemp(prefix='.{}_'.format(lib_name),
+                                                        dir=pyccel_dirpath)
+                            shutil.copytree(lib_path, os.path.join(tmp_path, lib_name))
+                            try:
+                                os.rename(os.path.join(tmp_path, lib_name), lib_dest_path)
+                            except OSError:
+                                # The folder was published by another process
+                                if not os.path.isdir(lib_dest_path):
+                                    raise
+                            finally:
+                                shutil.rmtree(tmp_path, ignore_errors=True)
+                        internal_libs_path.append(lib_dest_path)
+                        continue
+
+                    runtime_options = dict(fflags=fflags, debug=debug,
+                                           accelerator=accelerator,
+                                           shared=shared_runtime)
+                    lib_dirpath, lib_linkname = get_runtime_library(lib_name,
+                                            language, f90exec, **runtime_options)
+                    tasks[lib_dirpath] = (partial(build_runtime_library, lib_name,
+                                            language, f90exec, **runtime_options,
+                                            verbose=verbose), ())
+
+                    # add library path to internal_libs_path
+                    internal_libs_path.append(lib_dirpath)
+                    runtime_libs.append(lib_linkname)
+                    runtime_libdirs.append(lib_dirpath)
+
+    # Names of the tasks building the runtime libraries. These libraries
+    # contain the headers and modules needed to compile the generated code
+    def runtime_tasks(tasks):
+        return [d for d in runtime_libdirs if d in tasks]
+
+    # Add the compilation of the functions which use their own optimisation
+    # profile and of the versions of the functions compiled for several
+    # instruction set levels to the dictionary of tasks. A Fortran file is a
+    # submodule of the module, so it is compiled after this module
+    def add_unit_tasks(codegen, obj_root, flags, output, dependencies, tasks):
+        if language == 'fortran':
+            dependencies = [*dependencies, obj_root]
+        units = [(f, replace_profile_flags(flags, f90exec, base_profile, profile))
+                 for profile, f in codegen.profile_files.items()]
+        units += [(f, [*flags, *get_isa_flags(f90exec, level)])
+                  for level, f in codegen.isa_files.items()]
+        for unit_fname, unit_flags in units:
+            tasks[os.path.splitext(unit_fname)[0]] = (partial(compile_files, unit_fname,
+                                                            f90exec, unit_flags,
+                                                            binary=None,
+                                                            verbose=False,
+                                                            is_module=True,
+                                                            output=output,
+                                                            language=language),
+                                                      dependencies)
+        return [os.path.splitext(f)[0] for f, _ in units]
+
+    # ...
+    # Determine all .o files and all folders needed by executable
+    def get_module_dependencies(parser, mods=(), folders=()):
+        mod_folder = os.path.join(os.path.dirname(parser.filename), "__pyccel__")
+        mod_base = os.path.splitext(os.path.basename(parser.filename))[0]
+
+        # Stop conditions
+        if parser.metavars.get('ignore_at_import', False) or \
+           parser.metavars.get('module_name', None) == 'omp_lib':
+            return mods, folders
+
+        # Update lists
+        obj_root = os.path.join(mod_folder, mod_base)
+        mods = [*mods, obj_root, *get_unit_objects(obj_root, language)]
+        folders = [*folders, mod_folder]
+
+        # Proceed recursively
+        for son in parser.sons:
+            mods, folders = get_module_dependencies(son, mods, folders)
+
+        return mods, folders
+
+    # Generate the code of the imported Python modules which have not been
+    # compiled yet (or which have changed) and add their compilation to the
+    # dictionary of tasks. Return the names of the tasks which the parser
+    # depends on
+    dependency_builds = []
+    def add_dependency_tasks(parser, tasks):
+        dependencies = []
+        for son in parser.sons:
+            # Only modules with an accessible Python source file can be built
+            if son.metavars.get('ignore_at_import', False) or \
+               son.metavars.get('module_name', None) == 'omp_lib' or \
+               not son.filename.endswith('.py') or \
+               not os.path.isfile(son.filename):
+                continue
+
+            mod_folder = os.path.join(os.path.dirname(son.filename), "__pyccel__")
+            mod_base = os.path.splitext(os.path.basename(son.filename))[0]
+            obj_root = os.path.join(mod_folder, mod_base)
+
+            if obj_root not in tasks:
+                son_dependencies = add_dependency_tasks(son, tasks)
+
+                # An existing object is rebuilt if one of its dependencies is
+                # rebuilt, or unless pyccel built it from the same inputs and
+                # with the same options
+                son_manifest = BuildManifest(mod_folder)
+                if os.path.isfile(obj_root + '.o') and not son_dependencies and \
+                        son_manifest.is_up_to_date(son.filename, **dependency_options):
+                    continue
+
+                os.makedirs(mod_folder, exist_ok=True)
+                with profile_stage('codegen', module=mod_base):
+                    son_codegen = Codegen(son.semantic_parser, mod_base)
+                    son_fname = son_codegen.export(obj_root, language=language,
+                                                   isa_levels=isa_levels)
+                add_internal_lib_tasks(son_codegen, tasks)
+
+                son_includes = [*includes, *get_module_dependencies(son)[1], *internal_libs_path]
+                son_flags = construct_flags(f90exec,
+                                            fflags=fflags,
+                                            debug=debug,
+                                            accelerator=accelerator,
+                                            includes=OrderedDict.fromkeys(son_includes))
+                son_flags.extend(pgo_flags)
+                tasks[obj_root] = (partial(compile_files, son_fname, f90exec, son_flags,
+                                            binary=None,
+                                            verbose=False,
+                                            is_module=True,
+                                            output=mod_folder,
+                                            language=language),
+                                   [*son_dependencies, *runtime_tasks(tasks)])
+                son_unit_objs = add_unit_tasks(son_codegen, obj_root, son_flags, mod_folder,
+                                               [*son_dependencies, *runtime_tasks(tasks)],
+                                               tasks)
+                dependency_builds.append((son_manifest, son.filename,
+                                          get_source_files(son, [son.filename]),
+                                          [obj_root + '.o', *(o + '.o' for o in son_unit_objs)]))
+
+            dependencies.append(obj_root)
+
+        return dependencies
+
     for parser, module_name in zip(parsers, module_names):
         semantic_parser = parser.semantic_parser
+        # Compilation tasks, mapping the name of a task to the function
+        # carrying it out and the names of the tasks it depends on
+        tasks = OrderedDict()
         # Generate .f90 file
         try:
-            codegen = Codegen(semantic_parser, module_name)
-            fname = os.path.join(pyccel_dirpath, module_name)
-            fname = codegen.export(fname, language=language)
+            with profile_stage('codegen', module=module_name):
+                codegen = Codegen(semantic_parser, module_name)
+                fname = os.path.join(pyccel_dirpath, module_name)
+                fname = codegen.export(fname, language=language, isa_levels=isa_levels)
         except NotImplementedError as error:
             msg = str(error)
             errors.report(msg+'\n'+PYCCEL_RESTRICTION_TODO,
@@ -301,103 +676,42 @@ def execute_pyccel(fname, *,
             handle_error('code generation')
             raise PyccelCodegenError('Code generation failed')
 
+        output_files.append(fname)
+        output_files.extend(codegen.profile_files.values())
+        output_files.extend(codegen.isa_files.values())
+
         if language == 'python':
             output_file = (output_name + '.py') if output_name else os.path.basename(fname)
             new_location = os.path.join(folder, output_file)
             if verbose:
                 print("cp {} {}".format(fname, new_location))
             shutil.copyfile(fname, new_location)
+            output_files.append(new_location)
             continue
 
-        #------------------------------------------------------
-        # TODO: collect dependencies and proceed recursively
-        # if recursive:
-        #     for dep in parser.sons:
-        #         # Call same function on 'dep'
-        #         pass
-        #------------------------------------------------------
-
-        # Iterate over the internal_libs list and determine if the printer
-        # requires an internal lib to be included.
-        for lib in internal_libs:
-            if lib in codegen.get_printer_imports():
-                # get the include folder path and library files
-                if lib not in internal_libs_name:
-                    # get the library folder name
-                    lib_name = internal_libs[lib]
-                    # get lib path (stdlib_path/lib_name)
-                    lib_path = os.path.join(stdlib_path, lib_name)
-                    # remove library folder to avoid missing files and copy
-                    # new one from pyccel stdlib
-                    lib_dest_path = os.path.join(pyccel_dirpath, lib_name)
-                    with FileLock(lib_dest_path + '.lock'):
-                        if not os.path.exists(lib_dest_path):
-                            shutil.copytree(lib_path, lib_dest_path)
-
-                    # stop after copying lib to __pyccel__ directory for
-                    # convert only
-                    if convert_only:
-                        continue
-
-                    # get library source files
-                    ext = lang_ext_dict[language]
-                    source_files = [os.path.join(lib_dest_path, e) for e in os.listdir(lib_dest_path)
-                                                                if e.endswith(ext)]
-                    internal_modules = [os.path.splitext(f)[0] for f in source_files]
-
-                    # compile library source files
-                    flags = construct_flags(f90exec,
-                                            fflags=fflags,
-                                            debug=debug,
-                                            includes=[lib_dest_path])
-                    try:
-                        for f,l in zip(source_files, internal_modules):
-                            with FileLock(l + '.lock'):
-                                compile_files(f, f90exec, flags,
-                                                binary=None,
-                                                verbose=verbose,
-                                                is_module=True,
-                                                output=lib_dest_path,
-                                                language=language)
-                    except Exception:
-                        handle_error('C {} library compilation'.format(lib))
-                        raise
-
-                    # Add internal lib to internal_libs_name set
-                    internal_libs_name.add(lib)
-                    # add source file without extension to internal_libs_files
-                    internal_libs_files.extend(internal_modules)
-                    # add library path to internal_libs_path
-                    internal_libs_path.append(lib_dest_path)
+        add_internal_lib_tasks(codegen, tasks)
 
         if convert_only:
             continue
 
-        # ...
-        # Determine all .o files and all folders needed by executable
-        def get_module_dependencies(parser, mods=(), folders=()):
-            mod_folder = os.path.join(os.path.dirname(parser.filename), "__pyccel__")
-            mod_base = os.path.splitext(os.path.basename(parser.filename))[0]
-
-            # Stop conditions
-            if parser.metavars.get('ignore_at_import', False) or \
-               parser.metavars.get('module_name', None) == 'omp_lib':
-                return mods, folders
-
-            # Update lists
-            mods = [*mods, os.path.join(mod_folder, mod_base)]
-            folders = [*folders, mod_folder]
-
-            # Proceed recursively
-            for son in parser.sons:
-                mods, folders = get_module_dependencies(son, mods, folders)
+        # Generate the imported modules which are missing
+        try:
+            dependencies = add_dependency_tasks(parser, tasks)
+        except NotImplementedError as error:
+            msg = str(error)
+            errors.report(msg+'\n'+PYCCEL_RESTRICTION_TODO,
+                severity='error')
+        except PyccelError:
+            handle_error('code generation')
+            raise PyccelCodegenError('Code generation failed') from None
 
-            return mods, folders
+        if errors.has_errors():
+            handle_error('code generation')
+            raise PyccelCodegenError('Code generation failed')
 
         dep_mods, inc_dirs = get_module_dependencies(parser)
 
         # Add internal dependencies
-        dep_mods = [*dep_mods, *internal_libs_files]
         inc_dirs = [*inc_dirs, *internal_libs_path]
 
         # Remove duplicates without changing order
@@ -409,6 +723,14 @@ def execute_pyccel(fname, *,
 
         if codegen.is_program:
             modules += [os.path.join(pyccel_dirpath, m) for m in dep_mods[1:]]
+            # A program is linked with all the other objects
+            dependencies = list(tasks.keys())
+        else:
+            dependencies = [*dependencies, *runtime_tasks(tasks)]
+
+        # Link with the runtime libraries
+        libs    = list(OrderedDict.fromkeys([*libs, *runtime_libs]))
+        libdirs = list(OrderedDict.fromkeys([*libdirs, *runtime_libdirs]))
 
 
         # Construct compiler flags
@@ -417,28 +739,58 @@ def execute_pyccel(fname, *,
                                 debug=debug,
                                 accelerator=accelerator,
                                 includes=includes)
+        flags.extend(pgo_flags)
+        if shared_runtime and sys.platform != 'win32':
+            flags.extend('-Wl,-rpath,' + d for d in runtime_libdirs)
 
         # Compile Fortran code
         #
         # TODO: stop at object files, do not compile executable
         #       This allows for properly linking program to modules
         #
+        tasks[os.path.splitext(fname)[0]] = (partial(compile_files, fname, f90exec, flags,
+                                                binary=None,
+                                                verbose=False,
+                                                modules=modules,
+                                                is_module=codegen.is_module,
+                                                output=pyccel_dirpath,
+                                                libs=libs,
+                                                libdirs=libdirs,
+                                                language=language),
+                                             dependencies)
+        unit_objs = add_unit_tasks(codegen, os.path.splitext(fname)[0], flags,
+                                   pyccel_dirpath, dependencies, tasks)
         try:
-            compile_files(fname, f90exec, flags,
-                            binary=None,
-                            verbose=verbose,
-                            modules=modules,
-                            is_module=codegen.is_module,
-                            output=pyccel_dirpath,
-                            libs=libs,
-                            libdirs=libdirs,
-                            language=language)
+            with profile_stage('compilation', module=module_name):
+                results = run_tasks_in_parallel(tasks, jobs=jobs)
         except Exception:
-            handle_error('Fortran compilation')
+            handle_error('compilation')
             raise
 
+        if verbose:
+            for name, (result, wall_time) in results.items():
+                if name in runtime_libdirs:
+                    continue
+                cmd = result[1]
+                print(' '.join(cmd))
+                print('> Compiled {} in {:.2f}s'.format(os.path.basename(name), wall_time))
+
+        # Record the imported modules which were built
+        for son_manifest, unit, inputs, outputs in dependency_builds:
+            son_manifest.update(unit, inputs, outputs, **dependency_options)
+        dependency_builds.clear()
+
+        # Objects from other folders which are linked with this file
+        linked_files.extend(m + '.o' for m in dep_mods[1:] if m not in unit_objs)
+        linked_files.extend(os.path.join(d, library_filename(l, shared_runtime))
+                            for d, l in zip(runtime_libdirs, runtime_libs))
+
         # For a program stop here
         if codegen.is_program:
+            exec_filepath = os.path.join(folder, os.path.splitext(os.path.basename(fname))[0])
+            if sys.platform == "win32":
+                exec_filepath += '.exe'
+            output_files.append(exec_filepath)
             if verbose:
                 exec_filepath = os.path.join(folder, module_name)
                 print( '> Executable has been created: {}'.format(exec_filepath))
@@ -447,19 +799,19 @@ def execute_pyccel(fname, *,
 
         # Create shared library
         try:
-            sharedlib_filepath = create_shared_library(codegen,
-                                                       language,
-                                                       pyccel_dirpath,
-                                                       compiler,
-                                                       mpi_compiler,
-                                                       accelerator,
-                                                       dep_mods,
-                                                       libs,
-                                                       libdirs,
-                                                       includes,
-                                                       flags,
-                                                       output_name,
-                                                       verbose)
+            with profile_stage('wrapper', module=module_name):
+                sharedlib_filepath = create_shared_library(codegen,
+                                                           language,
+                                                           pyccel_dirpath,
+                                                           compiler,
+                                                           dep_mods,
+                                                           libs,
+                                                           libdirs,
+                                                           includes,
+                                                           flags,
+                                                           output_name,
+                                                           verbose,
+                                                           lto = lto)
         except NotImplementedError as error:
             msg = str(error)
             errors.report(msg+'\n'+PYCCEL_RESTRICTION_TODO,
@@ -483,10 +835,16 @@ def execute_pyccel(fname, *,
         target = os.path.join(folder, sharedlib_filename)
         shutil.move(sharedlib_filepath, target)
         sharedlib_filepath = target
+        output_files.extend([os.path.splitext(fname)[0] + '.o', *(o + '.o' for o in unit_objs),
+                             sharedlib_filepath])
 
         if verbose:
             print( '> Shared library has been created: {}'.format(sharedlib_filepath))
 
+    # Record the inputs and outputs of the build
+    manifest.update(pymod_filepath, [*source_files, *OrderedDict.fromkeys(linked_files)],
+                    output_files, **build_options)
+
     # Print all warnings now
     if errors.has_warnings():
         errors.check()
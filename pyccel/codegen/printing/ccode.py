@@ -43,8 +43,6 @@ from pyccel.ast.variable import PyccelArraySize, Variable, VariableAddress
 from pyccel.ast.variable import DottedName
 from pyccel.ast.variable import InhomogeneousTupleVariable
 
-from pyccel.ast.sympy_helper import pyccel_to_sympy
-
 
 from pyccel.codegen.printing.codeprinter import CodePrinter
 
@@ -241,6 +239,7 @@ class CCodePrinter(CodePrinter):
         self._additional_declare = []
         self._additional_args = []
         self._temporary_args = []
+        self._printed_bodies = {}
 
     def get_additional_imports(self):
         """return the additional imports collected in printing stage"""
@@ -328,6 +327,7 @@ class CCodePrinter(CodePrinter):
         declare_dtype = self.find_in_dtype_registry(self._print(rhs.dtype), rhs.precision)
 
         if lhs.is_stack_array:
+            from pyccel.ast.sympy_helper import pyccel_to_sympy
             symbol_map = {}
             used_names_tmp = self._parser.used_names.copy()
             sympy_shapes = [pyccel_to_sympy(s, symbol_map, used_names_tmp) for s in lhs.alloc_shape]
@@ -1204,6 +1204,37 @@ class CCodePrinter(CodePrinter):
 
     def _print_FunctionDef(self, expr):
 
+        # The versions of a function created with clone share its body. The
+        # vector expressions of a body are unravelled in place when it is
+        # printed, so the code of the body is kept for the other versions
+        original = self._function_variants.get(expr.name, expr)
+        if original.name in self._printed_bodies:
+            body, decs = self._printed_bodies[original.name]
+        else:
+            body, decs = self._print_function_body(expr)
+            if original is not expr or \
+                    any(f is expr for f in self._function_variants.values()):
+                self._printed_bodies[original.name] = (body, decs)
+
+        sep = self._print(SeparatorComment(40))
+        imports = ''.join(self._print(i) for i in expr.imports)
+        doc_string = self._print(expr.doc_string) if expr.doc_string else ''
+
+        parts = [sep,
+                 doc_string,
+                '{signature}\n{{\n'.format(signature=self.function_signature(expr)),
+                 imports,
+                 decs,
+                 body,
+                 '}\n',
+                 sep]
+
+        return ''.join(p for p in parts if p)
+
+    def _print_function_body(self, expr):
+        """ Print the body of a function and the declarations of its
+        local variables
+        """
         if len(expr.results) > 1:
             self._additional_args.append(expr.results)
         body  = self._print(expr.body)
@@ -1218,22 +1249,9 @@ class CCodePrinter(CodePrinter):
         decs  = ''.join(self._print(i) for i in decs)
         self._additional_declare.clear()
 
-        sep = self._print(SeparatorComment(40))
         if self._additional_args :
             self._additional_args.pop()
-        imports = ''.join(self._print(i) for i in expr.imports)
-        doc_string = self._print(expr.doc_string) if expr.doc_string else ''
-
-        parts = [sep,
-                 doc_string,
-                '{signature}\n{{\n'.format(signature=self.function_signature(expr)),
-                 imports,
-                 decs,
-                 body,
-                 '}\n',
-                 sep]
-
-        return ''.join(p for p in parts if p)
+        return body, decs
 
     def stored_in_c_pointer(self, a):
         if not isinstance(a, Variable):
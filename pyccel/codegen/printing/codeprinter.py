@@ -7,7 +7,7 @@
 
 
 
-from pyccel.ast.basic import Basic
+from pyccel.ast.basic import Basic, Visitor
 
 from pyccel.ast.core      import Assign
 from pyccel.ast.internals import PyccelSymbol
@@ -21,11 +21,25 @@ __all__ = ["CodePrinter"]
 
 errors = Errors()
 
-class CodePrinter:
+class CodePrinter(Visitor):
     """
     The base class for code-printing subclasses.
     """
     language = None
+    _visitor_prefix = '_print_'
+    _function_variants = {}
+
+    def set_function_variants(self, variants):
+        """
+        Set the versions of the functions which are created with
+        FunctionDef.clone. They share the body and the scope of the
+        original function.
+
+        variants : dict
+            A dictionary mapping the name of each version to the original
+            FunctionDef.
+        """
+        self._function_variants = dict(variants)
 
     def doprint(self, expr, assign_to=None):
         """
@@ -61,16 +75,17 @@ class CodePrinter:
         for the object expr. X is the type of the object expr. If this function
         does not exist then the method resolution order is used to search for
         other compatible _print_X functions. If none are found then an error is
-        raised
+        raised. The function found for each type is saved in the dispatch
+        table of the class (see Visitor)
         """
 
-        classes = type(expr).__mro__
-        for cls in classes:
-            print_method = '_print_' + cls.__name__
-            if hasattr(self, print_method):
-                obj = getattr(self, print_method)(expr)
-                return obj
-        return self._print_not_supported(expr)
+        try:
+            print_method = self._dispatch_table[type(expr)]
+        except KeyError:
+            print_method = self._add_to_dispatch_table(type(expr))
+        if print_method is None:
+            return self._print_not_supported(expr)
+        return print_method(self, expr)
 
     def _get_statement(self, codestring):
         """Formats a codestring with the proper line ending."""
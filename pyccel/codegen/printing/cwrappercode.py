@@ -39,6 +39,8 @@ from pyccel.ast.cwrapper import PyArray_CheckScalar, PyArray_ScalarAsCtype
 
 from pyccel.ast.bind_c   import as_static_function_call
 
+from pyccel.codegen.utilities import get_isa_features
+
 from pyccel.ast.variable  import VariableAddress, Variable, ValuedVariable
 
 from pyccel.errors.errors import Errors
@@ -54,9 +56,11 @@ dtype_registry = {('pyobject'     , 0) : 'PyObject',
 class CWrapperCodePrinter(CCodePrinter):
     """A printer to convert a python module to strings of c code creating
     an interface between python and an implementation of the module in c"""
-    def __init__(self, parser, target_language, **settings):
+    def __init__(self, parser, target_language, multiversions = None, **settings):
         CCodePrinter.__init__(self, parser, **settings)
         self._target_language = target_language
+        self._multiversions = multiversions or {}
+        self._dispatch_functions = {}
         self._cast_functions_dict = OrderedDict()
         self._to_free_PyObject_list = []
         self._function_wrapper_names = dict()
@@ -167,6 +171,9 @@ class CWrapperCodePrinter(CCodePrinter):
         else:
             static_function = function
             static_args = function.arguments
+        # Functions compiled for several instruction set levels are called
+        # through a pointer to the best version
+        static_function = self._dispatch_functions.get(function.name, static_function)
         return static_function, static_args, additional_body
 
     def _get_check_type_statement(self, variable, collect_var):
@@ -997,6 +1004,8 @@ class CWrapperCodePrinter(CCodePrinter):
         else:
             static_funcs = expr.funcs
         function_signatures = ''.join('{};\n'.format(self.function_signature(f)) for f in static_funcs)
+        dispatch_pointers, dispatch_code = self._get_dispatch_code(expr, static_funcs)
+        function_signatures += dispatch_pointers
 
         interface_funcs = [f.name for i in expr.interfaces for f in i.functions]
         funcs = [*expr.interfaces, *(f for f in expr.funcs if f.name not in interface_funcs)]
@@ -1037,10 +1046,12 @@ class CWrapperCodePrinter(CCodePrinter):
 
         init_func = ('PyMODINIT_FUNC PyInit_{mod_name}(void)\n{{\n'
                 'PyObject *m;\n'
+                '{dispatch_code}'
                 'import_array();\n'
                 'm = PyModule_Create(&{module_def_name});\n'
                 'if (m == NULL) return NULL;\n'
-                'return m;\n}}\n'.format(mod_name=expr.name, module_def_name = module_def_name))
+                'return m;\n}}\n'.format(mod_name=expr.name, module_def_name = module_def_name,
+                                          dispatch_code = dispatch_code))
 
         # Print imports last to be sure that all additional_imports have been collected
         imports  = [Import(s) for s in self._additional_imports]
@@ -1077,6 +1088,63 @@ class CWrapperCodePrinter(CCodePrinter):
                     module_def = module_def,
                     init_func = init_func))
 
+    def _get_dispatch_code(self, expr, static_funcs):
+        """
+        Create the pointers through which the functions compiled for several
+        instruction set levels are called, and the code which points them
+        at the best version for the processor when the module is imported.
+
+        Parameters
+        ----------
+        expr         : Module
+                       The module being wrapped
+        static_funcs : list of FunctionDef
+                       The functions called by the wrapper (the bind_c
+                       functions in fortran)
+
+        Returns
+        -------
+        declarations : str
+                       The declarations of the versions and of the pointers
+        init_code    : str
+                       The code choosing the versions
+        """
+        declarations = ''
+        choices      = ''
+        for f, static_f in zip(expr.funcs, static_funcs):
+            versions = self._multiversions.get(f.name, None)
+            if not versions or f.is_private or \
+                    any(isinstance(a, FunctionAddress) for a in f.arguments):
+                continue
+            if self._target_language == 'fortran':
+                versions = OrderedDict((level, as_static_function_call(v, expr.name))
+                                       for level, v in versions.items())
+
+            pointer_name = self.get_new_name(self._global_names, '{}_dispatch'.format(static_f.name))
+            pointer = FunctionAddress(pointer_name, static_f.arguments, static_f.results, [])
+            self._dispatch_functions[f.name] = pointer
+
+            declarations += ''.join('{};\n'.format(self.function_signature(v))
+                                    for v in versions.values())
+            declarations += 'static {} = {};\n'.format(self.function_signature(pointer),
+                                                       static_f.name)
+
+            conditions = [' && '.join('__builtin_cpu_supports("{}")'.format(feature)
+                                      for feature in get_isa_features(level))
+                          for level in versions]
+            choices += 'else '.join('if ({})\n{{\n{} = {};\n}}\n'.format(c, pointer_name, v.name)
+                                    for c, v in zip(conditions, versions.values()))
+
+        if not choices:
+            return declarations, ''
+
+        # The CPU features can only be checked on x86 processors
+        init_code = ('#if defined(__GNUC__) && (defined(__x86_64__) || defined(__i386__))\n'
+                     '__builtin_cpu_init();\n'
+                     '{}'
+                     '#endif\n').format(choices)
+        return declarations, init_code
+
 def cwrappercode(expr, parser, target_language, assign_to=None, **settings):
     """Converts an expr to a string of c wrapper code
 
@@ -12,14 +12,13 @@ www.fortran90.org as much as possible."""
 
 import string
 import re
+import sys
 from itertools import chain
 from collections import OrderedDict
 
 import functools
 import operator
 
-from sympy.core.numbers import NegativeInfinity as NINF
-from sympy.core.numbers import Infinity as INF
 
 from pyccel.ast.basic import PyccelAstNode
 from pyccel.ast.core import get_iterable_ranges
@@ -169,11 +168,11 @@ python_builtin_datatypes = {
 inc_keyword = (r'do\b', r'if\b',
                r'else\b', r'type\b\s*[^\(]',
                r'(recursive )?(pure )?(elemental )?((subroutine)|(function))\b',
-               r'interface\b',r'module\b',r'program\b')
+               r'interface\b',r'module\b',r'submodule\b',r'program\b')
 inc_regex = re.compile('|'.join('({})'.format(i) for i in inc_keyword))
 
 end_keyword = ('do', 'if', 'type', 'function',
-               'subroutine', 'interface','module','program')
+               'subroutine', 'interface','module','submodule','program')
 end_regex_str = '(end ?({}))|(else)'.format('|'.join('({})'.format(k) for k in end_keyword))
 dec_regex = re.compile(end_regex_str)
 
@@ -199,6 +198,7 @@ class FCodePrinter(CodePrinter):
         self._namespace = self.parser.namespace
         self._current_function = None
         self._current_class    = None
+        self._in_submodule     = False
 
         self._additional_code = None
         self._additional_imports = set([])
@@ -333,13 +333,18 @@ class FCodePrinter(CodePrinter):
     def _print_PyccelSymbol(self, expr):
         return expr
 
-    def _print_Module(self, expr):
-        #var_changes = self._handle_fortran_specific_a_prioris(self.parser.get_variables(self._namespace))
-        name = self._print(expr.name)
+    def _get_module_name(self, name):
+        """ Get the name of a module in the generated code
+        """
         name = name.replace('.', '_')
         if not name.startswith('mod_') and self.prefix_module:
             name = '{prefix}_{name}'.format(prefix=self.prefix_module,
                                             name=name)
+        return name
+
+    def _print_Module(self, expr):
+        #var_changes = self._handle_fortran_specific_a_prioris(self.parser.get_variables(self._namespace))
+        name = self._get_module_name(self._print(expr.name))
 
         imports = ''.join(self._print(i) for i in expr.imports)
         imports += 'use, intrinsic :: ISO_C_BINDING\n'
@@ -347,8 +352,13 @@ class FCodePrinter(CodePrinter):
         decs    = ''.join(self._print(i) for i in expr.declarations)
         body    = ''
 
+        # The functions defined in the submodules are declared in the module
+        separate_funcs = [f for s in expr.submodules for f in s.funcs]
+
         # ... TODO add other elements
-        private_funcs = [f.name for f in expr.funcs if f.is_private]
+        # gfortran gives the private functions of a module an internal
+        # linkage, so they could not be used by its submodules
+        private_funcs = [f.name for f in expr.funcs if f.is_private] if not separate_funcs else []
         private = private_funcs
         if private:
             private = ','.join(self._print(i) for i in private)
@@ -362,6 +372,9 @@ class FCodePrinter(CodePrinter):
         interfaces = ''
         if expr.interfaces:
             interfaces = '\n'.join(self._print(i) for i in expr.interfaces)
+        if separate_funcs:
+            interfaces = '\n'.join(a for a in [self._print_separate_interfaces(separate_funcs),
+                                               interfaces] if a)
 
         if expr.funcs:
             body += '\n'.join(''.join([sep, self._print(i), sep]) for i in expr.funcs)
@@ -389,6 +402,37 @@ class FCodePrinter(CodePrinter):
 
         return '\n'.join([a for a in parts if a])
 
+    def _print_separate_interfaces(self, funcs):
+        """ Print the interfaces of the functions of a module which are
+        defined in its submodules
+        """
+        funcs_sigs = []
+        for f in funcs:
+            self._handle_fortran_specific_a_prioris(list(f.arguments) + list(f.results))
+            parts = self.function_signature(f, f.name, is_module_procedure = True)
+            parts = ["{}({}) {}\n".format(parts['sig'], parts['arg_code'], parts['func_end']),
+                    parts['arg_decs'],
+                    'end {} {}\n'.format(parts['func_type'], f.name)]
+            funcs_sigs.append(''.join(a for a in parts))
+        return 'interface\n' + '\n'.join(a for a in funcs_sigs) + 'end interface\n'
+
+    def _print_SubModule(self, expr):
+        name   = self._get_module_name(self._print(expr.name))
+        parent = self._get_module_name(self._print(expr.parent))
+
+        sep = self._print(SeparatorComment(40))
+        self._in_submodule = True
+        body = '\n'.join(''.join([sep, self._print(i), sep]) for i in expr.funcs)
+        self._in_submodule = False
+
+        parts = ['submodule ({}) {}\n'.format(parent, name),
+                 'implicit none\n',
+                 'contains\n',
+                 body,
+                 'end submodule {}\n'.format(name)]
+
+        return '\n'.join([a for a in parts if a])
+
     def _print_Program(self, expr):
         var_changes = self._handle_fortran_specific_a_prioris(self.parser.get_variables(self._namespace))
         name    = 'prog_{0}'.format(self._print(expr.name)).replace('.', '_')
@@ -1257,13 +1301,17 @@ class FCodePrinter(CodePrinter):
         rhs = expr.rhs
         # we don't print Range
         # TODO treat the case of iterable classes
-        if isinstance(rhs, NINF):
-            rhs_code = '-Huge({0})'.format(lhs_code)
-            return '{0} = {1}\n'.format(lhs_code, rhs_code)
-
-        if isinstance(rhs, INF):
-            rhs_code = 'Huge({0})'.format(lhs_code)
-            return '{0} = {1}\n'.format(lhs_code, rhs_code)
+        # Infinities can only come from sympy which is imported lazily
+        if 'sympy' in sys.modules:
+            from sympy.core.numbers import NegativeInfinity as NINF
+            from sympy.core.numbers import Infinity as INF
+            if isinstance(rhs, NINF):
+                rhs_code = '-Huge({0})'.format(lhs_code)
+                return '{0} = {1}\n'.format(lhs_code, rhs_code)
+
+            if isinstance(rhs, INF):
+                rhs_code = 'Huge({0})'.format(lhs_code)
+                return '{0} = {1}\n'.format(lhs_code, rhs_code)
 
         if isinstance(rhs, (PythonRange, Product)):
             return ''
@@ -1550,7 +1598,7 @@ class FCodePrinter(CodePrinter):
     def _print_FunctionAddress(self, expr):
         return expr.name
 
-    def function_signature(self, expr, name):
+    def function_signature(self, expr, name, is_module_procedure = False):
         is_pure      = expr.is_pure
         is_elemental = expr.is_elemental
         out_args = []
@@ -1606,6 +1654,11 @@ class FCodePrinter(CodePrinter):
         if is_elemental:
             sig = 'elemental {}'.format(sig)
 
+        # treate case of a function which is declared in its module and
+        # defined in a submodule
+        if is_module_procedure:
+            sig = 'module {}'.format(sig)
+
         arg_code  = ', '.join(self._print(i) for i in chain( expr.arguments, out_args ))
 
         arg_decs = ''.join(self._print(i) for i in args_decs.values())
@@ -1629,7 +1682,10 @@ class FCodePrinter(CodePrinter):
                     excluded_nodes=FunctionDef)
 
         name = self._print(expr.name)
-        self.set_current_function(name)
+        is_module_procedure = self._in_submodule and self._current_function is None
+        # The versions of a function created with clone use its scope
+        original = self._function_variants.get(expr.name, expr)
+        self.set_current_function(self._print(original.name))
 
         if expr.cls_name:
             for k, m in list(_default_methods.items()):
@@ -1644,7 +1700,7 @@ class FCodePrinter(CodePrinter):
                 if i in name:
                     name = name.replace(i, _default_methods[i])
 
-        sig_parts = self.function_signature(expr, name)
+        sig_parts = self.function_signature(expr, name, is_module_procedure)
         prelude = sig_parts.pop('arg_decs')
         decs = OrderedDict()
         functions = expr.functions
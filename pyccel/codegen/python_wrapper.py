@@ -4,25 +4,25 @@
 # go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
 #------------------------------------------------------------------------------------------#
 
-import sys
-import subprocess
 import os
-import glob
-import warnings
-from filelock import FileLock
+import sys
+from collections import OrderedDict
 
 from pyccel.ast.bind_c                      import as_static_module
 from pyccel.ast.core                        import SeparatorComment
 from pyccel.codegen.printing.fcode          import fcode
 from pyccel.codegen.printing.cwrappercode   import cwrappercode
 from pyccel.codegen.utilities               import compile_files, get_gfortran_library_dir
-from .cwrapper import create_c_setup
+from pyccel.codegen.utilities               import get_lto_flags, write_file
+from pyccel.codegen.toolchain               import Toolchain
 
 from pyccel.errors.errors import Errors
+from pyccel.utilities.profiling import profile_stage
 
 errors = Errors()
 
-__all__ = ['create_shared_library', 'fortran_c_flag_equivalence']
+__all__ = ['create_shared_library', 'generate_wrapper_files', 'build_shared_library',
+           'fortran_c_flag_equivalence', 'get_python_build_config', 'get_extension_compiler']
 
 #==============================================================================
 
@@ -31,20 +31,81 @@ PY_VERSION = sys.version_info[0:2]
 fortran_c_flag_equivalence = {'-Wconversion-extra' : '-Wconversion' }
 
 #==============================================================================
-def create_shared_library(codegen,
-                          language,
-                          pyccel_dirpath,
-                          compiler,
-                          mpi_compiler,
-                          accelerator,
-                          dep_mods,
-                          libs,
-                          libdirs,
-                          includes='',
-                          flags = '',
-                          sharedlib_modname=None,
-                          verbose = False):
+def get_python_build_config():
+    """
+    Get the flags needed to build a Python extension module, as used by
+    distutils. The configuration is read from sysconfig once per
+    interpreter (see pyccel.codegen.toolchain), and the CC, LDSHARED,
+    CFLAGS, CPPFLAGS and LDFLAGS environment variables are applied on top
+    of it, as distutils.sysconfig.customize_compiler does.
+
+    Returns
+    -------
+    config : dict
+            Dictionary containing the commands used by Python to compile
+            ('cc') and link ('ldshared') extensions, the compilation flags
+            ('cflags'), the include directories ('includes'), the libraries
+            and library directories needed on some platforms ('libs',
+            'libdirs') and the file extension of extension modules
+            ('ext_suffix')
+    """
+    config = Toolchain().get_python_info()
+    return {key : (tuple(value) if isinstance(value, list) else value)
+                for key, value in config.items()}
+
+def get_extension_compiler(compiler):
+    """
+    Get the commands used to compile and link the C wrapper of a module.
+
+    Parameters
+    ----------
+    compiler : str
+            The compiler used to compile the generated code
+
+    Returns
+    -------
+    cc       : tuple
+            The command used to compile the wrapper
+    ldshared : tuple
+            The command used to link the shared library
+    """
+    if compiler in ('icc', 'ifort'):
+        return ('icc',), ('icc', '-shared')
+    if sys.platform == 'win32' and compiler in ('gfortran', 'gcc'):
+        return ('gcc',), ('gcc', '-shared')
+    config = get_python_build_config()
+    return config['cc'], config['ldshared']
 
+#==============================================================================
+def generate_wrapper_files(codegen, language, pyccel_dirpath, sharedlib_modname=None):
+    """
+    Print the files which expose a translated module to Python.
+
+    This step uses the annotated syntax tree, which is shared with the
+    other pyccel stages, while the compilation of the files (see
+    build_shared_library) only uses the files.
+
+    Parameters
+    ----------
+    codegen           : Codegen
+                        The code generator of the translated module
+    language          : str
+                        The language of the translated module
+    pyccel_dirpath    : str
+                        The folder where the files are written
+    sharedlib_modname : str
+                        The name of the Python module
+                        Default : the name of the translated module
+
+    Returns
+    -------
+    bind_c_filename  : str
+                        The path to the Fortran module which makes the
+                        functions interoperable with C, or None if the
+                        language is not Fortran
+    wrapper_filename : str
+                        The path to the C wrapper
+    """
     # Consistency checks
     if not codegen.is_module:
         raise TypeError('Expected Module')
@@ -52,119 +113,200 @@ def create_shared_library(codegen,
     # Get module name
     module_name = codegen.name
 
-    # Change working directory to '__pyccel__'
-    base_dirpath = os.getcwd()
-    os.chdir(pyccel_dirpath)
-
     # Name of shared library
     if sharedlib_modname is None:
         sharedlib_modname = module_name
 
-    sharedlib_folder = ''
-
-    if language in ['c', 'fortran']:
-        extra_libs = []
-        extra_libdirs = []
-        if language == 'fortran':
-            # Construct static interface for passing array shapes and write it to file bind_c_MOD.f90
-            new_module_name = 'bind_c_{}'.format(module_name)
-            bind_c_mod = as_static_module(codegen.routines, module_name, new_module_name)
+    # The versions of the functions compiled for several instruction set
+    # levels, from the most to the least capable
+    multiversions = OrderedDict()
+    for level, funcs in codegen.multiversions.items():
+        for f in funcs:
+            multiversions.setdefault(f.name, OrderedDict())[level] = codegen.isa_variant(f, level)
+
+    bind_c_filename = None
+    if language == 'fortran':
+        # Construct static interface for passing array shapes and write it to file bind_c_MOD.f90
+        new_module_name = 'bind_c_{}'.format(module_name)
+        with profile_stage('bind_c', module=module_name):
+            # The versions of the functions compiled for several instruction
+            # set levels are also functions of the module
+            variants = [f for versions in multiversions.values() for f in versions.values()]
+            bind_c_mod = as_static_module([*codegen.routines, *variants], module_name,
+                                          new_module_name)
             bind_c_code = fcode(bind_c_mod, codegen.parser)
-            bind_c_filename = '{}.f90'.format(new_module_name)
-
-            with open(bind_c_filename, 'w') as f:
-                f.writelines(bind_c_code)
-
-            compile_files(bind_c_filename, compiler, flags,
-                binary=None,
-                verbose=verbose,
-                is_module=True,
-                output=pyccel_dirpath,
-                libs=libs,
-                libdirs=libdirs,
-                language=language)
-
-            dep_mods = (os.path.join(pyccel_dirpath,'bind_c_{}'.format(module_name)), *dep_mods)
-            if compiler == 'gfortran':
-                extra_libs.append('gfortran')
-                extra_libdirs.append(get_gfortran_library_dir())
-            elif compiler == 'ifort':
-                extra_libs.append('ifcore')
-
-        if sys.platform == 'win32':
-            extra_libs.append('quadmath')
-
-        module_old_name = codegen.expr.name
-        codegen.expr.set_name(sharedlib_modname)
-        wrapper_code = cwrappercode(codegen.expr, codegen.parser, language)
-        if errors.has_errors():
-            return
+        bind_c_filename = os.path.join(pyccel_dirpath, '{}.f90'.format(new_module_name))
 
+        write_file(bind_c_filename, ''.join(bind_c_code))
+
+    module_old_name = codegen.expr.name
+    codegen.expr.set_name(sharedlib_modname)
+    try:
+        with profile_stage('cwrapper', module=module_name):
+            wrapper_code = cwrappercode(codegen.expr, codegen.parser, language,
+                                        multiversions = multiversions)
+    finally:
         codegen.expr.set_name(module_old_name)
-        wrapper_filename_root = '{}_wrapper'.format(module_name)
-        wrapper_filename = '{}.c'.format(wrapper_filename_root)
 
-        with open(wrapper_filename, 'w') as f:
-            f.writelines(wrapper_code)
+    wrapper_filename = os.path.join(pyccel_dirpath, '{}_wrapper.c'.format(module_name))
+    write_file(wrapper_filename, ''.join(wrapper_code))
+
+    return bind_c_filename, wrapper_filename
+
+def build_shared_library(wrapper_files,
+                         language,
+                         pyccel_dirpath,
+                         compiler,
+                         dep_mods,
+                         libs,
+                         libdirs,
+                         includes = (),
+                         flags = (),
+                         sharedlib_modname = None,
+                         verbose = False,
+                         lto = False):
+    """
+    Compile the files printed by generate_wrapper_files and link them with
+    the translated module into a Python extension module.
+
+    The working directory is not used, so several libraries can be built
+    at the same time by different threads.
+
+    Parameters
+    ----------
+    wrapper_files     : tuple
+                        The files returned by generate_wrapper_files
+    language          : str
+                        The language of the translated module
+    pyccel_dirpath    : str
+                        The folder where the objects are written
+    compiler          : str
+                        The compiler used to compile the translated module
+    dep_mods          : iterable
+                        The objects (without their extension) linked in the library
+    libs              : iterable
+                        The libraries linked in the library
+    libdirs           : iterable
+                        The folders containing the libraries
+    includes          : iterable
+                        The folders containing the headers and Fortran modules
+    flags             : iterable
+                        The flags used to compile the translated module
+    sharedlib_modname : str
+                        The name of the Python module
+    verbose           : bool
+                        Print the compilation commands
+    lto               : bool
+                        Link the objects with link-time optimisation
+
+    Returns
+    -------
+    sharedlib_filepath : str
+                        The absolute path to the shared library
+    """
+    bind_c_filename, wrapper_filename = wrapper_files
+    extra_libs = []
+    extra_libdirs = []
+    if bind_c_filename is not None:
+        compile_files(bind_c_filename, compiler, flags,
+            binary=None,
+            verbose=verbose,
+            is_module=True,
+            output=pyccel_dirpath,
+            libs=libs,
+            libdirs=libdirs,
+            language=language)
+
+        dep_mods = (os.path.splitext(bind_c_filename)[0], *dep_mods)
+        if compiler == 'gfortran':
+            extra_libs.append('gfortran')
+            extra_libdirs.append(get_gfortran_library_dir())
+        elif compiler == 'ifort':
+            extra_libs.append('ifcore')
+
+    if sys.platform == 'win32':
+        extra_libs.append('quadmath')
+
+    c_flags = [fortran_c_flag_equivalence[f] if f in fortran_c_flag_equivalence \
+            else f for f in flags]
+
+    if sys.platform == "darwin" and "-fopenmp" in c_flags and "-Xpreprocessor" not in c_flags:
+        idx = 0
+        while idx < len(c_flags):
+            if c_flags[idx] == "-fopenmp":
+                c_flags.insert(idx, "-Xpreprocessor")
+                idx += 1
+            idx += 1
+
+    # Compile the wrapper with the flags used to build Python extensions
+    config = get_python_build_config()
+    cc, ldshared = get_extension_compiler(compiler)
+    includes = [*includes, *config['includes']]
+
+    wrapper_flags = [*cc[1:], *config['cflags'], *c_flags]
+    wrapper_flags.extend(f for i in includes for f in ('-I', i))
+    compile_files(wrapper_filename, cc[0], wrapper_flags,
+            binary=None,
+            verbose=verbose,
+            is_module=True,
+            output=pyccel_dirpath,
+            language='c')
+    wrapper_obj = os.path.join(pyccel_dirpath,
+                               os.path.splitext(os.path.basename(wrapper_filename))[0] + '.o')
+
+    # Link the wrapper and its dependencies into a shared library
+    sharedlib_filepath = os.path.join(pyccel_dirpath,
+                                      sharedlib_modname + config['ext_suffix'])
+    linker_flags = [*ldshared[1:], *(f for f in c_flags if f.startswith("-Wl"))]
+    if lto:
+        # The objects contain the intermediate representation of the
+        # code, which is optimised as a whole when they are linked.
+        # This allows the kernels to be inlined in the wrapper
+        lto_flags = get_lto_flags(compiler)
+        linker_flags.extend(f for f in c_flags if f.startswith('-O') or f in lto_flags)
+    # The instrumented code must be linked with the profiling runtime
+    linker_flags.extend(f for f in c_flags if f.startswith(('-fprofile-', '-prof-')))
+
+    # The objects are published atomically by compile_files so they can
+    # be read while another process rebuilds them
+    compile_files(wrapper_obj, ldshared[0], linker_flags,
+        binary=sharedlib_filepath,
+        verbose=verbose,
+        modules=dep_mods,
+        is_module=False,
+        libs=[*libs, *extra_libs, *config['libs']],
+        libdirs=[*libdirs, *extra_libdirs, *config['libdirs']],
+        language='c')
+
+    return sharedlib_filepath
 
-        c_flags = [fortran_c_flag_equivalence[f] if f in fortran_c_flag_equivalence \
-                else f for f in flags]
+def create_shared_library(codegen,
+                          language,
+                          pyccel_dirpath,
+                          compiler,
+                          dep_mods,
+                          libs,
+                          libdirs,
+                          includes='',
+                          flags = '',
+                          sharedlib_modname=None,
+                          verbose = False,
+                          lto = False):
 
-        if sys.platform == "darwin" and "-fopenmp" in c_flags and "-Xpreprocessor" not in c_flags:
-            idx = 0
-            while idx < len(c_flags):
-                if c_flags[idx] == "-fopenmp":
-                    c_flags.insert(idx, "-Xpreprocessor")
-                    idx += 1
-                idx += 1
+    if language not in ['c', 'fortran']:
+        return None
 
-        setup_code = create_c_setup(sharedlib_modname, wrapper_filename,
-                dep_mods, compiler, includes, libs + extra_libs, libdirs + extra_libdirs, c_flags)
-        setup_filename = "setup_{}.py".format(module_name)
-
-        with open(setup_filename, 'w') as f:
-            f.writelines(setup_code)
-
-        setup_filename = os.path.join(pyccel_dirpath, setup_filename)
-        cmd = [sys.executable, setup_filename, "build"]
-        if sys.platform == 'win32' and compiler in ('gfortran','gcc','ifort','icc'):
-            cmd += ['--compiler=mingw32']
-
-        if verbose:
-            print(' '.join(cmd))
-        locks = [FileLock(d+'.lock') for d in dep_mods]
-        for l in locks:
-            l.acquire()
-        try:
-            p = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
-            out, err = p.communicate()
-        finally:
-            for l in locks:
-                l.release()
-        if verbose:
-            print(out)
-        if p.returncode != 0:
-            err_msg = "Failed to build module"
-            err_msg += "\n" + err
-            raise RuntimeError(err_msg)
-        if err:
-            warnings.warn(UserWarning(err))
-
-        sharedlib_folder += 'build/lib*/'
-
-    # Obtain absolute path of newly created shared library
-
-    # Set file name extension of Python extension module
-    if os.name == 'nt':  # Windows
-        extext = 'pyd'
-    else:
-        extext = 'so'
-    pattern = '{}{}*.{}'.format(sharedlib_folder, sharedlib_modname, extext)
-    sharedlib_filename = glob.glob(pattern)[0]
-    sharedlib_filepath = os.path.abspath(sharedlib_filename)
-
-    # Change working directory back to starting point
-    os.chdir(base_dirpath)
+    # Name of shared library
+    if sharedlib_modname is None:
+        sharedlib_modname = codegen.name
+
+    pyccel_dirpath = os.path.abspath(pyccel_dirpath)
+    wrapper_files = generate_wrapper_files(codegen, language, pyccel_dirpath,
+                                           sharedlib_modname)
+    if errors.has_errors():
+        return None
 
     # Return absolute path of shared library
-    return sharedlib_filepath
+    return build_shared_library(wrapper_files, language, pyccel_dirpath, compiler,
+                                dep_mods, libs, libdirs, includes, flags,
+                                sharedlib_modname, verbose, lto)
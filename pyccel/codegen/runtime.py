@@ -0,0 +1,260 @@
+# coding: utf-8
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+"""
+Module containing the functions which build the internal libraries of pyccel
+(e.g. ndarrays, pyc_math) into runtime libraries. Each runtime is built once
+per pyccel version, compiler, set of flags and accelerator and stored in a
+cache folder which is shared by all the generated modules.
+
+By default the runtime is a static library which is linked into each
+generated module, so the outputs do not depend on the cache folder. A shared
+runtime can be requested instead: the outputs are then smaller but they are
+linked with an rpath pointing to the cache folder, so they cannot be moved
+to another machine and they break if the runtime is evicted from the cache
+"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from pyccel.version               import __version__
+from pyccel.codegen.manifest      import hash_file
+from pyccel.codegen.utilities     import construct_flags, compile_files
+from pyccel.utilities.cache       import get_cache_dir, use_cached_file, runtime_dirname
+from pyccel.utilities.profiling   import profile_stage
+
+import pyccel.stdlib as stdlib_folder
+
+__all__ = ['get_runtime_cache_dir', 'get_runtime_library', 'build_runtime_library',
+           'library_filename']
+
+# map language to the extension of the source files of the internal libraries
+_source_ext = {
+    "c" : ".c",
+    "fortran": ".f90",
+}
+
+#==============================================================================
+def get_runtime_cache_dir():
+    """
+    Get the folder where the runtime libraries are stored.
+
+    Returns
+    -------
+    folder : str
+             The absolute path to the folder containing the runtime libraries
+             built by this version of pyccel (see get_cache_dir)
+    """
+    return os.path.join(get_cache_dir(), runtime_dirname, __version__)
+
+def library_filename(name, shared = False):
+    """
+    Get the name of the file containing a runtime library.
+
+    Parameters
+    ----------
+    name   : str
+             The name of the library, as passed to the linker (-l<name>)
+    shared : bool
+             Indicates whether the library is a shared library. Static
+             libraries are always used on Windows
+
+    Returns
+    -------
+    filename : str
+           The name of the file (a shared or a static library)
+    """
+    if not shared or sys.platform == 'win32':
+        return 'lib{}.a'.format(name)
+    elif sys.platform == 'darwin':
+        return 'lib{}.dylib'.format(name)
+    else:
+        return 'lib{}.so'.format(name)
+
+def _get_flags(compiler, fflags, debug, accelerator):
+    """ Get the flags used to compile the files of a runtime library
+    """
+    flags = construct_flags(compiler,
+                            fflags=fflags,
+                            debug=debug,
+                            accelerator=accelerator)
+    if sys.platform != 'win32' and '-fPIC' not in flags:
+        flags.append('-fPIC')
+    return flags
+
+#==============================================================================
+def get_runtime_library(lib_folder, language, compiler,
+                        fflags = None,
+                        debug = False,
+                        accelerator = None,
+                        shared = False):
+    """
+    Get the location of the runtime library built from an internal library.
+
+    The library is not built by this function (see build_runtime_library).
+
+    Parameters
+    ----------
+    lib_folder  : str
+                  The name of the folder in pyccel/stdlib which contains
+                  the sources of the internal library (e.g. 'ndarrays')
+    language    : str
+                  The language of the generated code ('c' or 'fortran')
+    compiler    : str
+                  The compiler used to build the library
+    fflags      : iterable
+                  The compiler flags
+    debug       : bool
+                  Indicates whether the library is built in debug mode
+    accelerator : str
+                  The selected accelerator (e.g. 'openmp')
+    shared      : bool
+                  Indicates whether the library is a shared library
+
+    Returns
+    -------
+    folder : str
+             The folder containing the library, its headers and its
+             Fortran module files
+    name   : str
+             The name of the library, as passed to the linker (-l<name>)
+    """
+    source_dir = os.path.join(os.path.dirname(stdlib_folder.__file__), lib_folder)
+    flags = _get_flags(compiler, fflags, debug, accelerator)
+
+    hasher = hashlib.sha256()
+    kind = 'shared' if shared and sys.platform != 'win32' else 'static'
+    for value in (lib_folder, language, compiler, kind, *flags, sys.platform):
+        hasher.update(value.encode())
+        hasher.update(b'\0')
+    for f in sorted(os.listdir(source_dir)):
+        hasher.update(f.encode())
+        hasher.update((hash_file(os.path.join(source_dir, f)) or '').encode())
+
+    folder = os.path.join(get_runtime_cache_dir(),
+                          '{}_{}'.format(lib_folder, hasher.hexdigest()[:16]))
+    return folder, 'pyccel_{}'.format(lib_folder)
+
+#==============================================================================
+def build_runtime_library(lib_folder, language, compiler,
+                          fflags = None,
+                          debug = False,
+                          accelerator = None,
+                          shared = False,
+                          verbose = False):
+    """
+    Build the runtime library for an internal library if it does not exist.
+
+    The library is built in a temporary folder which is then renamed to
+    the final location. The rename is atomic, so concurrent builds never
+    see a partial library: the first process to finish publishes its
+    library and the others discard their copy. The use of the library is
+    recorded, so that it is not evicted from the cache while it is used
+    (see pyccel.utilities.cache.evict_runtime_cache).
+
+    Parameters
+    ----------
+    lib_folder  : str
+                  The name of the folder in pyccel/stdlib which contains
+                  the sources of the internal library (e.g. 'ndarrays')
+    language    : str
+                  The language of the generated code ('c' or 'fortran')
+    compiler    : str
+                  The compiler used to build the library
+    fflags      : iterable
+                  The compiler flags
+    debug       : bool
+                  Indicates whether the library is built in debug mode
+    accelerator : str
+                  The selected accelerator (e.g. 'openmp')
+    shared      : bool
+                  Indicates whether a shared library is built
+    verbose     : bool
+                  Print the compilation commands
+
+    Returns
+    -------
+    folder : str
+             The folder containing the library, its headers and its
+             Fortran module files
+    name   : str
+             The name of the library, as passed to the linker (-l<name>)
+    """
+    folder, name = get_runtime_library(lib_folder, language, compiler,
+                                       fflags, debug, accelerator, shared)
+    lib_filepath = os.path.join(folder, library_filename(name, shared))
+
+    # The library may be evicted between the check and its use, in
+    # which case it is built again
+    while not use_cached_file(lib_filepath):
+        if verbose:
+            print('> Building runtime library {} in {}'.format(name, folder))
+
+        with profile_stage('runtime library', library=name):
+            _build_library(lib_folder, language, compiler, folder, name,
+                           _get_flags(compiler, fflags, debug, accelerator),
+                           shared, verbose)
+
+    return folder, name
+
+def _build_library(lib_folder, language, compiler, folder, name, flags, shared, verbose):
+    """ Build the runtime library `name` and publish it in `folder`
+    (see build_runtime_library)
+    """
+    source_dir = os.path.join(os.path.dirname(stdlib_folder.__file__), lib_folder)
+    lib_filename = library_filename(name, shared)
+
+    parent = os.path.dirname(folder)
+    os.makedirs(parent, exist_ok=True)
+    build_dir = tempfile.mkdtemp(prefix='.{}_'.format(lib_folder), dir=parent)
+    try:
+        for f in os.listdir(source_dir):
+            shutil.copy(os.path.join(source_dir, f), build_dir)
+
+        sources = sorted(os.path.join(build_dir, f) for f in os.listdir(build_dir)
+                                        if f.endswith(_source_ext[language]))
+        for f in sources:
+            compile_files(f, compiler, [*flags, '-I', build_dir],
+                          binary=None,
+                          verbose=verbose,
+                          is_module=True,
+                          output=build_dir,
+                          language=language)
+
+        objects = [os.path.splitext(f)[0] for f in sources]
+        lib_filepath = os.path.join(build_dir, lib_filename)
+        if not shared or sys.platform == 'win32':
+            cmd = ['ar', 'rcs', lib_filepath, *(o + '.o' for o in objects)]
+            if verbose:
+                print(' '.join(cmd))
+            subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        else:
+            link_flags = ['-shared', *flags]
+            if sys.platform == 'darwin':
+                link_flags.extend(['-install_name', '@rpath/' + lib_filename])
+            else:
+                # The soname allows a copy of the library to be loaded
+                # in place of the one found with the rpath
+                link_flags.append('-Wl,-soname,' + lib_filename)
+            compile_files(objects[0] + '.o', compiler, link_flags,
+                          binary=lib_filepath,
+                          verbose=verbose,
+                          modules=objects[1:],
+                          is_module=False,
+                          language=language)
+
+        # Publish the library
+        try:
+            os.rename(build_dir, folder)
+        except OSError:
+            # The library was published by another process
+            if not os.path.isfile(os.path.join(folder, lib_filename)):
+                raise
+    finally:
+        shutil.rmtree(build_dir, ignore_errors=True)
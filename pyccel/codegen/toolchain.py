@@ -0,0 +1,331 @@
+# coding: utf-8
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+"""
+Module containing the Toolchain class which detects the properties of the
+compilers and of the Python installation once, and caches them on disk
+"""
+
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import sysconfig
+import tempfile
+import threading
+from collections import OrderedDict
+
+from pyccel.version           import __version__
+from pyccel.utilities.cache   import get_cache_dir
+from pyccel.utilities.metaclasses import Singleton
+
+__all__ = ['Toolchain', 'find_compiler', 'get_openmp_flags']
+
+#==============================================================================
+# map the supported compilers to the language of their probe files
+_compiler_languages = {
+    'gfortran'  : 'fortran',
+    'mpif90'    : 'fortran',
+    'ifort'     : 'fortran',
+    'pgfortran' : 'fortran',
+    'gcc'       : 'c',
+    'icc'       : 'c',
+}
+
+# minimal files used to check which flags a compiler accepts
+_probe_files = {
+    'fortran' : ('probe.f90', 'module pyccel_probe\nend module pyccel_probe\n'),
+    'c'       : ('probe.c', 'int pyccel_probe(void) { return 0; }\n'),
+}
+
+# flags enabling OpenMP, in the order in which they are tried
+_openmp_candidates = (
+    ('-fopenmp',),
+    ('-Xpreprocessor', '-fopenmp'),
+    ('-qopenmp',),
+    ('-mp',),
+)
+
+#==============================================================================
+def _run(cmd, cwd = None):
+    """ Run a command and return its output, or None if it failed
+    """
+    try:
+        p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                           universal_newlines=True, cwd=cwd)
+    except OSError:
+        return None
+    return p.stdout if p.returncode == 0 else None
+
+def _probe_compiler(compiler, path):
+    """
+    Detect the properties of a compiler by running it.
+
+    Parameters
+    ----------
+    compiler : str
+               The name of the compiler (e.g. 'gfortran')
+    path     : str
+               The path to the compiler executable
+
+    Returns
+    -------
+    info : dict
+           The version of the compiler, its library directories and the
+           flags which enable OpenMP
+    """
+    output  = _run([path, '--version'])
+    version = next((l.strip() for l in output.splitlines() if l.strip()), None) \
+                if output else None
+
+    library_dirs = {}
+    if compiler == 'gfortran':
+        libraries = ['gfortran.lib', 'libgfortran.a'] if sys.platform == 'win32' \
+                    else ['libgfortran.a']
+        for lib in libraries:
+            location = _run([path, '-print-file-name=' + lib])
+            # The name is printed unchanged if the library is not found
+            location = location.strip() if location else ''
+            library_dirs[lib] = os.path.dirname(os.path.abspath(location)) \
+                                    if os.path.isabs(location) else None
+
+    openmp_flags = None
+    language = _compiler_languages.get(compiler, None)
+    if language is not None:
+        filename, code = _probe_files[language]
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, filename), 'w') as f:
+                f.write(code)
+            for flags in _openmp_candidates:
+                if _run([path, *flags, '-c', filename, '-o', 'probe.o'], cwd=tmp) is not None:
+                    openmp_flags = list(flags)
+                    break
+
+    return {'version'      : version,
+            'library_dirs' : library_dirs,
+            'openmp_flags' : openmp_flags}
+
+def _probe_python():
+    """
+    Get the configuration of the Python installation used to build
+    extension modules.
+
+    Returns
+    -------
+    info : dict
+           The commands used to compile and link extensions, the compilation
+           flags, the include directories, the libraries needed on some
+           platforms and the file extension of extension modules
+    """
+    from numpy import get_include as get_numpy_include
+
+    config_vars = sysconfig.get_config_vars()
+    paths       = sysconfig.get_paths()
+
+    cc       = shlex.split(config_vars.get('CC') or 'gcc')
+    ldshared = shlex.split(config_vars.get('LDSHARED') or '{} -shared'.format(cc[0]))
+    cflags   = shlex.split(config_vars.get('CFLAGS') or '') + \
+               shlex.split(config_vars.get('CCSHARED') or '')
+
+    includes = list(OrderedDict.fromkeys([paths['include'], paths['platinclude'],
+                                          get_numpy_include()]))
+
+    libs    = []
+    libdirs = []
+    if sys.platform == 'win32':
+        # Extensions must be linked with the Python library on Windows
+        libs.append('python{}{}'.format(*sys.version_info[:2]))
+        libdirs.append(os.path.join(sys.base_exec_prefix, 'libs'))
+
+    return {'cc'         : cc,
+            'ldshared'   : ldshared,
+            'cflags'     : cflags,
+            'includes'   : includes,
+            'libs'       : libs,
+            'libdirs'    : libdirs,
+            'ext_suffix' : config_vars['EXT_SUFFIX']}
+
+def _customize_python_info(info):
+    """
+    Apply the environment variables which override the configuration of
+    the Python installation (CC, LDSHARED, CFLAGS, CPPFLAGS and LDFLAGS),
+    as distutils.sysconfig.customize_compiler does.
+
+    Parameters
+    ----------
+    info : dict
+           The configuration returned by _probe_python
+
+    Returns
+    -------
+    info : dict
+           A copy of the configuration with the overrides applied
+    """
+    env      = os.environ
+    cc       = list(info['cc'])
+    ldshared = list(info['ldshared'])
+    cflags   = list(info['cflags'])
+
+    if 'CC' in env:
+        new_cc = shlex.split(env['CC'])
+        # On macOS the link command also uses the new compiler
+        if sys.platform == 'darwin' and 'LDSHARED' not in env and \
+                ldshared[:len(cc)] == cc:
+            ldshared = new_cc + ldshared[len(cc):]
+        cc = new_cc
+    if 'LDSHARED' in env:
+        ldshared = shlex.split(env['LDSHARED'])
+    if 'LDFLAGS' in env:
+        ldshared += shlex.split(env['LDFLAGS'])
+    for var in ('CFLAGS', 'CPPFLAGS'):
+        if var in env:
+            cflags   += shlex.split(env[var])
+            ldshared += shlex.split(env[var])
+
+    return {**info, 'cc' : cc, 'ldshared' : ldshared, 'cflags' : cflags}
+
+#==============================================================================
+class Toolchain(metaclass=Singleton):
+    """
+    Registry of the properties of the tools used to build the generated code.
+
+    Each compiler is probed the first time it is used (version, library
+    directories, OpenMP flags) and the result is saved in the file
+    'toolchains.json' in the pyccel cache folder. The entries are keyed by
+    the path and the modification time of the executable, so they are
+    renewed when a compiler is updated, and the file is discarded when the
+    version of pyccel changes. The configuration of the Python installation
+    (the flags and include folders needed to build extension modules) is
+    stored in the same way, keyed by the interpreter. The environment
+    variables which override it (e.g. CC or CFLAGS) are applied each time
+    it is requested, so they are not saved.
+    """
+    filename = 'toolchains.json'
+
+    def __init__(self):
+        self._path    = os.path.join(get_cache_dir(), self.filename)
+        self._lock    = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self):
+        """ Read the entries saved in the cache file
+        """
+        try:
+            with open(self._path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == __version__:
+                return data['entries']
+        except (OSError, ValueError, KeyError):
+            pass
+        return {}
+
+    def _save(self, key, info):
+        """ Add an entry to the cache file
+        """
+        entries = self._load()
+        entries[key] = info
+        tmp_path = '{}.{}.tmp'.format(self._path, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump({'version' : __version__, 'entries' : entries}, f, indent=1)
+            os.replace(tmp_path, self._path)
+        except OSError:
+            pass
+
+    def _get(self, key, probe):
+        """ Get an entry, probing and saving it if it is not known yet
+        """
+        with self._lock:
+            info = self._entries.get(key, None)
+            if info is None:
+                info = probe()
+                self._entries[key] = info
+                self._save(key, info)
+        return info
+
+    def get_compiler_info(self, compiler):
+        """
+        Get the properties of a compiler.
+
+        Parameters
+        ----------
+        compiler : str
+                   The name of the compiler (e.g. 'gfortran')
+
+        Returns
+        -------
+        info : dict
+               Dictionary containing the path to the executable ('path',
+               None if the compiler is not found), the first line printed
+               by `compiler --version` ('version'), the folders containing
+               its libraries ('library_dirs') and the flags enabling OpenMP
+               ('openmp_flags', None if they could not be determined)
+        """
+        path = shutil.which(compiler)
+        if path is None:
+            return {'path' : None, 'version' : None, 'library_dirs' : {}, 'openmp_flags' : None}
+
+        key = 'compiler:{}:{}:{}'.format(compiler, path, os.stat(path).st_mtime)
+        info = self._get(key, lambda: _probe_compiler(compiler, path))
+        return {'path' : path, **info}
+
+    def get_python_info(self):
+        """
+        Get the configuration used to build Python extension modules. The
+        CC, LDSHARED, CFLAGS, CPPFLAGS and LDFLAGS environment variables
+        override the configuration of the Python installation.
+
+        Returns
+        -------
+        info : dict
+               See pyccel.codegen.python_wrapper.get_python_build_config
+        """
+        from numpy import __version__ as numpy_version
+        key = 'python:{}:{}:{}'.format(sys.executable, os.stat(sys.executable).st_mtime,
+                                       numpy_version)
+        return _customize_python_info(self._get(key, _probe_python))
+
+#==============================================================================
+def find_compiler(compiler):
+    """
+    Get the path to a compiler executable. The compiler is probed and
+    saved in the Toolchain registry if it is found.
+
+    Parameters
+    ----------
+    compiler : str
+               The name of the compiler
+
+    Returns
+    -------
+    path : str
+           The path to the executable, or None if it is not found
+    """
+    return Toolchain().get_compiler_info(compiler)['path']
+
+def get_openmp_flags(compiler):
+    """
+    Get the flags which enable OpenMP for a compiler.
+
+    Parameters
+    ----------
+    compiler : str
+               The name of the compiler
+
+    Returns
+    -------
+    flags : list of str
+            The flags detected by the Toolchain, or the usual flags if they
+            could not be detected (e.g. the compiler is not installed)
+    """
+    flags = Toolchain().get_compiler_info(compiler)['openmp_flags']
+    if flags is not None:
+        return list(flags)
+    if sys.platform == "darwin" and compiler == "gcc":
+        return ["-Xpreprocessor", "-fopenmp"]
+    return ["-fopenmp"]
@@ -0,0 +1,395 @@
+# coding: utf-8
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+"""
+Contains the translate_source function which translates Python code given as
+a string, without reading or writing Python files and without changing the
+working directory. Several threads can translate code at the same time
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+
+from pyccel.errors.errors          import Errors, PyccelError
+from pyccel.errors.errors          import PyccelSyntaxError, PyccelSemanticError, PyccelCodegenError
+from pyccel.errors.messages        import PYCCEL_RESTRICTION_TODO
+from pyccel.parser.parser          import Parser
+from pyccel.codegen.codegen        import Codegen
+from pyccel.codegen.pipeline       import get_compiler_settings, internal_libs
+from pyccel.codegen.python_wrapper import generate_wrapper_files, build_shared_library
+from pyccel.codegen.runtime        import build_runtime_library
+from pyccel.codegen.utilities      import construct_flags, compile_files, replace_profile_flags
+from pyccel.codegen.utilities      import get_isa_flags
+from pyccel.utilities.profiling    import profile_stage
+
+__all__ = ['get_scratch_dir', 'Translation', 'translate_source']
+
+# The syntactic, semantic and code generation stages use objects shared by
+# the whole process (e.g. the Errors singleton), so they are carried out by
+# one thread at a time. The compilation only uses the files and runs freely
+_frontend_lock = threading.RLock()
+
+#==============================================================================
+def get_scratch_dir():
+    """
+    Get the folder where translate_source writes the files passed to the
+    compilers.
+
+    The folder can be chosen with the environment variable
+    PYCCEL_SCRATCH_DIR. Otherwise a memory-backed file system (/dev/shm)
+    is used if it is available, and the temporary folder of the system if
+    it is not.
+
+    Returns
+    -------
+    folder : str
+             The absolute path to the scratch folder
+    """
+    folder = os.environ.get('PYCCEL_SCRATCH_DIR', None)
+    if not folder:
+        folder = '/dev/shm'
+        if not (os.path.isdir(folder) and os.access(folder, os.W_OK | os.X_OK)):
+            folder = tempfile.gettempdir()
+    return os.path.abspath(folder)
+
+#==============================================================================
+class Translation:
+    """
+    The result of the translation of Python code by translate_source.
+
+    The files are stored in a private scratch folder, which is removed by
+    cleanup (or at the end of a with block). The shared library must thus
+    be imported or copied before the translation is cleaned up.
+
+    Parameters
+    ----------
+    module_name    : str
+                     The name of the generated module
+    language       : str
+                     The language which the code was translated to
+    folder         : str
+                     The scratch folder containing the files
+    code           : OrderedDict
+                     The generated code, mapping the name of each file to
+                     its contents
+    shared_library : str
+                     The path to the Python extension module, or None if
+                     the code was not compiled
+    """
+    def __init__(self, module_name, language, folder, code, shared_library = None):
+        self._module_name    = module_name
+        self._language       = language
+        self._folder         = folder
+        self._code           = code
+        self._shared_library = shared_library
+
+    @property
+    def module_name(self):
+        """ The name of the generated module
+        """
+        return self._module_name
+
+    @property
+    def language(self):
+        """ The language which the code was translated to
+        """
+        return self._language
+
+    @property
+    def folder(self):
+        """ The scratch folder containing the generated files
+        """
+        return self._folder
+
+    @property
+    def code(self):
+        """ Dictionary mapping the name of each generated file to its contents
+        """
+        return self._code
+
+    @property
+    def shared_library(self):
+        """ The path to the Python extension module, or None if the code
+        was not compiled
+        """
+        return self._shared_library
+
+    def cleanup(self):
+        """ Remove the scratch folder
+        """
+        shutil.rmtree(self._folder, ignore_errors=True)
+        self._shared_library = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cleanup()
+
+#==============================================================================
+def _generate_code(code, module_name, language, folder, build, isa_levels):
+    """
+    Carry out the syntactic, semantic and code generation stages for
+    translate_source. The files are written in the folder.
+
+    Returns
+    -------
+    codegen       : Codegen
+                    The code generator of the module
+    filename      : str
+                    The path to the generated module
+    wrapper_files : tuple
+                    The files returned by generate_wrapper_files, or None
+    """
+    errors = Errors()
+    errors.reset()
+
+    def handle_error(stage):
+        print('\nERROR at {} stage'.format(stage))
+        errors.check()
+
+    # The file name only identifies the module: the file is never read
+    parser = Parser(os.path.join(folder, module_name + '.py'), code = code)
+
+    # Parse Python code
+    try:
+        with profile_stage('syntax', module=module_name):
+            parser.parse()
+    except NotImplementedError as error:
+        errors.report(str(error)+'\n'+PYCCEL_RESTRICTION_TODO,
+            severity='error')
+    except PyccelError:
+        handle_error('parsing (syntax)')
+        raise
+    if errors.has_errors():
+        handle_error('parsing (syntax)')
+        raise PyccelSyntaxError('Syntax step failed')
+
+    # Annotate abstract syntax Tree
+    try:
+        with profile_stage('semantic', module=module_name):
+            parser.annotate()
+    except NotImplementedError as error:
+        errors.report(str(error)+'\n'+PYCCEL_RESTRICTION_TODO,
+            severity='error')
+    except PyccelError:
+        handle_error('annotation (semantic)')
+        raise PyccelSemanticError('Semantic step failed') from None
+    if errors.has_errors():
+        handle_error('annotation (semantic)')
+        raise PyccelSemanticError('Semantic step failed')
+
+    # The imported modules would have to be built from their files
+    if parser.module_parser or any(son.filename.endswith('.py') and \
+            not son.metavars.get('ignore_at_import', False) for son in parser.sons):
+        raise ValueError('Only code which does not import other Python modules can be translated')
+
+    # Generate the module and the files exposing it to Python
+    try:
+        with profile_stage('codegen', module=module_name):
+            codegen  = Codegen(parser.semantic_parser, module_name)
+            if not codegen.is_module:
+                raise ValueError('Only a module can be translated')
+            filename = codegen.export(os.path.join(folder, module_name), language=language,
+                                      isa_levels=isa_levels)
+            wrapper_files = None
+            if build and language != 'python':
+                wrapper_files = generate_wrapper_files(codegen, language, folder)
+    except NotImplementedError as error:
+        errors.report(str(error)+'\n'+PYCCEL_RESTRICTION_TODO,
+            severity='error')
+    except PyccelError:
+        handle_error('code generation')
+        raise PyccelCodegenError('Code generation failed') from None
+    if errors.has_errors():
+        handle_error('code generation')
+        raise PyccelCodegenError('Code generation failed')
+
+    # Print all warnings now
+    if errors.has_warnings():
+        errors.check()
+
+    return codegen, filename, wrapper_files
+
+def translate_source(code, module_name, *,
+                     language     = None,
+                     compiler     = None,
+                     mpi_compiler = None,
+                     fflags       = None,
+                     accelerator  = None,
+                     debug        = False,
+                     includes     = (),
+                     libdirs      = (),
+                     libs         = (),
+                     lto          = False,
+                     opt_profile  = None,
+                     isa_levels   = None,
+                     shared_runtime = False,
+                     build        = True,
+                     scratch_dir  = None,
+                     verbose      = False):
+    """
+    Translate a Python module given as a string and build its Python
+    extension module.
+
+    Unlike execute_pyccel, no Python file is read or written, the working
+    directory is never changed and sys.path is not used: the compilers
+    write their outputs in a private folder of the scratch directory. The
+    code must therefore not import other Python modules. The translation
+    stages are carried out by one thread at a time, while the compilations
+    run concurrently.
+
+    Parameters
+    ----------
+    code         : str
+                   The Python code of the module
+    module_name  : str
+                   The name of the generated module
+    language     : str
+                   The language which pyccel is translating to
+                   Default : fortran
+    compiler     : str
+                   The compiler used to compile the generated files
+                   Default : GNU
+    mpi_compiler : str
+                   The compiler used when mpi is needed
+                   Default : None (compile with 'compiler')
+    fflags       : str
+                   The flags passed to the compiler
+                   Default : provided by codegen.utilities.construct_flags
+    accelerator  : str
+                   Tool used to accelerate the code (e.g. openmp openacc)
+    debug        : bool
+                   Indicates whether the code is compiled in debug mode
+    includes     : iterable
+                   The folders containing the headers and Fortran modules
+    libdirs      : iterable
+                   The folders containing the required libraries
+    libs         : iterable
+                   The required libraries
+    lto          : bool
+                   Indicates whether the code is compiled with link-time optimisation
+    opt_profile  : str
+                   The optimisation profile used when fflags is not given
+                   (see execute_pyccel)
+                   Default : 'safe'
+    isa_levels   : iterable
+                   The instruction set levels of the functions decorated
+                   with multiversion (see execute_pyccel)
+                   Default : ('avx512', 'avx2')
+    shared_runtime : bool
+                   Indicates whether the code is linked with a shared runtime
+                   library (see execute_pyccel)
+                   Default : False
+    build        : bool
+                   Indicates whether the code is compiled. If False only
+                   the code is generated
+    scratch_dir  : str
+                   The folder where the private folder of the translation
+                   is created
+                   Default : see get_scratch_dir
+    verbose      : bool
+                   Print the compilation commands
+
+    Returns
+    -------
+    translation : Translation
+                  The generated code and the path to the shared library
+    """
+    if language is None:
+        language = 'fortran'
+
+    # The profile whose flags are replaced for the functions decorated with opt_profile
+    base_profile = None if fflags else (opt_profile or 'safe')
+
+    compiler, f90exec, fflags, libs = get_compiler_settings(language, compiler, mpi_compiler,
+                                                            fflags, accelerator, debug, lto, libs,
+                                                            opt_profile)
+
+    folder = tempfile.mkdtemp(prefix='pyccel_{}_'.format(module_name),
+                              dir=scratch_dir or get_scratch_dir())
+    try:
+        with _frontend_lock:
+            codegen, filename, wrapper_files = _generate_code(code, module_name, language,
+                                                              folder, build, isa_levels)
+            printer_imports = codegen.get_printer_imports()
+            profile_files   = OrderedDict(codegen.profile_files)
+            isa_files       = OrderedDict(codegen.isa_files)
+
+        generated = [f for f in (filename, os.path.splitext(filename)[0] + '.h',
+                                  *profile_files.values(), *isa_files.values(),
+                                  *(wrapper_files or ()))
+                     if f and os.path.isfile(f)]
+        generated_code = OrderedDict()
+        for f in generated:
+            with open(f, 'r') as source:
+                generated_code[os.path.basename(f)] = source.read()
+
+        if not build or language == 'python':
+            return Translation(module_name, language, folder, generated_code)
+
+        # Build the runtime libraries needed by the module
+        runtime_libs    = []
+        runtime_libdirs = []
+        for lib, lib_folder in internal_libs.items():
+            if lib in printer_imports:
+                lib_dirpath, lib_name = build_runtime_library(lib_folder, language, f90exec,
+                                            fflags = fflags, debug = debug,
+                                            accelerator = accelerator,
+                                            shared = shared_runtime, verbose = verbose)
+                runtime_libs.append(lib_name)
+                runtime_libdirs.append(lib_dirpath)
+
+        # The folder contains the Fortran module files of the generated code
+        includes = [*includes, folder, *runtime_libdirs]
+        libs     = [*libs, *runtime_libs]
+        libdirs  = [*libdirs, *runtime_libdirs]
+
+        flags = construct_flags(f90exec,
+                                fflags=fflags,
+                                debug=debug,
+                                accelerator=accelerator,
+                                includes=includes)
+        if shared_runtime and sys.platform != 'win32':
+            flags.extend('-Wl,-rpath,' + d for d in runtime_libdirs)
+
+        with profile_stage('compilation', module=module_name):
+            compile_files(filename, f90exec, flags,
+                          binary=None,
+                          verbose=verbose,
+                          is_module=True,
+                          output=folder,
+                          language=language)
+
+            # The functions decorated with opt_profile and the versions of the
+            # functions decorated with multiversion are compiled with their own flags
+            units = [(f, replace_profile_flags(flags, f90exec, base_profile, profile))
+                     for profile, f in profile_files.items()]
+            units += [(f, [*flags, *get_isa_flags(f90exec, level)])
+                      for level, f in isa_files.items()]
+            for unit_filename, unit_flags in units:
+                compile_files(unit_filename, f90exec, unit_flags,
+                              binary=None,
+                              verbose=verbose,
+                              is_module=True,
+                              output=folder,
+                              language=language)
+
+        dep_mods = [os.path.splitext(f)[0] for f in (filename, *(f for f, _ in units))]
+        with profile_stage('wrapper', module=module_name):
+            shared_library = build_shared_library(wrapper_files, language, folder, compiler,
+                                                  dep_mods,
+                                                  libs, libdirs, includes, flags,
+                                                  module_name, verbose, lto)
+
+    except BaseException:
+        shutil.rmtree(folder, ignore_errors=True)
+        raise
+
+    return Translation(module_name, language, folder, generated_code, shared_library)
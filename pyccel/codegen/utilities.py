@@ -9,12 +9,25 @@ This file contains some useful functions to compile the generated fortran code
 """
 
 import os
+import platform
 import shutil
 import subprocess
 import sys
+import tempfile
+import threading
+import time
 import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
-__all__ = ['construct_flags', 'compile_files', 'get_gfortran_library_dir']
+from pyccel.codegen.toolchain   import Toolchain, get_openmp_flags
+from pyccel.utilities.profiling import BuildProfiler
+
+__all__ = ['construct_flags', 'compile_files', 'get_gfortran_library_dir',
+           'get_isa_features', 'get_isa_flags', 'get_lto_flags', 'get_pgo_flags',
+           'get_profile_flags', 'isa_levels', 'default_isa_levels', 'multiversioning_available',
+           'optimisation_profiles', 'replace_profile_flags', 'run_tasks_in_parallel',
+           'write_file']
 
 #==============================================================================
 # TODO use constructor and a dict to map flags w.r.t the compiler
@@ -22,18 +35,79 @@ _avail_compilers = ['gfortran', 'mpif90', 'pgfortran', 'ifort', 'gcc', 'icc']
 
 language_extension = {'fortran':'f90', 'c':'c', 'python':'py'}
 
+# flags enabling link-time optimisation
+_lto_flags = {'gfortran'  : ['-flto'],
+              'mpif90'    : ['-flto'],
+              'gcc'       : ['-flto'],
+              'ifort'     : ['-ipo'],
+              'icc'       : ['-ipo'],
+              'pgfortran' : ['-Mipa=fast']}
+
+# compiler family of each compiler
+_compiler_vendors = {'gfortran'  : 'GNU',
+                     'mpif90'    : 'GNU',
+                     'gcc'       : 'GNU',
+                     'ifort'     : 'intel',
+                     'icc'       : 'intel',
+                     'pgfortran' : 'PGI'}
+
+# optimisation flags of each profile for each compiler family
+# safe   : the usual optimisations, which keep the floating point results (default)
+# fast   : aggressive optimisations which may change the floating point results
+# native : 'fast' with instructions specific to the processor of the machine
+# debug  : unoptimised code with debugging symbols
+_profile_flags = {'safe'   : {'GNU'   : ['-O3'],
+                              'intel' : ['-O3'],
+                              'PGI'   : ['-O3']},
+                  'fast'   : {'GNU'   : ['-Ofast', '-funroll-loops'],
+                              'intel' : ['-O3', '-fp-model', 'fast=2', '-unroll'],
+                              'PGI'   : ['-fast']},
+                  'native' : {'GNU'   : ['-Ofast', '-funroll-loops', '-march=native'],
+                              'intel' : ['-O3', '-fp-model', 'fast=2', '-unroll', '-xHost'],
+                              'PGI'   : ['-fast']},
+                  'debug'  : {'GNU'   : ['-O0', '-g'],
+                              'intel' : ['-O0', '-g'],
+                              'PGI'   : ['-O0', '-g']}}
+
+optimisation_profiles = tuple(_profile_flags.keys())
+
+# x86 instruction set levels used for function multiversioning, from the
+# most to the least capable. For each level the flags of each compiler
+# family and the CPU features checked (with __builtin_cpu_supports) by the
+# wrapper when the module is imported. A level also requires the features
+# of the less capable levels. The GNU compilers enable each feature with
+# its own flag (-m<feature>), as the -march=x86-64-v<n> levels require
+# GCC 11
+_isa_flags = OrderedDict([('avx512', {'intel' : ['-xCORE-AVX512'],
+                                      'PGI'   : ['-tp=skylake-avx512']}),
+                          ('avx2'  , {'intel' : ['-xCORE-AVX2'],
+                                      'PGI'   : ['-tp=haswell']}),
+                          ('sse4'  , {'intel' : ['-xSSE4.2'],
+                                      'PGI'   : ['-tp=nehalem']})])
+
+_isa_features = {'avx512' : ('avx512f', 'avx512bw', 'avx512cd', 'avx512dq', 'avx512vl'),
+                 'avx2'   : ('avx2', 'fma', 'bmi', 'bmi2', 'f16c'),
+                 'sse4'   : ('sse4.2', 'popcnt', 'ssse3')}
+
+isa_levels = tuple(_isa_flags.keys())
+
+# levels of the functions decorated with multiversion without arguments
+default_isa_levels = ('avx512', 'avx2')
+
 #==============================================================================
 # TODO add opt flags, etc... look at f2py interface in numpy
 def construct_flags(compiler,
                     fflags=(),
                     debug=False,
                     accelerator=None,
-                    includes=()):
+                    includes=(),
+                    lto=False,
+                    profile=None):
     """
     Constructs compiling flags for a given compiler.
 
     fflags: list
-        Fortran compiler flags. Default is `-O3`
+        Fortran compiler flags. Default is given by the optimisation profile
 
     compiler: str
         used compiler for the target language.
@@ -47,16 +121,25 @@ def construct_flags(compiler,
 
     includes: list
         list of include directories paths
+
+    lto: bool
+        enable link-time optimisation (see get_lto_flags)
+
+    profile: str
+        optimisation profile used when no fflags are given (see
+        get_profile_flags). Default is 'safe'
     """
 
     if not(compiler in _avail_compilers):
         raise ValueError("Only {0} are available.".format(_avail_compilers))
 
     if not fflags:
-        flags = ['-O3']
+        flags = get_profile_flags(compiler, profile or 'safe')
     else:
         flags = list(fflags)
 
+    debug = debug or profile == 'debug'
+
     if compiler == "gfortran":
         if debug:
             flags.append("-fcheck=bounds")
@@ -74,10 +157,7 @@ def construct_flags(compiler,
 
     if accelerator is not None:
         if accelerator == "openmp":
-            if sys.platform == "darwin" and compiler == "gcc":
-                flags.append("-Xpreprocessor")
-
-            flags.append("-fopenmp")
+            flags.extend(get_openmp_flags(compiler))
             if compiler == 'ifort':
                 flags.append('-nostandard-realloc-lhs')
 
@@ -86,11 +166,229 @@ def construct_flags(compiler,
         else:
             raise ValueError("Only openmp and openacc are available")
 
+    if lto:
+        flags.extend(f for f in get_lto_flags(compiler) if f not in flags)
+
     # Construct flags
     flags.extend(f for i in includes for f in ('-I', i))
 
     return flags
 
+#==============================================================================
+def get_profile_flags(compiler, profile):
+    """
+    Get the optimisation flags of a named profile for a compiler.
+
+    Parameters
+    ----------
+    compiler : str
+               The name of the compiler
+    profile  : str
+               The name of the profile. One among optimisation_profiles:
+               'safe' (the usual optimisations, used by default), 'fast'
+               (aggressive optimisations which may change the floating point
+               results), 'native' ('fast' for the processor of the machine)
+               or 'debug' (unoptimised code with debugging symbols)
+
+    Returns
+    -------
+    flags : list of str
+            The flags of the profile
+    """
+    if not(compiler in _avail_compilers):
+        raise ValueError("Only {0} are available.".format(_avail_compilers))
+    if profile not in _profile_flags:
+        raise ValueError("Unknown optimisation profile : {}. Only {} are available.".format(
+                         profile, optimisation_profiles))
+    return list(_profile_flags[profile][_compiler_vendors[compiler]])
+
+def replace_profile_flags(flags, compiler, old_profile, new_profile):
+    """
+    Change the optimisation profile used by a list of flags.
+
+    The flags of the old profile are removed (if it is known) and the flags
+    of the new profile are appended, so that they take precedence over the
+    remaining optimisation flags chosen by the user.
+
+    Parameters
+    ----------
+    flags       : list of str
+                  The flags built for the old profile
+    compiler    : str
+                  The name of the compiler
+    old_profile : str
+                  The profile used to build the flags, or None if the flags
+                  were chosen by the user
+    new_profile : str
+                  The new profile
+
+    Returns
+    -------
+    flags : list of str
+            The flags of the new profile
+    """
+    old_flags = get_profile_flags(compiler, old_profile) if old_profile else []
+    new_flags = get_profile_flags(compiler, new_profile)
+    flags = list(flags)
+    # Remove the old flags one at a time as they may contain values (e.g. -fp-model fast=2)
+    for f in old_flags:
+        if f in flags:
+            flags.remove(f)
+    flags.extend(new_flags)
+    if new_profile == 'debug' and compiler in ('gfortran', 'mpif90') \
+            and '-fcheck=bounds' not in flags:
+        flags.append('-fcheck=bounds')
+    return flags
+
+#==============================================================================
+def multiversioning_available():
+    """
+    Indicate whether functions can be compiled for several instruction set
+    levels (see the multiversion decorator). The levels are only defined
+    for x86 processors.
+
+    Returns
+    -------
+    available : bool
+                True if the machine has an x86 processor
+    """
+    return platform.machine().lower() in ('x86_64', 'amd64', 'i386', 'i686', 'x86')
+
+def get_isa_flags(compiler, level):
+    """
+    Get the flags which compile code for an instruction set level.
+
+    Parameters
+    ----------
+    compiler : str
+               The name of the compiler
+    level    : str
+               The instruction set level. One among isa_levels
+
+    Returns
+    -------
+    flags : list of str
+            The flags of the level
+    """
+    if not(compiler in _avail_compilers):
+        raise ValueError("Only {0} are available.".format(_avail_compilers))
+    if level not in _isa_flags:
+        raise ValueError("Unknown instruction set level : {}. Only {} are available.".format(
+                         level, isa_levels))
+    vendor = _compiler_vendors[compiler]
+    if vendor == 'GNU':
+        return ['-m' + feature for feature in get_isa_features(level)]
+    return list(_isa_flags[level][vendor])
+
+def get_isa_features(level):
+    """
+    Get the CPU features which are required to run code compiled for an
+    instruction set level, including the features of the less capable
+    levels. The names are those understood by the __builtin_cpu_supports
+    function of the C compilers.
+
+    Parameters
+    ----------
+    level : str
+            The instruction set level. One among isa_levels
+
+    Returns
+    -------
+    features : tuple of str
+               The CPU features
+    """
+    if level not in _isa_features:
+        raise ValueError("Unknown instruction set level : {}. Only {} are available.".format(
+                         level, isa_levels))
+    levels = isa_levels[isa_levels.index(level):]
+    return tuple(feature for l in reversed(levels) for feature in _isa_features[l])
+
+#==============================================================================
+def write_file(filename, code):
+    """
+    Write a generated file.
+
+    The code is written in a temporary file which is then renamed. The
+    rename is atomic, so a process compiling the file never sees a partial
+    file, even if another process is generating the same file.
+
+    Parameters
+    ----------
+    filename : str
+               The name of the file
+    code     : str
+               The contents of the file
+    """
+    tmp_path = '{}.{}.{}.tmp'.format(filename, os.getpid(), threading.get_ident())
+    try:
+        with open(tmp_path, 'w') as f:
+            f.write(code)
+        os.replace(tmp_path, filename)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+#==============================================================================
+def get_lto_flags(compiler):
+    """
+    Get the flags which enable link-time optimisation for a compiler.
+
+    The flags must be passed when the objects are compiled and when they
+    are linked, so that the optimiser sees the generated module, its
+    bind_c interface and the C wrapper together.
+
+    Parameters
+    ----------
+    compiler : str
+               The name of the compiler
+
+    Returns
+    -------
+    flags : list of str
+            The flags enabling link-time optimisation
+    """
+    if not(compiler in _avail_compilers):
+        raise ValueError("Only {0} are available.".format(_avail_compilers))
+    return list(_lto_flags[compiler])
+
+def get_pgo_flags(compiler, stage, profile_dir):
+    """
+    Get the flags used for profile-guided optimisation.
+
+    Parameters
+    ----------
+    compiler    : str
+                  The name of the compiler
+    stage       : str
+                  'generate' to instrument the code so that it records a
+                  profile when it is run, or 'use' to optimise the code with
+                  the recorded profile
+    profile_dir : str
+                  The folder containing the profile data
+
+    Returns
+    -------
+    flags : list of str
+            The flags which must be used to compile and link the code
+    """
+    if compiler in ('gfortran', 'mpif90', 'gcc'):
+        if stage == 'generate':
+            return ['-fprofile-generate={}'.format(profile_dir)]
+        elif stage == 'use':
+            # Functions which were not run during the training keep the
+            # usual optimisations
+            return ['-fprofile-use={}'.format(profile_dir), '-fprofile-correction',
+                    '-Wno-missing-profile']
+    elif compiler in ('ifort', 'icc'):
+        if stage == 'generate':
+            return ['-prof-gen', '-prof-dir={}'.format(profile_dir)]
+        elif stage == 'use':
+            return ['-prof-use', '-prof-dir={}'.format(profile_dir)]
+    else:
+        raise ValueError("Profile-guided optimisation is not available with {}".format(compiler))
+
+    raise ValueError("Unknown profile-guided optimisation stage : {}".format(stage))
+
 #==============================================================================
 def compile_files(filename, compiler, flags,
                     binary=None,
@@ -139,22 +437,49 @@ def compile_files(filename, compiler, flags,
         compiler = "gfortran"
         m_code.append(os.path.join(os.environ["MSMPI_LIB64"], 'libmsmpi.a'))
 
-    cmd = [compiler, *flags, *m_code, filename, o_code, binary, *libs_flags, *j_code]
+    # The file is written in a private folder and then renamed, which is
+    # atomic. Other processes (which may be building the same file) thus
+    # never see a partially written file and no lock is needed.
+    # The compilers name the profile data of a PGO build after the object
+    # file, so these files are written in place (epyccel runs PGO builds in
+    # a private folder)
+    if any(f.startswith(('-fprofile-', '-prof-')) for f in flags):
+        build_dir  = None
+        tmp_binary = binary
+    else:
+        build_dir  = tempfile.mkdtemp(prefix='.tmp_', dir=os.path.dirname(binary) or '.')
+        tmp_binary = os.path.join(build_dir, os.path.basename(binary))
+
+    cmd = [compiler, *flags, *m_code, filename, o_code, tmp_binary, *libs_flags, *j_code]
 
     if verbose:
         print(' '.join(cmd))
 
-    p = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
-    out, err = p.communicate()
-
-    if verbose and out:
-        print(out)
-    if p.returncode != 0:
-        err_msg = "Failed to build module"
-        err_msg += "\n" + err
-        raise RuntimeError(err_msg)
-    if err:
-        warnings.warn(UserWarning(err))
+    try:
+        start = time.perf_counter()
+        p = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        out, err = p.communicate()
+        BuildProfiler().add_event(os.path.basename(binary), 'subprocess', start,
+                                  time.perf_counter() - start,
+                                  command = ' '.join(cmd))
+
+        if verbose and out:
+            print(out)
+        if p.returncode != 0:
+            err_msg = "Failed to build module"
+            err_msg += "\n" + err
+            raise RuntimeError(err_msg)
+        if err:
+            warnings.warn(UserWarning(err))
+
+        if build_dir:
+            if sys.platform == "win32" and not os.path.isfile(tmp_binary):
+                # The compiler added the extension of the executable
+                tmp_binary, binary = tmp_binary + '.exe', binary + '.exe'
+            os.replace(tmp_binary, binary)
+    finally:
+        if build_dir:
+            shutil.rmtree(build_dir, ignore_errors=True)
 
     # TODO shall we uncomment this?
 #    # write and save a log file in .pyccel/'filename'.log
@@ -177,19 +502,93 @@ def compile_files(filename, compiler, flags,
     return output, cmd
 
 def get_gfortran_library_dir():
-    """Provide the location of the gfortran libraries for linking
+    """Provide the location of the gfortran libraries for linking.
+    The location is detected once by the Toolchain (see
+    pyccel.codegen.toolchain)
     """
+    library_dirs = Toolchain().get_compiler_info('gfortran')['library_dirs']
     if sys.platform == "win32":
         file_name_list = ['gfortran.lib', 'libgfortran.a']
     else:
         file_name_list = ['libgfortran.a']
 
     for file_name in file_name_list:
-        file_location = subprocess.check_output([shutil.which('gfortran'), '-print-file-name='+file_name],
-                universal_newlines = True)
-        lib_dir = os.path.abspath(os.path.dirname(file_location))
+        lib_dir = library_dirs.get(file_name, None) or os.getcwd()
         if lib_dir != os.getcwd():
             if lib_dir not in sys.path:
                 # Add to system path
                 sys.path.insert(0, lib_dir)
     return lib_dir
+
+#==============================================================================
+def _timed_call(func):
+    """ Call func and return its result and the wall time it took
+    """
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def run_tasks_in_parallel(tasks, jobs=None):
+    """
+    Run a graph of tasks (e.g. compilations), executing simultaneously the
+    tasks which do not depend on each other.
+
+    The tasks are run in threads as they spend their time waiting for a
+    compiler subprocess. A task is started as soon as all the tasks that it
+    depends on are finished. If a task fails, no new task is started and
+    the exception raised by the first failing task (in the order of the
+    tasks dictionary) is raised once the running tasks are finished. The
+    results are therefore independent of the order of completion.
+
+    Parameters
+    ----------
+    tasks : OrderedDict
+            Dictionary mapping the name of each task to a tuple containing
+            a function without arguments which carries out the task and an
+            iterable of the names of the tasks which must be run before it
+    jobs  : int
+            The maximum number of tasks which can run simultaneously
+            Default : number of processors on the machine
+
+    Returns
+    -------
+    results : OrderedDict
+            Dictionary mapping the name of each task to a tuple containing
+            the result of the task and the wall time it took (in seconds),
+            in the same order as the tasks dictionary
+    """
+    for name, (_, dependencies) in tasks.items():
+        unknown = [d for d in dependencies if d not in tasks]
+        if unknown:
+            raise ValueError("Task {} depends on unknown tasks {}".format(name, unknown))
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+
+    results  = {}
+    failures = {}
+    pending  = OrderedDict(tasks)
+    running  = {}
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+        while pending or running:
+            if not failures:
+                for name, (func, dependencies) in list(pending.items()):
+                    if all(d in results for d in dependencies):
+                        del pending[name]
+                        running[executor.submit(_timed_call, func)] = name
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as e: # pylint: disable=broad-except
+                    failures[name] = e
+
+    if failures:
+        raise next(failures[name] for name in tasks if name in failures)
+    if pending:
+        raise ValueError("Circular dependency between tasks {}".format(list(pending.keys())))
+
+    return OrderedDict((name, results[name]) for name in tasks)
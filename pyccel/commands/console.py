@@ -8,6 +8,7 @@
 import sys
 import os
 import argparse
+from functools import partial
 
 __all__ = ['MyParser', 'pyccel']
 
@@ -23,24 +24,18 @@ class MyParser(argparse.ArgumentParser):
         sys.exit(2)
 
 #==============================================================================
-def _which(program):
-    def is_exe(fpath):
-        return os.path.isfile(fpath) and os.access(fpath, os.X_OK)
-
-    if os.name == 'nt':  # Windows
-        program = program + '.exe'
-    fpath, _ = os.path.split(program)
-    if fpath:
-        if is_exe(program):
-            return program
-    else:
-        for path in os.environ["PATH"].split(os.pathsep):
-            path = path.strip('"')
-            exe_file = os.path.join(path, program)
-            if is_exe(exe_file):
-                return exe_file
-
-    return None
+def _find_python_files(folder):
+    """
+    Find all the Python files in a folder and its sub-folders, ignoring
+    the folders generated by pyccel, hidden folders and package
+    initialisation files. The files are returned in a deterministic order.
+    """
+    filenames = []
+    for root, dirs, files in os.walk(folder):
+        dirs[:] = sorted(d for d in dirs if not d.startswith(('.', '__')))
+        filenames.extend(os.path.join(root, f) for f in sorted(files)
+                         if f.endswith('.py') and f != '__init__.py')
+    return filenames
 
 #==============================================================================
 # TODO - remove output_dir froms args
@@ -53,7 +48,7 @@ def pyccel(files=None, openmp=None, openacc=None, output_dir=None, compiler=None
     parser = MyParser(description='pyccel command line')
 
     parser.add_argument('files', metavar='N', type=str, nargs='+',
-                        help='a Pyccel file')
+                        help='a Pyccel file, or a folder containing Pyccel files')
 
     #... Version
     import pyccel
@@ -91,6 +86,24 @@ def pyccel(files=None, openmp=None, openacc=None, output_dir=None, compiler=None
                        help='Compiler flags.')
     group.add_argument('--debug', action='store_true', \
                        help='compiles the code in a debug mode.')
+    group.add_argument('--lto', action='store_true', \
+                       help='compiles the code with link-time optimisation.')
+    group.add_argument('--shared-runtime', action='store_true', \
+                       help='links the code with a shared runtime library stored in the cache '
+                            'folder instead of a static one. The outputs cannot be moved to '
+                            'another machine and break if the runtime is evicted from the cache.')
+    group.add_argument('--opt-profile', choices=('safe', 'fast', 'native', 'debug'), \
+                       default=None, \
+                       help='optimisation profile which chooses the compiler flags when '
+                            '--flags is not given (default: safe).')
+    group.add_argument('--isa-levels', nargs='+', choices=('avx512', 'avx2', 'sse4'), \
+                       default=None, metavar='LEVEL', \
+                       help='instruction set levels (avx512, avx2, sse4) for which the functions '
+                            'decorated with multiversion are also compiled. The best version is '
+                            'chosen when the module is imported (default: avx512 avx2).')
+    group.add_argument('--pgo-train', type=str, default=None, metavar='SCRIPT', \
+                       help='compiles the code with profile-guided optimisation, using the profile '
+                            'recorded while the Python script SCRIPT runs the instrumented code.')
 
     group.add_argument('--include',
                         type=str,
@@ -116,6 +129,9 @@ def pyccel(files=None, openmp=None, openacc=None, output_dir=None, compiler=None
     group.add_argument('--output', type=str, default = '',\
                        help='folder in which the output is stored.')
 
+    group.add_argument('-j', '--jobs', type=int, default=None,\
+                       help='number of files compiled simultaneously (default: number of processors).')
+
     # ...
 
     # ... Accelerators
@@ -132,6 +148,8 @@ def pyccel(files=None, openmp=None, openacc=None, output_dir=None, compiler=None
                         help='enables verbose mode.')
     group.add_argument('--developer-mode', action='store_true', \
                         help='shows internal messages')
+    group.add_argument('--profile-build', type=str, default=None, metavar='FILE', \
+                        help='saves the time and memory spent in each stage of the build in FILE (Chrome trace format).')
     # ...
 
     # TODO move to another cmd line
@@ -148,6 +166,10 @@ def pyccel(files=None, openmp=None, openacc=None, output_dir=None, compiler=None
     from pyccel.errors.errors     import ErrorsMode
     from pyccel.errors.messages   import INVALID_FILE_DIRECTORY, INVALID_FILE_EXTENSION
     from pyccel.codegen.pipeline  import execute_pyccel
+    from pyccel.codegen.toolchain import find_compiler
+    from pyccel.codegen.manifest  import hash_file
+    from pyccel.codegen.pgo       import get_profile_dir, build_with_pgo, run_training_script
+    from pyccel.utilities.profiling import profile_stage, record_build_profile
 
     # ...
     if not files:
@@ -168,43 +190,41 @@ def pyccel(files=None, openmp=None, openacc=None, output_dir=None, compiler=None
 
     # ...
 
-    if len(files) > 1:
-        errors = Errors()
-        # severity is error to avoid needing to catch exception
-        errors.report('Pyccel can currently only handle 1 file at a time',
-                      severity='error')
-        errors.check()
-        sys.exit(1)
-    # ...
-
-    filename = files[0]
-
-    # ... report error
-    if os.path.isfile(filename):
-        # we don't use is_valid_filename_py since it uses absolute path
-        # file extension
-        ext = filename.split('.')[-1]
-        if not(ext in ['py', 'pyh']):
+    # Replace folders with the Python files they contain
+    filenames = []
+    for filename in files:
+        if os.path.isdir(filename):
+            filenames.extend(_find_python_files(filename))
+            continue
+
+        # ... report error
+        if os.path.isfile(filename):
+            # we don't use is_valid_filename_py since it uses absolute path
+            # file extension
+            ext = filename.split('.')[-1]
+            if not(ext in ['py', 'pyh']):
+                errors = Errors()
+                # severity is error to avoid needing to catch exception
+                errors.report(INVALID_FILE_EXTENSION,
+                              symbol=ext,
+                              severity='error')
+                errors.check()
+                sys.exit(1)
+        else:
+            # we use Pyccel error manager, although we can do it in other ways
             errors = Errors()
             # severity is error to avoid needing to catch exception
-            errors.report(INVALID_FILE_EXTENSION,
-                          symbol=ext,
+            errors.report(INVALID_FILE_DIRECTORY,
+                          symbol=filename,
                           severity='error')
             errors.check()
             sys.exit(1)
-    else:
-        # we use Pyccel error manager, although we can do it in other ways
-        errors = Errors()
-        # severity is error to avoid needing to catch exception
-        errors.report(INVALID_FILE_DIRECTORY,
-                      symbol=filename,
-                      severity='error')
-        errors.check()
-        sys.exit(1)
-    # ...
+        # ...
+
+        filenames.append(filename)
 
     if compiler:
-        if _which(compiler) is None:
+        if find_compiler(compiler) is None:
             errors = Errors()
             # severity is error to avoid needing to catch exception
             errors.report('Could not find compiler',
@@ -235,28 +255,66 @@ def pyccel(files=None, openmp=None, openacc=None, output_dir=None, compiler=None
         print("Cannot output python file to same folder as this would overwrite the original file. Please specify --output")
         sys.exit(1)
 
-    try:
-        # TODO: prune options
-        execute_pyccel(filename,
-                       syntax_only   = args.syntax_only,
-                       semantic_only = args.semantic_only,
-                       convert_only  = args.convert_only,
-                       verbose       = args.verbose,
-                       language      = args.language,
-                       compiler      = compiler,
-                       mpi_compiler  = args.mpi_compiler,
-                       fflags        = args.flags,
-                       includes      = args.includes,
-                       libdirs       = args.libdirs,
-                       modules       = (),
-                       libs          = args.libs,
-                       debug         = args.debug,
-                       accelerator   = accelerator,
-                       folder        = args.output)
-    except PyccelError:
+    # All the files are built in this process so that the imported headers,
+    # the internal libraries and the compiler information are only loaded
+    # or built once. A file which fails does not prevent the others from
+    # being built
+    success = True
+    profile_file = os.path.abspath(args.profile_build) if args.profile_build else None
+    with record_build_profile(profile_file):
+        for filename in filenames:
+            if len(filenames) > 1 and args.verbose:
+                print('> Building {}'.format(filename))
+            try:
+                # TODO: prune options
+                build = partial(execute_pyccel, filename,
+                                syntax_only   = args.syntax_only,
+                                semantic_only = args.semantic_only,
+                                convert_only  = args.convert_only,
+                                verbose       = args.verbose,
+                                language      = args.language,
+                                compiler      = compiler,
+                                mpi_compiler  = args.mpi_compiler,
+                                fflags        = args.flags,
+                                includes      = args.includes,
+                                libdirs       = args.libdirs,
+                                modules       = (),
+                                libs          = args.libs,
+                                debug         = args.debug,
+                                accelerator   = accelerator,
+                                folder        = args.output,
+                                jobs          = args.jobs,
+                                lto           = args.lto,
+                                opt_profile   = args.opt_profile,
+                                isa_levels    = args.isa_levels,
+                                shared_runtime = args.shared_runtime)
+                with profile_stage('build', file=filename):
+                    if args.pgo_train:
+                        # The profile is kept with the build artefacts and
+                        # reused while the file and the options are unchanged
+                        filepath = os.path.abspath(filename)
+                        folder = os.path.abspath(args.output) if args.output \
+                                    else os.path.dirname(filepath)
+                        module_name = os.path.splitext(os.path.basename(filename))[0]
+                        profile_dir = get_profile_dir(os.path.join(folder, '__pyccel__'),
+                                                      module_name)
+                        key = '{}:{!r}'.format(hash_file(filepath), sorted(build.keywords.items()))
+                        train = partial(run_training_script, os.path.abspath(args.pgo_train),
+                                        cwd = base_dirpath)
+                        build_with_pgo(build, train, profile_dir, key, args.verbose)
+                    else:
+                        build()
+            except PyccelError:
+                success = False
+            except RuntimeError as e:
+                # The training of a profile-guided optimisation build failed
+                print('ERROR: {}'.format(e))
+                success = False
+            finally:
+                os.chdir(base_dirpath)
+
+    if not success:
         sys.exit(1)
-    finally:
-        os.chdir(base_dirpath)
 
     return
 
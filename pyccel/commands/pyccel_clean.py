@@ -6,15 +6,47 @@
 """ Module containing scripts to remove pyccel generated objects
 """
 import os
+import re
 import shutil
 import sysconfig
-from argparse import ArgumentParser
+from argparse import ArgumentParser, ArgumentTypeError
+
+from pyccel.utilities.cache import evict_cache, evict_runtime_cache
 
 ext_suffix = sysconfig.get_config_var('EXT_SUFFIX')
 
-def pyccel_clean(path_dir = None, recursive = True, remove_shared_libs = False):
+_size_units = {'': 1, 'k': 1024, 'm': 1024**2, 'g': 1024**3, 't': 1024**4}
+_time_units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+def parse_size(size):
+    """ Convert a size such as '500M' or '2G' to a number of bytes.
+    The units are powers of 1024, and a number without unit is
+    a number of bytes
+    """
+    match = re.fullmatch(r'\s*([0-9.]+)\s*([kmgt]?)i?b?\s*', size, re.IGNORECASE)
+    if not match:
+        raise ArgumentTypeError('invalid size: {}'.format(size))
+    return int(float(match.group(1)) * _size_units[match.group(2).lower()])
+
+def parse_duration(duration):
+    """ Convert a duration such as '12h' or '7d' to a number of seconds.
+    The units are s, m, h, d and w, and a number without unit is a
+    number of days
+    """
+    match = re.fullmatch(r'\s*([0-9.]+)\s*([smhdw]?)\s*', duration)
+    if not match:
+        raise ArgumentTypeError('invalid duration: {}'.format(duration))
+    return float(match.group(1)) * _time_units[match.group(2) or 'd']
+
+def pyccel_clean(path_dir = None, recursive = True, remove_shared_libs = False,
+                 max_size = None, older_than = None):
     """ Remove __pyccel__ and __epyccel__ folders as well
-    as any python shared libraries from the directory path_dir
+    as any python shared libraries from the directory path_dir.
+
+    If a budget (max_size or older_than) is given, only the least recently
+    used entries of these folders are removed, so that the remaining entries
+    are within the budget (see pyccel.utilities.cache.evict_cache). Modules
+    used by a running process are never removed in this case
 
     Parameters
     ----------
@@ -29,10 +61,23 @@ def pyccel_clean(path_dir = None, recursive = True, remove_shared_libs = False):
                 Indicates whether shared libraries generated
                 by python should also be removed from the
                 directory path_dir
+    max_size  : int
+                The maximum number of bytes used by the cached files
+                Default : None (no limit)
+    older_than : float
+                Remove the cached files which have not been used
+                for this number of seconds
+                Default : None (no limit)
     """
     if path_dir is None:
         path_dir = os.getcwd()
 
+    if max_size is not None or older_than is not None:
+        evict_cache(path_dir, recursive, max_size, older_than)
+        if remove_shared_libs:
+            pyccel_clean_shared_libs(path_dir, recursive)
+        return
+
     files = os.listdir(path_dir)
     for f in files:
         file_name = os.path.join(path_dir,f)
@@ -43,6 +88,43 @@ def pyccel_clean(path_dir = None, recursive = True, remove_shared_libs = False):
         elif remove_shared_libs and f.endswith(ext_suffix):
             os.remove(file_name)
 
+def pyccel_clean_runtime(max_size = None, older_than = None):
+    """ Remove the runtime libraries stored in the cache folder, which are
+    shared by all the projects. Libraries used by a running process are
+    never removed, and the modules linked with a shared runtime no longer
+    work once their library is removed.
+
+    If a budget (max_size or older_than) is given, only the least recently
+    used libraries are removed, so that the remaining libraries are within
+    the budget (see pyccel.utilities.cache.evict_runtime_cache)
+
+    Parameters
+    ----------
+    max_size  : int
+                The maximum number of bytes used by the libraries
+                Default : None (no limit)
+    older_than : float
+                Remove the libraries which have not been used
+                for this number of seconds
+                Default : None (no limit)
+    """
+    if max_size is None and older_than is None:
+        max_size = 0
+    evict_runtime_cache(max_size, older_than)
+
+def pyccel_clean_shared_libs(path_dir, recursive = True):
+    """ Remove the python shared libraries from the directory path_dir
+    without touching the __pyccel__ and __epyccel__ folders
+    """
+    for f in os.listdir(path_dir):
+        file_name = os.path.join(path_dir,f)
+        if f in  ("__pyccel__", "__epyccel__"):
+            continue
+        elif not os.path.isfile(file_name) and recursive:
+            pyccel_clean_shared_libs(file_name, recursive)
+        elif f.endswith(ext_suffix):
+            os.remove(file_name)
+
 def pyccel_clean_command():
     """ Wrapper around the pyccel_clean function allowing
     command line arguments to be passed to the function
@@ -55,14 +137,29 @@ def pyccel_clean_command():
             help='Only run pyccel-clean in the current directory. Do not recurse into other folders')
     parser.add_argument('-s', '--remove-libs', action='store_true',
             help='Also remove any libraries generated by python from the folder. Beware this may remove shared libraries generated by tools other than pyccel')
+    parser.add_argument('--max-size', type=parse_size, default=None,
+            help='Only remove the least recently used modules and build files until they use less than MAX_SIZE (e.g. 500M, 2G). Modules loaded by a running process are kept')
+    parser.add_argument('--older-than', type=parse_duration, default=None,
+            help='Only remove the modules and build files which have not been used for OLDER_THAN (e.g. 12h, 7d; default unit is days). Modules loaded by a running process are kept')
+    parser.add_argument('--runtime', action='store_true',
+            help='Also remove the runtime libraries of the cache folder, which are shared by all projects. Modules linked with a shared runtime stop working if their library is removed')
+    parser.add_argument('--runtime-max-size', type=parse_size, default=None,
+            help='Only remove the least recently used runtime libraries until they use less than RUNTIME_MAX_SIZE. Implies --runtime')
+    parser.add_argument('--runtime-older-than', type=parse_duration, default=None,
+            help='Only remove the runtime libraries which have not been used for RUNTIME_OLDER_THAN. Implies --runtime')
     args = parser.parse_args()
 
     folders = args.folders
     recursive = args.not_recursive
     remove_libs = args.remove_libs
+    max_size = args.max_size
+    older_than = args.older_than
 
     if len(folders)==0:
-        pyccel_clean(None, recursive, remove_libs)
+        pyccel_clean(None, recursive, remove_libs, max_size, older_than)
     else:
         for f in folders:
-            pyccel_clean(f, recursive, remove_libs)
+            pyccel_clean(f, recursive, remove_libs, max_size, older_than)
+
+    if args.runtime or args.runtime_max_size is not None or args.runtime_older_than is not None:
+        pyccel_clean_runtime(args.runtime_max_size, args.runtime_older_than)
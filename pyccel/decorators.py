@@ -20,7 +20,9 @@ __all__ = (
     'private',
     'elemental',
     'stack_array',
-    'allow_negative_index'
+    'allow_negative_index',
+    'opt_profile',
+    'multiversion'
 )
 
 def lambdify(f):
@@ -96,3 +98,38 @@ def allow_negative_index(f,*args):
     def identity(f):
         return f
     return identity
+
+def opt_profile(profile):
+    """
+    Decorator indicates that the function should be compiled with the flags
+    of an optimisation profile instead of the flags used for the rest of the
+    module. The function is compiled in a separate translation unit.
+
+    Parameters
+    ----------
+    profile : str
+        The name of the optimisation profile. One among
+        ('safe', 'fast', 'native', 'debug')
+    """
+    def identity(f):
+        return f
+    return identity
+
+def multiversion(*levels):
+    """
+    Decorator indicates that the function should also be compiled for
+    several instruction set levels. The Python extension chooses the best
+    version for the processor when it is imported.
+
+    Parameters
+    ----------
+    levels : list of str
+        The instruction set levels. Each one among ('avx512', 'avx2', 'sse4').
+        If no level is given the levels chosen when pyccel is called are used
+    """
+    # The decorator may be used without arguments
+    if len(levels) == 1 and callable(levels[0]):
+        return levels[0]
+    def identity(f):
+        return f
+    return identity
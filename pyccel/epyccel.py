@@ -5,21 +5,41 @@
 #------------------------------------------------------------------------------------------#
 
 
+import ctypes
+import functools
 import inspect
 import importlib
+import hashlib
+import pickle
 import sys
 import os
 import string
 import random
-from filelock import FileLock, Timeout
-
-from types import ModuleType, FunctionType
+import shutil
+import subprocess
+import sysconfig
+import tempfile
+import threading
+import time
+import weakref
+import numpy
+
+from types import ModuleType, FunctionType, BuiltinFunctionType
 from importlib.machinery import ExtensionFileLoader
 
 from pyccel.codegen.pipeline import execute_pyccel
+from pyccel.codegen.runtime  import get_runtime_cache_dir
+from pyccel.codegen.pgo      import get_profile_dir, build_with_pgo
+from pyccel.codegen.pgo      import run_training_function, FunctionTraining
+from pyccel.utilities.profiling import profile_stage, record_build_profile
+from pyccel.utilities.cache     import use_cached_file
 from pyccel.errors.errors import PyccelError, ErrorsMode
+from pyccel.version import __version__
 
-__all__ = ['random_string', 'get_source_function', 'epyccel_seq', 'epyccel']
+__all__ = ['random_string', 'get_source_function', 'get_cache_key', 'get_source_info',
+           'epyccel_source', 'CompiledFunction', 'import_compiled_module', 'epyccel_seq',
+           'EpyccelProxy', 'epyccel',
+           'epyccel_batch', 'get_loaded_runtime_libraries', 'copy_to_node_local_storage']
 
 #==============================================================================
 random_selector = random.SystemRandom()
@@ -49,78 +69,85 @@ def get_source_function(func):
     return code
 
 #==============================================================================
-def get_unique_name(prefix, path):
+def get_cache_key(code, **options):
     """
-    Get a unique name based on the prefix
-    which does not coincide with a module which
-    already exists and is not being created by
-    another thread
+    Compute a content-addressed key identifying the result of an epyccel build.
+
+    The key is a hash of the source code, of the options which affect the
+    generated code or the compilation, and of the versions of the tools
+    which determine the ABI of the resulting extension module (pyccel,
+    Python and NumPy). Two calls with the same key produce interchangeable
+    shared libraries, so the key can be used to name the module.
 
     Parameters
     ----------
-    prefix : str
-             The starting string of the random name
-    path   : str
-             The folder where the lock file should be saved
+    code    : str
+              The Python source code which will be translated
+    options : dict
+              The options passed to execute_pyccel
 
     Returns
     -------
-    module_name : str
-                  A unique name for the new module
-    module_lock : FileLock
-                  A file lock preventing other threads
-                  from creating a module with the same name
+    key : str
+          A hexadecimal string uniquely identifying the build
     """
-    module_import_prefix = prefix + '_'
+    hasher = hashlib.sha256()
+    hasher.update(code.encode('utf-8'))
+    for name, value in sorted(options.items()):
+        hasher.update('{}={!r}'.format(name, value).encode('utf-8'))
+    hasher.update(__version__.encode('utf-8'))
+    hasher.update(sys.version.encode('utf-8'))
+    hasher.update(str(sysconfig.get_config_var('EXT_SUFFIX')).encode('utf-8'))
+    hasher.update(numpy.__version__.encode('utf-8'))
+    return hasher.hexdigest()
 
-    # Find an unused name
-    tag = random_string(12)
-    module_name = module_import_prefix + tag
-
-    while module_name in sys.modules.keys():
-        tag = random_string(12)
-        module_name = module_import_prefix + tag
+#==============================================================================
+def get_module_filename(module_name, language):
+    """
+    Get the name of the file containing a module built by epyccel.
 
-    module_name = module_name.split('.')[-1] + '_' + tag
+    Parameters
+    ----------
+    module_name : str
+                  The name of the module
+    language    : str
+                  The language which pyccel is translating to
 
-    save_path = os.path.join(path, '__epyccel__')
+    Returns
+    -------
+    filename : str
+               The name of the Python file (for the 'python' language) or
+               of the shared library
+    """
+    if language == 'python':
+        return module_name + '.py'
+    return module_name + sysconfig.get_config_var('EXT_SUFFIX')
 
-    # Create new directories if not existing
-    os.makedirs(save_path, exist_ok=True)
+#==============================================================================
+def get_source_info(function_or_module):
+    """
+    Get the information needed to build a module from a Python object.
 
-    # Ensure that the name is not in use by another thread
-    lock = FileLock(os.path.join(save_path, module_name)+'.lock')
-    try:
-        lock.acquire(timeout=0.1)
-        if module_name in sys.modules.keys():
-            raise Timeout("Newly created collision")
-    except Timeout:
-        return get_unique_name(prefix, path)
-    return module_name, lock
+    Parameters
+    ----------
+    function_or_module : function | module | str
+              The Python function or module to be accelerated, or the
+              source code of a Python module
 
-#==============================================================================
-def epyccel_seq(function_or_module, *,
-                language     = None,
-                compiler     = None,
-                mpi_compiler = None,
-                fflags       = None,
-                accelerator  = None,
-                verbose      = False,
-                debug        = False,
-                includes     = (),
-                libdirs      = (),
-                modules      = (),
-                libs         = (),
-                folder       = None):
-
-    # ... get the module source code
+    Returns
+    -------
+    code    : str
+              The source code which will be translated
+    dirpath : str
+              The folder containing the Python object
+    prefix  : str
+              The prefix of the name of the generated module
+    """
     if isinstance(function_or_module, FunctionType):
-        pyfunc = function_or_module
-        code = get_source_function(pyfunc)
+        code = get_source_function(function_or_module)
 
         dirpath = os.getcwd()
-
-        module_name, module_lock = get_unique_name('mod', dirpath)
+        prefix  = 'mod'
 
     elif isinstance(function_or_module, ModuleType):
         pymod = function_or_module
@@ -128,88 +155,612 @@ def epyccel_seq(function_or_module, *,
         lines = inspect.getsourcelines(pymod)[0]
         code = ''.join(lines)
 
-        module_name, module_lock = get_unique_name(pymod.__name__, dirpath)
+        prefix = pymod.__name__.split('.')[-1]
+
+    elif isinstance(function_or_module, str):
+        code = function_or_module
+
+        dirpath = os.getcwd()
+        prefix  = 'mod'
 
     else:
-        raise TypeError('> Expecting a FunctionType or a ModuleType')
+        raise TypeError('> Expecting a FunctionType, a ModuleType or a str')
 
-    # Try is necessary to ensure lock is released
-    try:
-        pymod_filename = '{}.py'.format(module_name)
-        pymod_filepath = os.path.join(dirpath, pymod_filename)
-        # ...
+    return code, dirpath, prefix
 
-        # Store current directory
-        base_dirpath = os.getcwd()
+#==============================================================================
+def epyccel_source(code, dirpath, prefix, *,
+                   language     = None,
+                   compiler     = None,
+                   mpi_compiler = None,
+                   fflags       = None,
+                   accelerator  = None,
+                   verbose      = False,
+                   debug        = False,
+                   includes     = (),
+                   libdirs      = (),
+                   modules      = (),
+                   libs         = (),
+                   folder       = None,
+                   lto          = False,
+                   pgo_training = None,
+                   profile_build = None,
+                   opt_profile  = None,
+                   isa_levels   = None,
+                   shared_runtime = False):
+    """
+    Build (or reuse) and import the module generated from Python source code.
 
-        # Define working directory 'folder'
-        if folder is None:
-            folder = os.path.dirname(pymod_filepath)
-        else:
-            folder = os.path.abspath(folder)
+    Parameters
+    ----------
+    code    : str
+              The source code which will be translated
+    dirpath : str
+              The folder containing the Python object
+    prefix  : str
+              The prefix of the name of the generated module
+    options : dict
+              See epyccel
 
-        # Define directory name and path for epyccel files
-        epyccel_dirname = '__epyccel__'
-        epyccel_dirpath = os.path.join(folder, epyccel_dirname)
+    Returns
+    -------
+    package : module
+              The accelerated module
+    """
+    if pgo_training is not None and language == 'python':
+        raise ValueError('Profile-guided optimisation requires a compiled language')
+
+    # Name the module after the content of the build so that identical
+    # requests reuse the shared library generated by a previous call
+    cache_key = get_cache_key(code,
+                              language     = language or 'fortran',
+                              compiler     = compiler,
+                              mpi_compiler = mpi_compiler,
+                              fflags       = fflags,
+                              accelerator  = accelerator,
+                              debug        = debug,
+                              includes     = tuple(includes),
+                              libdirs      = tuple(libdirs),
+                              modules      = tuple(modules),
+                              libs         = tuple(libs),
+                              lto          = lto,
+                              pgo          = pgo_training is not None,
+                              opt_profile  = opt_profile,
+                              isa_levels   = None if isa_levels is None else tuple(isa_levels),
+                              shared_runtime = shared_runtime)
+    module_name = '{}_{}'.format(prefix, cache_key[:24])
+
+    pymod_filename = '{}.py'.format(module_name)
+    pymod_filepath = os.path.join(dirpath, pymod_filename)
+    # ...
+
+    # Store current directory
+    base_dirpath = os.getcwd()
+
+    # Define working directory 'folder'
+    if folder is None:
+        folder = os.path.dirname(pymod_filepath)
+    else:
+        folder = os.path.abspath(folder)
 
-        # Create new directories if not existing
-        os.makedirs(folder, exist_ok=True)
-        os.makedirs(epyccel_dirpath, exist_ok=True)
+    # Define directory name and path for epyccel files
+    epyccel_dirname = '__epyccel__'
+    epyccel_dirpath = os.path.join(folder, epyccel_dirname)
 
-        # Change working directory to '__epyccel__'
-        os.chdir(epyccel_dirpath)
+    # Create new directories if not existing
+    os.makedirs(folder, exist_ok=True)
+    os.makedirs(epyccel_dirpath, exist_ok=True)
 
-        # Store python file in '__epyccel__' folder, so that execute_pyccel can run
-        with open(pymod_filename, 'w') as f:
-            f.writelines(code)
+    if module_name in sys.modules:
+        # The module was already built and imported by this process
+        package = sys.modules[module_name]
 
-        try:
-            # Generate shared library
-            execute_pyccel(pymod_filename,
-                           verbose     = verbose,
-                           language    = language,
-                           compiler    = compiler,
-                           mpi_compiler= mpi_compiler,
-                           fflags      = fflags,
-                           includes    = includes,
-                           libdirs     = libdirs,
-                           modules     = modules,
-                           libs        = libs,
-                           debug       = debug,
-                           accelerator = accelerator,
-                           output_name = module_name)
-        finally:
-            # Change working directory back to starting point
-            os.chdir(base_dirpath)
+    else:
+        # Lock the module so that it is not evicted from the cache (see
+        # pyccel-clean) while this process uses it
+        module_filepath = os.path.join(epyccel_dirpath, get_module_filename(module_name, language))
+        if not use_cached_file(module_filepath):
+            if profile_build:
+                profile_build = os.path.abspath(profile_build)
+
+            # The module is built in a private folder and published in the
+            # '__epyccel__' folder with an atomic rename. Concurrent builds
+            # thus never wait for each other: if several processes build the
+            # same module, they publish interchangeable files.
+            # The profile of a PGO build refers to the object files, so these
+            # builds always use the same folder
+            if pgo_training is None:
+                build_dirpath = tempfile.mkdtemp(prefix='.{}_'.format(module_name),
+                                                 dir=epyccel_dirpath)
+            else:
+                build_dirpath = os.path.join(epyccel_dirpath, '.{}_pgo'.format(module_name))
+                os.makedirs(build_dirpath, exist_ok=True)
+
+            def build(**pgo_options):
+                execute_pyccel(pymod_filename,
+                               verbose     = verbose,
+                               language    = language,
+                               compiler    = compiler,
+                               mpi_compiler= mpi_compiler,
+                               fflags      = fflags,
+                               includes    = includes,
+                               libdirs     = libdirs,
+                               modules     = modules,
+                               libs        = libs,
+                               debug       = debug,
+                               accelerator = accelerator,
+                               output_name = module_name,
+                               lto         = lto,
+                               opt_profile = opt_profile,
+                               isa_levels  = isa_levels,
+                               shared_runtime = shared_runtime,
+                               **pgo_options)
 
+            try:
+                # Change working directory to the build folder
+                os.chdir(build_dirpath)
+
+                # Store python file in the build folder, so that execute_pyccel can run
+                with open(pymod_filename, 'w') as f:
+                    f.writelines(code)
+
+                # Generate shared library
+                with record_build_profile(profile_build), \
+                        profile_stage('build', module=module_name):
+                    if pgo_training is None:
+                        build()
+                    else:
+                        train = functools.partial(run_training_function, pgo_training,
+                                                  module_name, build_dirpath)
+                        profile_dir = get_profile_dir(os.path.join(epyccel_dirpath,
+                                                                   '__pyccel__'), module_name)
+                        build_with_pgo(build, train, profile_dir, module_name, verbose)
+
+                # Publish the module
+                os.replace(os.path.join(build_dirpath, os.path.basename(module_filepath)),
+                           module_filepath)
+                use_cached_file(module_filepath)
+            finally:
+                # Change working directory back to starting point
+                os.chdir(base_dirpath)
+                shutil.rmtree(build_dirpath, ignore_errors=True)
+                # execute_pyccel adds its working directory to sys.path
+                for folder in {build_dirpath, os.path.realpath(build_dirpath)}:
+                    while folder in sys.path:
+                        sys.path.remove(folder)
+
+        elif verbose:
+            print('> Reusing cached module {}'.format(module_name))
 
         # Import shared library
-        sys.path.insert(0, epyccel_dirpath)
+        package = import_compiled_module(module_name, module_filepath)
+
+    if language != 'python':
+        # Verify that we have imported the shared library, not the Python one
+        loader = getattr(package, '__loader__', None)
+        if not isinstance(loader, ExtensionFileLoader):
+            raise ImportError('Could not load shared library')
+
+    return package
 
+#==============================================================================
+class CompiledFunction(functools.partial):
+    """
+    A function of a module built by epyccel.
+
+    The function is called directly (functools.partial is implemented in
+    C), but it is pickled with the path to the module which contains it.
+    The processes which unpickle it (e.g. the processes of a
+    multiprocessing pool) can therefore load the module even if its
+    folder is not in their sys.path.
+
+    Parameters
+    ----------
+    func     : callable
+               The function of the module
+    filename : str
+               The path to the shared library (or the Python file)
+    """
+    def __new__(cls, func, filename):
+        self = super().__new__(cls, func)
+        functools.update_wrapper(self, func)
+        self._filename = filename
+        return self
+
+    def __reduce__(self):
+        return _load_compiled_function, (self.__module__, self._filename, self.__name__)
+
+def import_compiled_module(module_name, filename):
+    """
+    Import a module built by epyccel.
+
+    The folder containing the module is only added to sys.path while the
+    module is imported. The functions defined in the module are replaced
+    by CompiledFunction objects so that they can be pickled, e.g. to send
+    them to the processes of a multiprocessing pool.
+
+    Parameters
+    ----------
+    module_name : str
+                  The name of the module
+    filename    : str
+                  The path to the shared library (or the Python file)
+
+    Returns
+    -------
+    module : module
+             The imported module
+    """
+    module = sys.modules.get(module_name, None)
+    if module is not None:
+        return module
+
+    folder = os.path.dirname(os.path.abspath(filename))
+    sys.path.insert(0, folder)
+    try:
         # http://ballingt.com/import-invalidate-caches
         # https://docs.python.org/3/library/importlib.html#importlib.invalidate_caches
         importlib.invalidate_caches()
+        module = importlib.import_module(module_name)
+    finally:
+        sys.path.remove(folder)
 
-        package = importlib.import_module(module_name)
-        sys.path.remove(epyccel_dirpath)
+    for name, obj in list(vars(module).items()):
+        if isinstance(obj, (FunctionType, BuiltinFunctionType)) and \
+                getattr(obj, '__module__', None) == module_name:
+            setattr(module, name, CompiledFunction(obj, filename))
 
-        if language != 'python':
-            # Verify that we have imported the shared library, not the Python one
-            loader = getattr(package, '__loader__', None)
-            if not isinstance(loader, ExtensionFileLoader):
-                raise ImportError('Could not load shared library')
+    return module
 
-        # If Python object was function, extract it from module
-        if isinstance(function_or_module, FunctionType):
-            func = getattr(package, pyfunc.__name__)
-        else:
-            func = None
-    finally:
-        module_lock.release()
+def _load_compiled_function(module_name, filename, name):
+    """
+    Get a compiled function which was pickled by a process.
+    The shared library is imported if needed, but never rebuilt.
+    """
+    if module_name not in sys.modules and not use_cached_file(filename):
+        raise ImportError('The module {} was removed from the cache'.format(module_name),
+                          name = module_name, path = filename)
+    return getattr(import_compiled_module(module_name, filename), name)
+
+#==============================================================================
+def _get_build_options(function_or_module, options):
+    """
+    Get the options passed to epyccel_source to build a function or module.
+
+    Parameters
+    ----------
+    function_or_module : function | module
+              The Python function or module to be accelerated
+    options : dict
+              The options passed to epyccel
+
+    Returns
+    -------
+    options : dict
+              The options passed to epyccel_source
+    """
+    options = dict(options)
+    if isinstance(function_or_module, FunctionType) and options.get('pgo_training', None):
+        # The training is run on the function rather than on the module
+        options['pgo_training'] = FunctionTraining(options['pgo_training'],
+                                                   function_or_module.__name__)
+    return options
+
+#==============================================================================
+def epyccel_seq(function_or_module, **kwargs):
+
+    code, dirpath, prefix = get_source_info(function_or_module)
+    package = epyccel_source(code, dirpath, prefix,
+                             **_get_build_options(function_or_module, kwargs))
+
+    # If Python object was function, extract it from module
+    if isinstance(function_or_module, FunctionType):
+        func = getattr(package, function_or_module.__name__)
+    else:
+        func = None
 
     # Return accelerated Python module and function
     return package, func
 
+#==============================================================================
+def get_loaded_runtime_libraries():
+    """
+    Get the pyccel runtime libraries which are loaded in the current process.
+
+    The runtime libraries are found in the memory map of the process, which
+    is only available on Linux.
+
+    Returns
+    -------
+    libraries : list of str
+                The absolute paths to the runtime libraries
+    """
+    runtime_dir = get_runtime_cache_dir() + os.sep
+    try:
+        with open('/proc/self/maps', 'r') as f:
+            paths = {line.split(maxsplit=5)[-1].strip() for line in f}
+    except OSError:
+        return []
+    return sorted(p for p in paths if p.startswith(runtime_dir))
+
+def copy_to_node_local_storage(comm, root, files, local_dir = None):
+    """
+    Copy files from the root process to a node-local folder on every node.
+
+    The processes are grouped by node with a shared-memory communicator.
+    The contents of the files are broadcast by the root process once to
+    a single process on each node, which writes them to the node-local
+    folder. No process other than root reads the original files, so the
+    files do not need to be on a shared filesystem.
+
+    Parameters
+    ----------
+    comm      : mpi4py.MPI.Comm
+                The communicator containing all the processes
+    root      : int
+                The rank of the process which can read the files
+    files     : list of str
+                The files to be copied (only significant on root)
+    local_dir : str
+                The node-local folder (default: the temporary folder)
+
+    Returns
+    -------
+    local_files : list of str
+                The paths to the copies of the files on the current node
+    """
+    from mpi4py import MPI
+
+    # Give root the lowest key so that it is the leader of its node
+    key = 0 if comm.rank == root else comm.rank + 1
+    node_comm = comm.Split_type(MPI.COMM_TYPE_SHARED, key = key)
+    is_leader = node_comm.rank == 0
+    leaders_comm = comm.Split(0 if is_leader else MPI.UNDEFINED, key = key)
+
+    local_files = None
+    error = None
+    if is_leader:
+        if comm.rank == root:
+            contents = []
+            for filename in files:
+                with open(filename, 'rb') as f:
+                    contents.append((os.path.basename(filename), f.read()))
+            name = contents[0][0].split('.')[0]
+        else:
+            contents = None
+            name = None
+        # Root is rank 0 in the communicator of the leaders
+        contents = leaders_comm.bcast(contents, root = 0)
+        name = leaders_comm.bcast(name, root = 0)
+        leaders_comm.Free()
+
+        # The folder is named after the module, whose name is unique
+        user = os.getuid() if hasattr(os, 'getuid') else os.getpid()
+        folder = os.path.join(local_dir or tempfile.gettempdir(),
+                              'pyccel-{}'.format(user), name)
+        try:
+            os.makedirs(folder, exist_ok = True)
+            local_files = []
+            for filename, data in contents:
+                local_file = os.path.join(folder, filename)
+                tmp_file = '{}.{}.tmp'.format(local_file, os.getpid())
+                with open(tmp_file, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_file, local_file)
+                local_files.append(local_file)
+        except OSError as e:
+            error = e
+
+    local_files, error = node_comm.bcast((local_files, error), root = 0)
+    node_comm.Free()
+
+    if error is not None:
+        raise error
+
+    return local_files
+
+#==============================================================================
+def _build_in_subprocess():
+    """
+    Build a module in a process started by EpyccelProxy.
+
+    The request (the arguments of epyccel_source and the name of the file
+    where the result is saved) is read from the standard input. The result
+    is the time spent building the module, or the exception which was
+    raised.
+    """
+    # The request is unpickled once the path is set, as the options may
+    # reference functions of the modules imported by the caller
+    path, request = pickle.load(sys.stdin.buffer)
+    sys.path[:] = path
+    code, dirpath, prefix, developer_mode, options, result_file = pickle.loads(request)
+
+    if developer_mode:
+        ErrorsMode().set_mode('developer')
+
+    start = time.perf_counter()
+    try:
+        epyccel_source(code, dirpath, prefix, **options)
+        result = (time.perf_counter() - start, None)
+    except BaseException as e: # pylint: disable=broad-except
+        result = (time.perf_counter() - start, e)
+
+    try:
+        data = pickle.dumps(result)
+    except Exception: # pylint: disable=broad-except
+        data = pickle.dumps((result[0], RuntimeError(str(result[1]))))
+
+    with open(result_file, 'wb') as f:
+        f.write(data)
+
+def _cleanup_build(process, result_file):
+    """
+    Release the resources used by the compilation of an EpyccelProxy.
+
+    The compilation process is killed if it is still running and the file
+    where it saves its result is removed.
+
+    Parameters
+    ----------
+    process : subprocess.Popen
+              The process building the module
+    result_file : str
+              The file where the process saves its result
+    """
+    if process.poll() is None:
+        process.kill()
+        process.wait()
+    try:
+        os.remove(result_file)
+    except FileNotFoundError:
+        pass
+
+class EpyccelProxy:
+    """
+    Object standing for a function or module which is compiled in the
+    background.
+
+    The compilation is carried out by epyccel in a separate Python process,
+    so that it neither blocks the caller nor interferes with the working
+    directory of the current process. Until the compiled version is
+    available, the proxy uses the original Python object. The compiled
+    version is imported and swapped in by the first call (or attribute
+    access) following the end of the compilation. If the compilation fails
+    the Python object continues to be used and the error is stored. If the
+    proxy is destroyed before the end of the compilation, the compilation
+    process is killed.
+
+    Parameters
+    ----------
+    python_function_or_module : function | module
+              The Python function or module to be accelerated
+    developer_mode : bool
+              Indicates whether pyccel should be run in developer mode
+    options : dict
+              The options passed to epyccel
+    """
+    def __init__(self, python_function_or_module, developer_mode = False, **options):
+        if isinstance(python_function_or_module, FunctionType):
+            functools.update_wrapper(self, python_function_or_module)
+
+        self._python_obj   = python_function_or_module
+        self._target       = python_function_or_module
+        self._options      = options
+        self._lock         = threading.Lock()
+        self._status       = 'compiling'
+        self._error        = None
+        self._compile_time = None
+
+        code, dirpath, prefix = get_source_info(python_function_or_module)
+
+        fd, self._result_file = tempfile.mkstemp(prefix='epyccel_', suffix='.result')
+        os.close(fd)
+
+        request = (code, dirpath, prefix, developer_mode,
+                   _get_build_options(python_function_or_module, options),
+                   self._result_file)
+        try:
+            request = pickle.dumps((list(sys.path), pickle.dumps(request)))
+        except Exception:
+            os.remove(self._result_file)
+            raise
+
+        self._process = subprocess.Popen([sys.executable, '-c',
+                'from pyccel.epyccel import _build_in_subprocess; _build_in_subprocess()'],
+                stdin = subprocess.PIPE)
+        self._finalizer = weakref.finalize(self, _cleanup_build,
+                                           self._process, self._result_file)
+        self._process.stdin.write(request)
+        self._process.stdin.close()
+
+    def _update(self):
+        """ Swap in the compiled object if the compilation has finished
+        """
+        if self._status != 'compiling' or self._process.poll() is None:
+            return
+
+        with self._lock:
+            if self._status != 'compiling':
+                return
+
+            try:
+                with open(self._result_file, 'rb') as f:
+                    self._compile_time, error = pickle.load(f)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                error = RuntimeError('Compilation process exited with code {}'.format(
+                                        self._process.returncode))
+            finally:
+                self._finalizer()
+
+            if error is None:
+                try:
+                    # The module is found in the cache so it is only imported
+                    mod, fun = epyccel_seq(self._python_obj, **self._options)
+                    self._target = fun or mod
+                except Exception as e: # pylint: disable=broad-except
+                    error = e
+
+            self._error  = error
+            self._status = 'failed' if error else 'ready'
+
+    @property
+    def status(self):
+        """ The status of the compilation: 'compiling', 'ready' or 'failed'
+        """
+        self._update()
+        return self._status
+
+    @property
+    def error(self):
+        """ The exception raised by the compilation if it failed, None otherwise
+        """
+        self._update()
+        return self._error
+
+    @property
+    def compile_time(self):
+        """ The time (in seconds) spent compiling, or None if the
+        compilation has not finished
+        """
+        self._update()
+        return self._compile_time
+
+    @property
+    def python_object(self):
+        """ The original Python function or module
+        """
+        return self._python_obj
+
+    def wait(self, timeout = None):
+        """
+        Wait for the end of the compilation.
+
+        Parameters
+        ----------
+        timeout : float
+                  The maximum time to wait (in seconds). Default: no limit
+
+        Returns
+        -------
+        status : str
+                 The status of the compilation
+        """
+        try:
+            self._process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            pass
+        return self.status
+
+    def __call__(self, *args, **kwargs):
+        self._update()
+        return self._target(*args, **kwargs)
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        self._update()
+        return getattr(self._target, name)
+
 #==============================================================================
 def epyccel( python_function_or_module, **kwargs ):
     """
@@ -217,8 +768,11 @@ def epyccel( python_function_or_module, **kwargs ):
 
     Parameters
     ----------
-    python_function_or_module : function | module
-        Python function or module to be accelerated.
+    python_function_or_module : function | module | str | list | dict
+        Python function or module to be accelerated, or the source code
+        of a Python module. A list of functions or a dictionary mapping
+        names to functions can also be provided, in which case all the
+        functions are compiled into a single module.
 
     verbose : bool
         Print additional information (default: False).
@@ -241,6 +795,16 @@ def epyccel( python_function_or_module, **kwargs ):
     bcast : {True, False}
         If False, only root process loads accelerated function/module (default: True).
 
+    node_local : {True, False}
+        If True, the shared library is sent once to each node through MPI
+        and imported from a node-local folder, instead of being imported by
+        all processes from the folder where it was built. This avoids
+        relying on (and overloading) a shared filesystem (default: False).
+
+    local_dir : str, optional
+        Node-local folder where the shared libraries are stored when
+        node_local is True (default: the temporary folder, e.g. /tmp).
+
     Other options
     -------------
     compiler : str, optional
@@ -249,10 +813,64 @@ def epyccel( python_function_or_module, **kwargs ):
     mpi_compiler : str, optional
         Compiler for MPI parallel code.
 
+    lto : bool, optional
+        If True, compile the generated code, its interface and the C
+        wrapper with link-time optimisation, so that the kernels can be
+        inlined in the wrapper (default: False).
+
+    opt_profile : {'safe', 'fast', 'native', 'debug'}, optional
+        Optimisation profile choosing the compiler flags when fflags is not
+        given (default: 'safe'). 'fast' allows optimisations which may change
+        the floating point results, 'native' also targets the processor of
+        the machine and 'debug' disables the optimisations. A function can
+        use a different profile with the decorator
+        pyccel.decorators.opt_profile.
+
+    isa_levels : iterable of {'avx512', 'avx2', 'sse4'}, optional
+        Instruction set levels for which the functions decorated with
+        pyccel.decorators.multiversion (without arguments) are also
+        compiled. The extension uses the best version for the processor
+        when it is imported, so it can be built once for several kinds
+        of x86 processors (default: ('avx512', 'avx2')).
+
+    shared_runtime : bool, optional
+        If True, link the module with a shared runtime library stored in
+        the cache folder (PYCCEL_CACHE_DIR) instead of a static one. The
+        module then breaks if the runtime is evicted from the cache
+        (default: False).
+
+    pgo_training : callable, optional
+        Enable profile-guided optimisation. The code is first compiled with
+        instrumentation and pgo_training is called with the instrumented
+        function (or module) in a separate process to record a profile.
+        The code is then compiled again using the profile, which is kept
+        in the '__epyccel__' folder and reused by later builds. The callable
+        must be defined at the top level of an importable module or of the
+        main script, whose entry point must then be protected by
+        `if __name__ == '__main__':`.
+
+    profile_build : str, optional
+        Name of a JSON file (Chrome trace format) where the time and memory
+        spent in each stage of the build are saved. Nothing is saved if the
+        module is found in the cache.
+
+    asynchronous : bool, optional
+        If True, compile in a separate process and immediately return an
+        EpyccelProxy which runs the Python object until the compiled
+        version is ready (default: False).
+
     Returns
     -------
     res : object
-        Accelerated function or module.
+        Accelerated function or module. For a list (or a dictionary) of
+        functions, a list (or a dictionary) of accelerated functions.
+
+    Notes
+    -----
+    The generated module is named after a hash of the source code and of
+    the build options. Calling epyccel again with the same inputs reuses
+    the shared library which was previously stored in the '__epyccel__'
+    folder instead of recompiling it.
 
     Examples
     --------
@@ -262,12 +880,29 @@ def epyccel( python_function_or_module, **kwargs ):
     >>> one_c = epyccel(one, language='c')
 
     """
-    assert isinstance( python_function_or_module, (FunctionType, ModuleType) )
+    if isinstance( python_function_or_module, (list, tuple, dict) ):
+        return epyccel_batch( python_function_or_module, **kwargs )
+
+    assert isinstance( python_function_or_module, (FunctionType, ModuleType, str) )
 
     comm  = kwargs.pop('comm', None)
     root  = kwargs.pop('root', 0)
     bcast = kwargs.pop('bcast', True)
-    if kwargs.pop('developer_mode', None):
+    node_local = kwargs.pop('node_local', False)
+    local_dir  = kwargs.pop('local_dir', None)
+    asynchronous   = kwargs.pop('asynchronous', False)
+    developer_mode = kwargs.pop('developer_mode', None)
+
+    if asynchronous:
+        if comm is not None:
+            raise ValueError('Asynchronous compilation is not available in parallel mode')
+        if isinstance(python_function_or_module, str):
+            raise TypeError('Asynchronous compilation requires a function or a module')
+        return EpyccelProxy(python_function_or_module,
+                            developer_mode = bool(developer_mode),
+                            **kwargs)
+
+    if developer_mode:
         # This will initialize the singleton ErrorsMode
         # making this setting available everywhere
         err_mode = ErrorsMode()
@@ -318,16 +953,21 @@ def epyccel( python_function_or_module, **kwargs ):
             mod_name = comm.bcast( mod_name, root=root )
             fun_name = comm.bcast( fun_name, root=root )
 
+            # Copy the shared library (and the runtime libraries that it
+            # needs) to a node-local folder
+            if node_local:
+                files = [mod_path, *get_loaded_runtime_libraries()] if comm.rank == root else None
+                local_files = copy_to_node_local_storage( comm, root, files, local_dir )
+
+                if comm.rank != root:
+                    mod_path = local_files[0]
+                    for lib in local_files[1:]:
+                        ctypes.CDLL(lib, mode = ctypes.RTLD_GLOBAL)
+
             # Non-master processes import Fortran module directly from its path
             # and extract function if its name is given
             if comm.rank != root:
-                folder = os.path.split(mod_path)[0]
-                sys.path.insert(0, folder)
-                # http://ballingt.com/import-invalidate-caches
-                # https://docs.python.org/3/library/importlib.html#importlib.invalidate_caches
-                importlib.invalidate_caches()
-                mod = importlib.import_module(mod_name)
-                sys.path.remove(folder)
+                mod = import_compiled_module(mod_name, mod_path)
                 fun = getattr(mod, fun_name) if fun_name else None
 
     # Serial version
@@ -336,3 +976,46 @@ def epyccel( python_function_or_module, **kwargs ):
 
     # Return Fortran function (if any), otherwise module
     return fun or mod
+
+#==============================================================================
+def epyccel_batch( functions, **kwargs ):
+    """
+    Accelerate several Python functions by compiling them into a single module.
+
+    Parameters
+    ----------
+    functions : list | dict
+        The Python functions to be accelerated, or a dictionary mapping
+        names to the Python functions.
+
+    kwargs : dict
+        The options passed to epyccel.
+
+    Returns
+    -------
+    res : list | dict
+        The accelerated functions, in the same order as the Python
+        functions, or a dictionary mapping the names to the accelerated
+        functions.
+    """
+    if isinstance(functions, dict):
+        names, pyfuncs = zip(*functions.items()) if functions else ((), ())
+    else:
+        names, pyfuncs = None, tuple(functions)
+
+    if not all(isinstance(f, FunctionType) for f in pyfuncs):
+        raise TypeError('> Expecting a list or a dictionary of FunctionTypes')
+
+    func_names = [f.__name__ for f in pyfuncs]
+    duplicates = sorted({n for n in func_names if func_names.count(n) > 1})
+    if duplicates:
+        raise ValueError('> Functions must have different names: {}'.format(', '.join(duplicates)))
+
+    if not pyfuncs:
+        return {} if names is not None else []
+
+    code = '\n\n'.join(get_source_function(f) for f in pyfuncs)
+    mod  = epyccel( code, **kwargs )
+    funcs = [getattr(mod, n) for n in func_names]
+
+    return dict(zip(names, funcs)) if names is not None else funcs
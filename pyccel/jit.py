@@ -0,0 +1,266 @@
+# coding: utf-8
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+"""
+Module containing the jit decorator which compiles a function with epyccel
+the first time it is called with a given signature
+"""
+
+import ast
+import functools
+import inspect
+import io
+import os
+import threading
+import tokenize
+
+import numpy
+
+from pyccel.epyccel import epyccel_source, get_source_function
+
+__all__ = ['get_type_annotation', 'JitFunction', 'jit']
+
+#==============================================================================
+# map Python scalar types to the corresponding pyccel types
+_python_types = {
+    bool    : 'bool',
+    int     : 'int',
+    float   : 'real',
+    complex : 'complex',
+}
+
+# map NumPy dtypes to the corresponding pyccel types
+_numpy_types = {
+    numpy.dtype(numpy.bool_)      : 'bool',
+    numpy.dtype(numpy.int8)       : 'int8',
+    numpy.dtype(numpy.int16)      : 'int16',
+    numpy.dtype(numpy.int32)      : 'int32',
+    numpy.dtype(numpy.int64)      : 'int64',
+    numpy.dtype(numpy.float32)    : 'float32',
+    numpy.dtype(numpy.float64)    : 'float64',
+    numpy.dtype(numpy.complex64)  : 'complex64',
+    numpy.dtype(numpy.complex128) : 'complex128',
+}
+
+#==============================================================================
+def get_type_annotation(arg):
+    """
+    Get the type annotation describing an argument, as it would be written
+    in a @types decorator.
+
+    Parameters
+    ----------
+    arg : object
+          The value passed to the function
+
+    Returns
+    -------
+    annotation : str
+          The type of the argument (e.g. 'float64[:,:](order=F)'), or None
+          if pyccel cannot handle the argument (e.g. a non-contiguous array)
+    """
+    if isinstance(arg, numpy.ndarray):
+        dtype = _numpy_types.get(arg.dtype, None)
+        if dtype is None or arg.ndim == 0:
+            return None
+        if arg.flags.c_contiguous:
+            order = ''
+        elif arg.flags.f_contiguous:
+            order = '(order=F)'
+        else:
+            return None
+        return '{}[{}]{}'.format(dtype, ','.join(':'*arg.ndim), order)
+
+    elif isinstance(arg, numpy.generic):
+        return _numpy_types.get(arg.dtype, None)
+
+    else:
+        return _python_types.get(type(arg), None)
+
+#==============================================================================
+def _is_replaced_decorator(decorator):
+    """ Indicate whether a decorator node refers to the jit decorator or
+    to a @types decorator, which are replaced in the specialised source
+    """
+    if isinstance(decorator, ast.Call):
+        decorator = decorator.func
+    if isinstance(decorator, ast.Attribute):
+        return decorator.attr == 'jit'
+    return isinstance(decorator, ast.Name) and decorator.id in ('jit', 'types')
+
+def _get_def_line(code, start):
+    """ Get the index of the line containing the def keyword of a function
+    whose decorators start at the line index start. The line number of the
+    FunctionDef node cannot be used as it points to the first decorator
+    before python 3.8
+    """
+    depth = 0
+    for tok in tokenize.generate_tokens(io.StringIO(code).readline):
+        if tok.type == tokenize.OP and tok.string in '([{':
+            depth += 1
+        elif tok.type == tokenize.OP and tok.string in ')]}':
+            depth -= 1
+        elif tok.type == tokenize.NAME and tok.string == 'def' and depth == 0 \
+                and tok.start[0]-1 >= start:
+            return tok.start[0]-1
+    raise ValueError('Function definition not found')
+
+def _get_specialised_source(code, annotations):
+    """
+    Get the source code of a function where the jit decorator is replaced
+    by a @types decorator describing the signature of the specialisation.
+
+    Parameters
+    ----------
+    code        : str
+                  The source code of the function
+    annotations : tuple of str
+                  The type of each argument
+
+    Returns
+    -------
+    code : str
+           The source code which can be passed to epyccel
+    """
+    func_def = ast.parse(code).body[0]
+    lines = code.splitlines(keepends=True)
+
+    # Each decorator spans the lines up to the start of the next decorator
+    # or up to the def keyword
+    starts   = [d.lineno-1 for d in func_def.decorator_list]
+    def_line = _get_def_line(code, starts[-1] if starts else 0)
+    ends     = starts[1:] + [def_line]
+
+    # Keep the decorators which are understood by pyccel (e.g. @pure)
+    decorators = [''.join(lines[start:end]) for d, start, end in
+                    zip(func_def.decorator_list, starts, ends)
+                    if not _is_replaced_decorator(d)]
+    types = ', '.join(repr(a) for a in annotations)
+
+    header = '@types({})\n'.format(types) + ''.join(decorators)
+    return header + ''.join(lines[def_line:])
+
+#==============================================================================
+class JitFunction:
+    """
+    Function which is compiled with epyccel the first time it is called
+    with a given signature.
+
+    The signature is determined from the type, the rank and the ordering
+    of the arguments. Each signature leads to a specialised extension
+    module, which is stored in the '__epyccel__' folder next to the module
+    defining the function. As epyccel names the modules after their
+    content, the specialisations are reused by other processes (or later
+    runs) without being compiled again. Arguments which pyccel cannot handle (e.g.
+    non-contiguous arrays) are passed to the original Python function.
+
+    Parameters
+    ----------
+    func    : function
+              The Python function to be accelerated
+    options : dict
+              The options passed to epyccel_source (e.g. language)
+    """
+    def __init__(self, func, **options):
+        functools.update_wrapper(self, func)
+        self._func       = func
+        self._options    = options
+        self._signature  = inspect.signature(func)
+        self._code       = get_source_function(func)
+        self._dirpath    = os.path.dirname(os.path.abspath(inspect.getfile(func)))
+        self._lock       = threading.Lock()
+        self._specialisations = {}
+
+    @property
+    def python_function(self):
+        """ The original Python function
+        """
+        return self._func
+
+    @property
+    def signatures(self):
+        """ The signatures which have been compiled so far
+        """
+        return list(self._specialisations.keys())
+
+    def compile(self, *annotations):
+        """
+        Compile the specialisation of the function for a given signature,
+        unless it was already compiled.
+
+        Parameters
+        ----------
+        annotations : str
+                  The type of each argument as it would be written in a
+                  @types decorator (e.g. 'float64[:]')
+
+        Returns
+        -------
+        func : function
+               The compiled function
+        """
+        compiled = self._specialisations.get(annotations, None)
+        if compiled is None:
+            with self._lock:
+                compiled = self._specialisations.get(annotations, None)
+                if compiled is None:
+                    code = _get_specialised_source(self._code, annotations)
+                    module = epyccel_source(code, self._dirpath, 'mod', **self._options)
+                    compiled = getattr(module, self.__name__)
+                    self._specialisations[annotations] = compiled
+        return compiled
+
+    def __reduce__(self):
+        # Pickle the function by reference: the process which unpickles it
+        # imports the module defining it, and the specialisations which it
+        # compiles are found in the cache of epyccel
+        return self.__qualname__
+
+    def __call__(self, *args, **kwargs):
+        bound = self._signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+
+        annotations = tuple(get_type_annotation(a) for a in bound.args)
+        if bound.kwargs or None in annotations:
+            return self._func(*args, **kwargs)
+
+        return self.compile(*annotations)(*bound.args)
+
+#==============================================================================
+def jit(func = None, **options):
+    """
+    Decorator which accelerates a function with Pyccel without requiring
+    type annotations.
+
+    The function is compiled the first time it is called, for the types of
+    the arguments which are passed. A new specialisation is compiled each
+    time the function is called with a new signature.
+
+    Parameters
+    ----------
+    func    : function
+              The Python function to be accelerated
+    options : dict
+              The options passed to epyccel_source (e.g. language, compiler)
+
+    Returns
+    -------
+    res : JitFunction
+          Callable object dispatching the calls to the specialisations
+
+    Examples
+    --------
+    >>> from pyccel.jit import jit
+    >>> @jit(language='c')
+    ... def add(x, y):
+    ...     return x + y
+    >>> add(1, 2)      # Compiles a specialisation for ('int', 'int')
+    3
+    >>> add(1.0, 2.5)  # Compiles a specialisation for ('real', 'real')
+    3.5
+    """
+    if func is None:
+        return functools.partial(jit, **options)
+    return JitFunction(func, **options)
@@ -40,6 +40,14 @@ from pyccel.errors.messages import *
 errors = Errors()
 #==============================================================================
 
+# contents of the .pyccel files which were loaded or saved by this process
+# The bytes are kept rather than the parsers: the semantic stage modifies
+# the namespace of the parser which it annotates, so each parser which loads
+# a file must get its own copy, and unpickling is faster than a deep copy
+_pickled_parsers = {}
+
+#==============================================================================
+
 strip_ansi_escape = re.compile(r'(\x9B|\x1B\[)[0-?]*[ -\/]*[@-~]|[\n\t\r]')
 
 # use this to delete ansi_escape characters from a string
@@ -563,8 +571,10 @@ class BasicParser(object):
         try:
             code = self.code.encode('utf-8')
             hs   = hashlib.md5(code)
+            data = pickle.dumps((hs.hexdigest(), __version__, self), pickle.HIGHEST_PROTOCOL)
+            _pickled_parsers[filename] = data
             with open(filename, 'wb') as f:
-                pickle.dump((hs.hexdigest(), __version__, self), f, pickle.HIGHEST_PROTOCOL)
+                f.write(data)
         except (FileNotFoundError, PermissionError, pickle.PickleError):
             pass
 
@@ -598,15 +608,21 @@ class BasicParser(object):
         if not filename.split(""".""")[-1] == 'pyccel':
             raise ValueError('Expecting a .pyccel extension')
 
+        # The file is only read once per process, but it is unpickled for
+        # each parser
+        data = _pickled_parsers.get(filename, None)
         try:
-            with open(filename, 'rb') as f:
-                hs, version, parser = pickle.load(f)
+            if data is None:
+                with open(filename, 'rb') as f:
+                    data = f.read()
+            hs, version, parser = pickle.loads(data)
         except (FileNotFoundError, PermissionError, pickle.PickleError):
             return
 
         import hashlib
         code = self.code.encode('utf-8')
         if hashlib.md5(code).hexdigest() == hs and __version__ == version:
+            _pickled_parsers[filename] = data
             self.copy(parser)
 
     def copy(self, parser):
@@ -0,0 +1,312 @@
+# coding: utf-8
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+"""
+Module containing the index of precompiled header files.
+
+The headers (.pyh files) of a folder can be precompiled into a single index
+file, which is generated when pyccel is installed for the headers of the
+standard library. The index starts with a directory describing each header
+(its hash, its meta variables and the position of the statements defining
+each of its symbols) followed by the pickled statements. The statements are
+only read and deserialised when the symbols they define are imported.
+"""
+
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+
+from pyccel.version import __version__
+
+from pyccel.ast.core    import Comment, CommentBlock, EmptyNode
+from pyccel.ast.headers import FunctionHeader, VariableHeader
+
+from pyccel.errors.errors import Errors
+
+__all__ = ['HeaderIndex', 'IndexedHeader', 'build_header_index',
+           'find_indexed_header', 'index_filename', 'index_format_version']
+
+# Version of the layout of the index files. It must be increased whenever
+# the contents of the files change
+index_format_version = 1
+
+# Name of the index file in a folder of headers
+index_filename = 'headers.index'
+
+# Indexes which have been opened by this process
+_indexes = {}
+
+#==============================================================================
+def _hash_code(code):
+    """ Hash of the code of a header
+    """
+    return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
+#==============================================================================
+class IndexedHeader:
+    """
+    A header file which is described by an index.
+
+    Parameters
+    ----------
+    index    : HeaderIndex
+               The index containing the header
+    metavars : OrderedDict
+               The meta variables of the header
+    symbols  : dict
+               The position (offset and size) of the statements defining
+               each symbol. The statements which do not define a symbol
+               are stored with the key None
+    """
+    def __init__(self, index, metavars, symbols):
+        self._index    = index
+        self._metavars = metavars
+        self._symbols  = symbols
+
+    @property
+    def metavars(self):
+        """ The meta variables of the header
+        """
+        return self._metavars
+
+    @property
+    def symbols(self):
+        """ The names of the symbols defined in the header
+        """
+        return [s for s in self._symbols if s is not None]
+
+    def read(self, symbols = None, common = True):
+        """
+        Read the statements which define some symbols of the header.
+
+        Parameters
+        ----------
+        symbols : iterable
+                  The names of the symbols. Names which are not defined in
+                  the header are ignored. If None, all the statements are read
+        common  : bool
+                  Indicates whether the statements which do not define a
+                  symbol should also be read
+
+        Returns
+        -------
+        statements : list
+                     The statements in the order of the header
+        """
+        if symbols is None:
+            keys = list(self._symbols)
+        else:
+            symbols = set(symbols)
+            keys = [s for s in self._symbols if s in symbols]
+        if not common and None in keys:
+            keys.remove(None)
+        elif common and None in self._symbols and None not in keys:
+            keys.insert(0, None)
+
+        positions = sorted((self._symbols[k] for k in keys), key=lambda p: p[0])
+        return [s for p in positions for s in self._index.read_statements(*p)]
+
+#==============================================================================
+class HeaderIndex:
+    """
+    Index of the precompiled headers of a folder.
+
+    Only the directory of the index is read when it is opened. The
+    statements are read from the file when they are needed. An index which
+    was created by a different version of pyccel is ignored.
+
+    Parameters
+    ----------
+    path : str
+           The path to the index file
+    """
+    def __init__(self, path):
+        self._path    = path
+        self._headers = {}
+        self._start   = 0
+        try:
+            with open(path, 'rb') as f:
+                version, pyccel_version, headers = pickle.load(f)
+                self._start = f.tell()
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            return
+        if (version, pyccel_version) == (index_format_version, __version__):
+            self._headers = headers
+
+    @property
+    def path(self):
+        """ The path to the index file
+        """
+        return self._path
+
+    @property
+    def headers(self):
+        """ The names of the headers described by the index
+        """
+        return list(self._headers)
+
+    def get_header(self, filename, code):
+        """
+        Get the description of a header from the index.
+
+        Parameters
+        ----------
+        filename : str
+                   The path to the header file
+        code     : str
+                   The current contents of the header file
+
+        Returns
+        -------
+        header : IndexedHeader
+                 The description of the header, or None if the header is not
+                 in the index or if it has changed since the index was built
+        """
+        entry = self._headers.get(os.path.basename(filename), None)
+        if entry is None or entry['hash'] != _hash_code(code):
+            return None
+        return IndexedHeader(self, entry['metavars'], entry['symbols'])
+
+    def read_statements(self, offset, size):
+        """
+        Read some pickled statements from the index file.
+
+        Parameters
+        ----------
+        offset : int
+                 The position of the pickled statements after the directory
+        size   : int
+                 The size of the pickled statements
+
+        Returns
+        -------
+        statements : list
+        """
+        with open(self._path, 'rb') as f:
+            f.seek(self._start + offset)
+            return pickle.loads(f.read(size))
+
+#==============================================================================
+def find_indexed_header(filename, code):
+    """
+    Find a header in the index of its folder.
+
+    Parameters
+    ----------
+    filename : str
+               The path to the header file
+    code     : str
+               The current contents of the header file
+
+    Returns
+    -------
+    header : IndexedHeader
+             The description of the header, or None if its folder has no
+             valid index or if the header has changed since the index was built
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(filename)), index_filename)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+    cached = _indexes.get(path, None)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, HeaderIndex(path))
+        _indexes[path] = cached
+
+    return cached[1].get_header(filename, code)
+
+#==============================================================================
+def build_header_index(folder, filename = None):
+    """
+    Precompile the headers of a folder into an index.
+
+    Headers which cannot be parsed are left out of the index: they are
+    parsed normally when they are imported.
+
+    Parameters
+    ----------
+    folder   : str
+               The folder containing the .pyh files
+    filename : str
+               The path to the index file. By default it is placed in the
+               folder, where it is found by the parser
+
+    Returns
+    -------
+    headers : list
+              The names of the headers in the index
+    """
+    # Imported here to avoid a circular import with the syntactic stage
+    from pyccel.parser.syntactic import SyntaxParser
+
+    if filename is None:
+        filename = os.path.join(folder, index_filename)
+
+    errors    = Errors()
+    directory = OrderedDict()
+    blobs     = []
+    offset    = 0
+
+    for name in sorted(f for f in os.listdir(folder) if f.endswith('.pyh')):
+        path       = os.path.join(folder, name)
+        dump_file  = path[:-len('.pyh')] + '.pyccel'
+        was_dumped = os.path.exists(dump_file)
+        try:
+            parser = SyntaxParser(path)
+            failed = errors.has_errors()
+        except Exception: # pylint: disable=broad-except
+            failed = True
+        finally:
+            errors.reset()
+            # Do not leave the pickled parser next to the header
+            if not was_dumped and os.path.exists(dump_file):
+                os.remove(dump_file)
+        if failed:
+            continue
+
+        # Group the statements by the symbol which they define
+        groups = OrderedDict()
+        for stmt in parser.ast.module.body:
+            if isinstance(stmt, (Comment, CommentBlock, EmptyNode)):
+                continue
+            key = str(stmt.name) if isinstance(stmt, (FunctionHeader, VariableHeader)) else None
+            groups.setdefault(key, []).append(stmt)
+
+        symbols = OrderedDict()
+        for key, stmts in groups.items():
+            data = pickle.dumps(stmts, pickle.HIGHEST_PROTOCOL)
+            symbols[key] = (offset, len(data))
+            offset += len(data)
+            blobs.append(data)
+
+        directory[name] = {'hash'     : _hash_code(parser.code),
+                           'metavars' : OrderedDict(parser.metavars),
+                           'symbols'  : symbols}
+
+    # The file is written atomically as it may be read by other processes
+    tmp_filename = '{}.{}.tmp'.format(filename, os.getpid())
+    with open(tmp_filename, 'wb') as f:
+        pickle.dump((index_format_version, __version__, directory), f, pickle.HIGHEST_PROTOCOL)
+        for data in blobs:
+            f.write(data)
+    os.replace(tmp_filename, filename)
+
+    _indexes.pop(os.path.abspath(filename), None)
+
+    return list(directory)
+
+#==============================================================================
+if __name__ == '__main__':
+    import sys
+
+    if len(sys.argv) > 1:
+        stdlib_folder = sys.argv[1]
+    else:
+        stdlib_folder = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                     'stdlib', 'internal')
+    print(*build_header_index(stdlib_folder))
@@ -12,17 +12,20 @@ import os
 import copy
 from collections import OrderedDict
 
+from pyccel.ast.core         import AsName
 from pyccel.parser.base      import get_filename_from_import
 from pyccel.parser.syntactic import SyntaxParser
 from pyccel.parser.semantic  import SemanticParser
+from pyccel.parser.semantic_cache import SemanticCache
 
 # TODO [AR, 18.11.2018] to be modified as a function
 # TODO [YG, 28.01.2020] maybe pass filename to the parse method?
 class Parser(object):
 
-    def __init__(self, filename, **kwargs):
+    def __init__(self, filename, *, code = None, **kwargs):
 
         self._filename = filename
+        self._code     = code
         self._kwargs   = kwargs
 
         # we use it to store the imports
@@ -141,7 +144,11 @@ class Parser(object):
         if self._syntax_parser:
             return self._syntax_parser.ast
 
-        parser             = SyntaxParser(self._filename, **self._kwargs)
+        if self._code is None:
+            parser         = SyntaxParser(self._filename, **self._kwargs)
+        else:
+            # The code is not read from the file
+            parser         = SyntaxParser(self._code, filename=self._filename, **self._kwargs)
         self.syntax_parser = parser
         parse_result       = parser.ast
 
@@ -184,16 +191,51 @@ class Parser(object):
         verbose = settings.pop('verbose', False)
         self._annotate_sons(verbose=verbose)
 
+        # The result of the semantic stage of an imported Python file is
+        # cached so that it can be reused by the modules which import it.
+        # The file being translated (which has no parents) is not cached
+        if self._parents and self._code is None and self._filename.endswith('.py') and \
+                os.path.isfile(self._filename):
+            cache = SemanticCache(self._filename, self.get_source_files())
+        else:
+            cache = None
+
         # Create a new semantic parser and store it in object
         parser = SemanticParser(self._syntax_parser,
                                 d_parsers=self.d_parsers,
                                 parents=self.parents,
+                                cache=cache,
                                 **settings)
         self._semantic_parser = parser
 
         # Return the new semantic parser (maybe used by codegen)
         return parser
 
+    def get_source_files(self, files=None):
+        """
+        Get the files which the result of the semantic stage depends on.
+
+        These are the file parsed by this parser and all the files that
+        it imports, directly or not.
+
+        Parameters
+        ----------
+        files : list
+            The files which have already been collected.
+
+        Returns
+        -------
+        files : list
+            The updated list of files.
+        """
+        if files is None:
+            files = [self._filename]
+        for son in self.sons:
+            if son.filename not in files:
+                files.append(son.filename)
+                son.get_source_files(files)
+        return files
+
     def append_parent(self, parent):
         """."""
 
@@ -239,7 +281,7 @@ class Parser(object):
             # get the absolute path corresponding to source
 
             filename = get_filename_from_import(source, self._input_folder)
-            q = Parser(filename)
+            q = Parser(filename, targets=self._get_import_targets(source))
             q.parse(d_parsers=d_parsers)
             if q.module_parser:
                 d_parsers[source] = q.module_parser
@@ -248,11 +290,24 @@ class Parser(object):
 
         # link self to its sons
         for source in imports:
+            # A header loaded from an index may not contain the symbols
+            # imported by this file if it was first imported by another one
+            if source not in not_treated:
+                d_parsers[source].syntax_parser.load_header_symbols(
+                        self._get_import_targets(source))
             d_parsers[source].append_parent(self)
             self.append_son(d_parsers[source])
 
         return d_parsers
 
+    def _get_import_targets(self, source):
+        """
+        Get the names of the symbols imported from a module.
+        An empty list is returned if the whole module is imported.
+        """
+        return [str(t.name) if isinstance(t, AsName) else str(t)
+                for t in self.imports[source]]
+
     def _annotate_sons(self, **settings):
 
         verbose = settings.pop('verbose', False)
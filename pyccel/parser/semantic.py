@@ -9,18 +9,9 @@
 from collections import OrderedDict
 from itertools import chain
 
-from sympy.utilities.iterables import iterable as sympy_iterable
-
-from sympy import Sum as Summation
-from sympy import Symbol as sp_Symbol
-from sympy import Integer as sp_Integer
-from sympy import ceiling
-from sympy import oo  as INF
-from sympy.core import cache
-
 #==============================================================================
 
-from pyccel.ast.basic import Basic, PyccelAstNode
+from pyccel.ast.basic import Basic, PyccelAstNode, Visitor
 
 from pyccel.ast.core import Comment, CommentBlock, Pass, Continue, Break, AnnotatedComment
 
@@ -90,8 +81,6 @@ from pyccel.ast.numpyext import NumpyArrayClass, NumpyNewArray
 
 from pyccel.ast.internals import Slice, PyccelSymbol
 
-from pyccel.ast.sympy_helper import sympy_to_pyccel, pyccel_to_sympy
-
 from pyccel.ast.omp import (OMP_For_Loop, OMP_Simd_Construct, OMP_Distribute_Construct,
                             OMP_TaskLoop_Construct, OMP_Sections_Construct, Omp_End_Clause,
                             OMP_Single_Construct, OmpAnnotatedComment)
@@ -106,6 +95,7 @@ from pyccel.errors.messages import *
 from pyccel.parser.base      import BasicParser, Scope
 from pyccel.parser.base      import get_filename_from_import
 from pyccel.parser.syntactic import SyntaxParser
+from pyccel.parser.utilities import clear_sympy_cache
 
 import pyccel.decorators as def_decorators
 #==============================================================================
@@ -131,10 +121,11 @@ def _get_name(var):
 
 #==============================================================================
 
-class SemanticParser(BasicParser):
+class SemanticParser(BasicParser, Visitor):
 
     """ Class for a Semantic Parser.
     It takes a syntactic parser as input for the moment"""
+    _visitor_prefix = '_visit_'
 
     def __init__(self, inputs, **kwargs):
 
@@ -142,6 +133,7 @@ class SemanticParser(BasicParser):
         # imports are then its sons.
         self._parents = kwargs.pop('parents', [])
         self._d_parsers = kwargs.pop('d_parsers', OrderedDict())
+        cache = kwargs.pop('cache', None)
 
         # ...
         if not isinstance(inputs, SyntaxParser):
@@ -176,7 +168,17 @@ class SemanticParser(BasicParser):
 
         # ... TOD add settings
         settings = {}
-        self.annotate()
+        state = cache.load() if cache else None
+        if state:
+            (self._ast, self._namespace, self._metavars,
+                    self._used_names, self._dummy_counter) = state
+            self._semantic_done = True
+            PyccelAstNode.stage = 'semantic'
+        else:
+            self.annotate()
+            if cache and not errors.has_errors():
+                cache.dump((self.ast, self.namespace, self.metavars,
+                            self.used_names, self._dummy_counter))
         # ...
 
     #================================================================
@@ -1361,7 +1363,8 @@ class SemanticParser(BasicParser):
         for the object expr. X is the type of the object expr. If this function
         does not exist then the method resolution order is used to search for
         other compatible _visit_X functions. If none are found then an error is
-        raised
+        raised. The function found for each type is saved in the dispatch
+        table of the class (see Visitor)
         """
 
         # TODO - add settings to Errors
@@ -1372,15 +1375,16 @@ class SemanticParser(BasicParser):
         if hasattr(expr,'fst') and expr.fst is not None:
             self._current_fst_node = expr.fst
 
-        classes = type(expr).__mro__
-        for cls in classes:
-            annotation_method = '_visit_' + cls.__name__
-            if hasattr(self, annotation_method):
-                obj = getattr(self, annotation_method)(expr, **settings)
-                if isinstance(obj, Basic) and self._current_fst_node:
-                    obj.set_fst(self._current_fst_node)
-                self._current_fst_node = current_fst
-                return obj
+        try:
+            annotation_method = self._dispatch_table[type(expr)]
+        except KeyError:
+            annotation_method = self._add_to_dispatch_table(type(expr))
+        if annotation_method is not None:
+            obj = annotation_method(self, expr, **settings)
+            if isinstance(obj, Basic) and self._current_fst_node:
+                obj.set_fst(self._current_fst_node)
+            self._current_fst_node = current_fst
+            return obj
 
         # Unknown object, we raise an error.
         errors.report(PYCCEL_RESTRICTION_TODO, symbol=type(expr),
@@ -1872,7 +1876,7 @@ class SemanticParser(BasicParser):
                 # the namespace
                 # TODO improve
 
-                if not sympy_iterable(lhs):
+                if not isinstance(lhs, (list, tuple, PythonTuple)):
                     lhs = [lhs]
 
                 results = []
@@ -1915,7 +1919,7 @@ class SemanticParser(BasicParser):
                             self.insert_variable(lhs)
 
                     name = macro.name
-                    if not sympy_iterable(lhs):
+                    if not isinstance(lhs, (list, tuple, PythonTuple)):
                         lhs = [lhs]
                     results = []
                     for a in lhs:
@@ -2347,8 +2351,10 @@ class SemanticParser(BasicParser):
             if str_dtype(dtype) in ['real', 'complex']:
                 val = LiteralFloat(0.0)
         elif isinstance(expr, FunctionalMin):
+            from sympy import oo as INF
             val = INF
         elif isinstance(expr, FunctionalMax):
+            from sympy import oo as INF
             val = -INF
 
         stmt = Assign(expr.lhs, val)
@@ -2365,6 +2371,12 @@ class SemanticParser(BasicParser):
         return expr_new
 
     def _visit_FunctionalFor(self, expr, **settings):
+        # sympy is only needed to calculate the size of the generated array
+        from sympy import Sum as Summation
+        from sympy import Symbol as sp_Symbol
+        from sympy import Integer as sp_Integer
+        from sympy import ceiling
+        from pyccel.ast.sympy_helper import sympy_to_pyccel, pyccel_to_sympy
 
         target  = expr.expr
         index   = expr.index
@@ -2939,7 +2951,7 @@ class SemanticParser(BasicParser):
 
             #clear the sympy cache
             #TODO clear all variable except the global ones
-            cache.clear_cache()
+            clear_sympy_cache()
         if len(funcs) == 1:
             funcs = funcs[0]
             self.insert_function(funcs)
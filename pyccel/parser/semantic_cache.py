@@ -0,0 +1,171 @@
+# coding: utf-8
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+"""
+Module containing the SemanticCache class which saves the result of the
+semantic stage of a Python module, so that the modules which import it do
+not need to annotate it again
+"""
+
+import os
+import pickle
+import sys
+import threading
+
+from pyccel.version import __version__
+
+from pyccel.ast.basic     import Basic
+from pyccel.ast.datatypes import DataTypeFactory, CustomDataType
+from pyccel.ast.literals  import LiteralTrue, LiteralFalse
+
+from pyccel.codegen.manifest import hash_file
+
+from pyccel.utilities.metaclasses import Singleton
+
+__all__ = ['SemanticCache', 'cache_format_version']
+
+# Version of the layout of the cache files. It must be increased whenever
+# the contents of the files change
+cache_format_version = 3
+
+#==============================================================================
+def _new_node(cls):
+    """ Create an empty node whose attributes are restored by pickle
+    """
+    return object.__new__(cls)
+
+def _new_datatype_class(name, prefix, base, alias, is_iterable, is_with_construct, is_polymorphic):
+    """ Create the class of a user-defined datatype (see DataTypeFactory)
+    """
+    return DataTypeFactory(name, BaseClass = base, prefix = prefix, alias = alias,
+                           is_iterable = is_iterable,
+                           is_with_construct = is_with_construct,
+                           is_polymorphic = is_polymorphic)
+
+def _slots(cls):
+    """ Names of all the slots of a class
+    """
+    slots = []
+    for c in cls.__mro__:
+        c_slots = c.__dict__.get('__slots__', ())
+        # A single slot may be given as a string
+        if isinstance(c_slots, str):
+            c_slots = (c_slots,)
+        slots.extend(s for s in c_slots if s != '__dict__')
+    return slots
+
+#==============================================================================
+class _NodePickler(pickle.Pickler):
+    """
+    Pickler for annotated syntax trees.
+
+    The nodes are saved attribute by attribute instead of being rebuilt from
+    their constructor arguments. This preserves the links between the nodes
+    and their users (which form cycles), the singletons, and the classes
+    created at runtime for user-defined datatypes.
+    """
+    def reducer_override(self, obj):
+        if isinstance(obj, type):
+            if issubclass(obj, CustomDataType) and obj is not CustomDataType:
+                prefix = obj.prefix[len('Pyccel'):] or None
+                return (_new_datatype_class, (obj._name, prefix, obj.__bases__[0],
+                        obj.alias, obj.is_iterable, obj.is_with_construct, obj.is_polymorphic))
+            return NotImplemented
+
+        cls = type(obj)
+        if isinstance(obj, (LiteralTrue, LiteralFalse)):
+            return (cls, (obj.precision,))
+        elif isinstance(cls, Singleton):
+            return (cls, ())
+        elif isinstance(obj, Basic):
+            state = {s : getattr(obj, s) for s in _slots(cls) if hasattr(obj, s)}
+            return (_new_node, (cls,), (getattr(obj, '__dict__', None), state))
+        return NotImplemented
+
+#==============================================================================
+class SemanticCache:
+    """
+    Cache of the result of the semantic stage for a Python module.
+
+    The annotated syntax tree, the namespace (which contains the function
+    signatures, including the instantiated templates, the classes and the
+    variables of the module) and the meta variables are pickled in the
+    __pyccel__ folder next to the module. The file is only used if it was
+    created by the same version of pyccel and of the cache format, and if
+    none of the source files which the module depends on have changed.
+
+    Parameters
+    ----------
+    filename : str
+               The path to the Python module
+    sources  : iterable
+               The files whose contents determine the result of the
+               semantic stage (the module and all the files it imports,
+               directly or not)
+    """
+    def __init__(self, filename, sources):
+        folder, name  = os.path.split(filename)
+        self._folder  = os.path.join(folder, '__pyccel__')
+        self._path    = os.path.join(self._folder, os.path.splitext(name)[0] + '.semantic')
+        self._header  = (cache_format_version, __version__, tuple(sys.version_info[:2]),
+                         {f : hash_file(f) for f in sources})
+
+    @property
+    def path(self):
+        """ The path to the cache file
+        """
+        return self._path
+
+    def load(self):
+        """
+        Read the result of the semantic stage from the cache.
+
+        Returns
+        -------
+        state : tuple
+                The annotated syntax tree, the namespace, the meta
+                variables, the used names and the dummy counter of the
+                parser, or None if no valid cache was found
+        """
+        try:
+            with open(self._path, 'rb') as f:
+                if pickle.load(f) != self._header:
+                    return None
+                return pickle.load(f)
+        except Exception: # pylint: disable=broad-except
+            # A missing, corrupted or incompatible cache is simply ignored
+            return None
+
+    def dump(self, state):
+        """
+        Save the result of the semantic stage in the cache.
+
+        The file is written atomically. Nothing is saved if the folder is
+        not writable or if the tree cannot be pickled. Nothing is saved
+        either before python 3.8, where the pickler cannot preserve the
+        singletons and the classes created at runtime.
+
+        Parameters
+        ----------
+        state : tuple
+                The annotated syntax tree, the namespace, the meta
+                variables, the used names and the dummy counter of the
+                parser
+        """
+        if sys.version_info < (3, 8):
+            return
+
+        tmp_path = '{}.{}.{}.tmp'.format(self._path, os.getpid(), threading.get_ident())
+        try:
+            os.makedirs(self._folder, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(self._header, f, pickle.HIGHEST_PROTOCOL)
+                _NodePickler(f, pickle.HIGHEST_PROTOCOL).dump(state)
+            os.replace(tmp_path, self._path)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError, RecursionError):
+            pass
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -13,7 +13,6 @@ import ast
 
 #==============================================================================
 
-from sympy.core import cache
 
 #==============================================================================
 
@@ -67,13 +66,17 @@ from pyccel.ast.internals import Slice, PyccelSymbol, PyccelInternalFunction
 
 from pyccel.parser.extend_tree import extend_tree
 from pyccel.parser.base import BasicParser
+from pyccel.parser.header_index import find_indexed_header
 from pyccel.parser.utilities import read_file
 from pyccel.parser.utilities import get_default_path
+from pyccel.parser.utilities import clear_sympy_cache
 
 from pyccel.parser.syntax.headers import parse as hdr_parse
 from pyccel.parser.syntax.openmp  import parse as omp_parse
 from pyccel.parser.syntax.openacc import parse as acc_parse
 
+from pyccel.codegen.utilities import optimisation_profiles, isa_levels
+
 from pyccel.errors.errors import Errors
 
 # TODO - remove import * and only import what we need
@@ -106,14 +109,29 @@ class SyntaxParser(BasicParser):
 
         inputs: str
             filename or code to parse as a string
+
+        filename: str
+            name of the file which the code would be read from, if the
+            code is given as a string (used to name the module and to
+            report errors)
+
+        targets: list
+            names of the symbols which are imported from the file. If the
+            file is a header which was precompiled into an index, only the
+            statements defining these symbols are loaded. All the
+            statements are loaded if it is None or empty
     """
 
-    def __init__(self, inputs, **kwargs):
+    def __init__(self, inputs, *, filename = None, targets = None, **kwargs):
         BasicParser.__init__(self, **kwargs)
 
         # check if inputs is a file
         code = inputs
-        if os.path.isfile(inputs):
+        if filename is not None:
+            self._filename = filename
+            errors.set_target(self.filename, 'file')
+
+        elif os.path.isfile(inputs):
 
             self._filename = inputs
             errors.set_target(self.filename, 'file')
@@ -126,15 +144,72 @@ class SyntaxParser(BasicParser):
         self._code  = code
         self._scope = []
 
-        self.load()
+        # Headers which were precompiled into an index are read from it
+        # instead of being parsed or loaded from a .pyccel file
+        self._indexed_header = find_indexed_header(self.filename, code) \
+                                    if self.is_header_file else None
+        self._header_symbols = None
+
+        if self._indexed_header is None:
+            self.load()
 
         tree                = extend_tree(code)
         self._fst           = tree
         self._used_names    = set(get_name(a) for a in ast.walk(self._fst) if isinstance(a, (ast.Name, ast.arg)))
         self._dummy_counter = 1
 
-        self.parse(verbose=True)
-        self.dump()
+        if self._indexed_header is None:
+            self.parse(verbose=True)
+            self.dump()
+        else:
+            self._load_indexed_header(targets)
+
+    def _load_indexed_header(self, targets):
+        """
+        Create the syntax tree of a header from the statements saved in its
+        index. Only the statements defining the targets are read.
+        """
+        header = self._indexed_header
+        self._metavars = header.metavars.copy()
+        self._header_symbols = set(targets) if targets else None
+
+        mod_name = os.path.splitext(os.path.basename(self._filename))[0]
+        self._ast = ParserResult(program   = None,
+                                 module    = CodeBlock(header.read(self._header_symbols)),
+                                 prog_name = 'prog_' + mod_name,
+                                 mod_name  = mod_name)
+
+        self._visit_done  = True
+        self._syntax_done = True
+
+    def load_header_symbols(self, targets):
+        """
+        Add the statements defining some symbols to the syntax tree of a
+        header which was partially loaded from its index. This is needed
+        when the header is imported by several modules.
+
+        Parameters
+        ----------
+        targets : list
+            names of the imported symbols. All the remaining statements
+            are loaded if it is empty
+        """
+        if self._header_symbols is None:
+            return
+
+        symbols = set(targets) if targets else set(self._indexed_header.symbols)
+        symbols.difference_update(self._header_symbols)
+        if not symbols:
+            return
+
+        self._header_symbols.update(symbols)
+        if not targets:
+            self._header_symbols = None
+
+        stmts = self._indexed_header.read(symbols, common = False)
+        old_ast   = self._ast
+        self._ast = CodeBlock([*old_ast.body, *stmts])
+        old_ast.invalidate_node()
 
     def parse(self, verbose=False):
         """converts python ast to sympy ast."""
@@ -665,11 +740,32 @@ class SyntaxParser(BasicParser):
 
         if 'allow_negative_index' in decorators:
             decorators['allow_negative_index'] = tuple(str(b) for a in decorators['allow_negative_index'] for b in a.args)
+
+        if 'opt_profile' in decorators:
+            profiles = [str(b).strip("'").strip('"') for a in decorators['opt_profile'] for b in a.args]
+            if len(profiles) != 1 or profiles[0] not in optimisation_profiles:
+                msg = 'The opt_profile decorator expects one of the profiles {}'.format(
+                        optimisation_profiles)
+                errors.report(msg,
+                            bounding_box = (stmt.lineno, stmt.col_offset),
+                            severity='error')
+            decorators['opt_profile'] = profiles[0] if profiles else None
+
+        if 'multiversion' in decorators:
+            levels = tuple(str(b).strip("'").strip('"') for a in decorators['multiversion']
+                            if isinstance(a, FunctionCall) for b in a.args)
+            if any(l not in isa_levels for l in levels):
+                msg = 'The multiversion decorator expects instruction set levels among {}'.format(
+                        isa_levels)
+                errors.report(msg,
+                            bounding_box = (stmt.lineno, stmt.col_offset),
+                            severity='error')
+            decorators['multiversion'] = levels
         template['template_dict'] = {}
         # extract the templates
         if 'template' in decorators:
             for comb_types in decorators['template']:
-                cache.clear_cache()
+                clear_sympy_cache()
                 types = []
                 if len(comb_types.args) != 2:
                     msg = 'Number of Arguments provided to the template decorator is not valid'
@@ -725,7 +821,7 @@ class SyntaxParser(BasicParser):
         if 'types' in decorators:
             for comb_types in decorators['types']:
 
-                cache.clear_cache()
+                clear_sympy_cache()
                 results = []
                 ls = comb_types.args
 
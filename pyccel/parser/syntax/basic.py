@@ -4,7 +4,44 @@
 # go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
 #------------------------------------------------------------------------------------------#
 
-__all__ = ["BasicStmt"]
+from os.path import join, dirname
+
+__all__ = ["BasicStmt", "get_metamodel"]
+
+grammar_folder = join(dirname(__file__), '..', 'grammar')
+
+# Meta-models which have already been built in this process
+_metamodels = {}
+
+def get_metamodel(grammar, classes):
+    """
+    Get the textX meta-model of a grammar.
+
+    The meta-model is only built the first time that it is requested so that
+    importing pyccel does not pay the cost of building the meta-models of
+    grammars which are never used. The result is then reused for the rest of
+    the process.
+
+    Parameters
+    ----------
+    grammar : str
+        The name of the grammar file in the pyccel/parser/grammar folder
+        (e.g. 'openmp.tx').
+
+    classes : iterable
+        The user classes associated with the rules of the grammar.
+
+    Returns
+    -------
+    textx.metamodel.TextXMetaModel
+        The meta-model of the grammar.
+    """
+    meta = _metamodels.get(grammar, None)
+    if meta is None:
+        from textx.metamodel import metamodel_from_file
+        meta = metamodel_from_file(join(grammar_folder, grammar), classes=list(classes))
+        _metamodels[grammar] = meta
+    return meta
 
 class BasicStmt(object):
     """
@@ -5,11 +5,7 @@
 #------------------------------------------------------------------------------------------#
 """
 """
-from os.path import join, dirname
-
-from textx.metamodel import metamodel_from_file
-
-from pyccel.parser.syntax.basic import BasicStmt
+from pyccel.parser.syntax.basic import BasicStmt, get_metamodel
 from pyccel.ast.headers   import FunctionHeader, ClassHeader, MethodHeader, VariableHeader, Template
 from pyccel.ast.headers   import MetaVariable , UnionType, InterfaceHeader
 from pyccel.ast.headers   import construct_macro, MacroFunction, MacroVariable
@@ -520,12 +516,6 @@ hdr_classes = [Header, TypeHeader,
                MacroList,
                FunctionMacroStmt,StringStmt]
 
-this_folder = dirname(__file__)
-
-# Get meta-model from language description
-grammar = join(this_folder, '../grammar/headers.tx')
-
-meta = metamodel_from_file(grammar, classes=hdr_classes)
 
 def parse(filename=None, stmts=None):
     """ Parse header pragmas
@@ -543,6 +533,8 @@ def parse(filename=None, stmts=None):
       stmts  : list
 
     """
+    meta = get_metamodel('headers.tx', hdr_classes)
+
     # Instantiate model
     if filename:
         model = meta.model_from_file(filename)
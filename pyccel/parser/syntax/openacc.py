@@ -6,11 +6,7 @@
 """
 """
 
-from os.path import join, dirname
-
-from textx.metamodel import metamodel_from_file
-
-from pyccel.parser.syntax.basic import BasicStmt
+from pyccel.parser.syntax.basic import BasicStmt, get_metamodel
 from pyccel.ast.core import AnnotatedComment
 
 DEBUG = False
@@ -1308,13 +1304,6 @@ acc_clauses = [AccAsync,
 acc_classes = [Openacc, OpenaccStmt] + acc_directives + acc_clauses
 
 
-this_folder = dirname(__file__)
-
-# Get meta-model from language description
-grammar = join(this_folder, '../grammar/openacc.tx')
-
-meta = metamodel_from_file(grammar, classes=acc_classes)
-
 def parse(filename=None, stmts=None):
     """ Parse openacc pragmas
 
@@ -1331,6 +1320,8 @@ def parse(filename=None, stmts=None):
       stmts  : list
 
     """
+    meta = get_metamodel('openacc.tx', acc_classes)
+
     # Instantiate model
     if filename:
         model = meta.model_from_file(filename)
@@ -6,11 +6,7 @@
 """
 """
 
-from os.path import join, dirname
-
-from textx.metamodel import metamodel_from_file
-
-from pyccel.parser.syntax.basic import BasicStmt
+from pyccel.parser.syntax.basic import BasicStmt, get_metamodel
 
 from pyccel.ast.omp import (OmpAnnotatedComment, OMP_For_Loop, OMP_Parallel_Construct,
                             OMP_Single_Construct, Omp_End_Clause, OMP_Critical_Construct,
@@ -826,12 +822,6 @@ omp_clauses = (OmpCollapse,
 
 omp_classes = (Openmp, OpenmpStmt) + omp_directives + omp_clauses
 
-this_folder = dirname(__file__)
-
-# Get meta-model from language description
-grammar = join(this_folder, '../grammar/openmp.tx')
-
-meta = metamodel_from_file(grammar, classes=omp_classes)
 
 def parse(filename=None, stmts=None):
     """ Parse openmp pragmas
@@ -849,6 +839,8 @@ def parse(filename=None, stmts=None):
       stmts : list
 
     """
+    meta = get_metamodel('openmp.tx', omp_classes)
+
     # Instantiate model
     if filename:
         model = meta.model_from_file(filename)
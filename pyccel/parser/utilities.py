@@ -6,8 +6,8 @@
 
 """This file contains different utilities for the Parser."""
 
-from sympy import srepr
 import os
+import sys
 
 import string
 import random
@@ -108,9 +108,22 @@ def get_module_name( dotted_as_node ):
 #  ... utilities
 def view_tree(expr):
     """Views a sympy expression tree."""
+    from sympy import srepr
     print (srepr(expr))
 #  ...
 
+def clear_sympy_cache():
+    """
+    Clear the sympy cache if sympy has been imported.
+
+    Sympy is only imported on the code paths which need it (e.g. the
+    calculation of the size of list comprehensions), so there is nothing
+    to clear if it has not been loaded yet.
+    """
+    sympy_cache = sys.modules.get('sympy.core.cache', None)
+    if sympy_cache is not None:
+        sympy_cache.clear_cache()
+
 def get_default_path(name):
     """this function takes a an import name
       and returns the path full bash of the library
@@ -0,0 +1,482 @@
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+""" Module containing the functions which manage the folders where pyccel
+caches generated files: the folder shared between builds (whose runtime
+libraries can be evicted), and the '__epyccel__' and '__pyccel__' folders
+whose least recently used entries can be evicted
+"""
+
+import os
+import shutil
+import sysconfig
+import time
+
+try:
+    import fcntl
+except ImportError:
+    # Windows refuses to remove a loaded library, so no lock is needed
+    fcntl = None
+
+__all__ = (
+    'get_cache_dir',
+    'runtime_dirname',
+    'use_cached_file',
+    'CacheEntry',
+    'find_cache_entries',
+    'evict_cache',
+    'evict_runtime_cache',
+)
+
+ext_suffix = sysconfig.get_config_var('EXT_SUFFIX')
+
+# Name of the folder of the cache folder containing the runtime libraries
+runtime_dirname = 'runtime'
+
+# Extensions of the runtime libraries
+_library_exts = ('.a', '.so', '.dylib')
+
+# Files locked by this process, so that they are not evicted while it uses them
+_used_files = {}
+
+#==============================================================================
+def get_cache_dir():
+    """
+    Get the folder where pyccel stores the files shared between builds
+    (e.g. the runtime libraries and the toolchain information).
+
+    The folder can be chosen with the environment variable PYCCEL_CACHE_DIR.
+    Otherwise the user cache folder is used (XDG_CACHE_HOME or ~/.cache).
+
+    Returns
+    -------
+    folder : str
+             The absolute path to the cache folder
+    """
+    root = os.environ.get('PYCCEL_CACHE_DIR', None)
+    if not root:
+        cache_home = os.environ.get('XDG_CACHE_HOME', None) or \
+                os.path.join(os.path.expanduser('~'), '.cache')
+        root = os.path.join(cache_home, 'pyccel')
+    return os.path.abspath(root)
+
+#==============================================================================
+def use_cached_file(filename):
+    """
+    Mark a cached file as used by the current process.
+
+    A shared lock is held on the file until the process exits, so that
+    evict_cache never removes it. The access time of the file records the
+    last use, which orders the entries evicted first.
+
+    Parameters
+    ----------
+    filename : str
+               The path to the cached file (e.g. a module in '__epyccel__')
+
+    Returns
+    -------
+    bool
+          False if the file does not exist (e.g. it was evicted)
+    """
+    filename = os.path.abspath(filename)
+    while True:
+        try:
+            fd = os.open(filename, os.O_RDONLY)
+        except FileNotFoundError:
+            return False
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_SH)
+        try:
+            # The file may have been evicted or replaced before it was locked
+            if os.path.samestat(os.fstat(fd), os.stat(filename)):
+                break
+        except FileNotFoundError:
+            os.close(fd)
+            return False
+        os.close(fd)
+
+    old_fd = _used_files.pop(filename, None)
+    if old_fd is not None:
+        os.close(old_fd)
+    _used_files[filename] = fd
+
+    try:
+        # time.time_ns is not available before python 3.7
+        os.utime(filename, ns = (int(time.time() * 1e9), os.fstat(fd).st_mtime_ns))
+    except OSError:
+        # The file may belong to another user
+        pass
+
+    return True
+
+def _remove_unused_file(filename):
+    """
+    Remove a cached file unless it is used by a running process.
+
+    Parameters
+    ----------
+    filename : str
+               The path to the file
+
+    Returns
+    -------
+    bool
+          True if the file was removed (or no longer exists)
+    """
+    if fcntl is None:
+        try:
+            os.remove(filename)
+        except FileNotFoundError:
+            pass
+        except PermissionError:
+            # The library is loaded by a process
+            return False
+        return True
+
+    try:
+        fd = os.open(filename, os.O_RDONLY)
+    except FileNotFoundError:
+        return True
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return False
+    try:
+        os.remove(filename)
+    except FileNotFoundError:
+        pass
+    finally:
+        os.close(fd)
+    return True
+
+def _get_size(path):
+    """
+    Get the number of bytes used by a file or a folder.
+    """
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, f))
+               for root, _, files in os.walk(path) for f in files)
+
+def _get_last_modification(path):
+    """
+    Get the time of the last modification of a file or of any file in a folder.
+    """
+    times = [os.path.getmtime(path)]
+    if os.path.isdir(path):
+        times.extend(os.path.getmtime(os.path.join(root, f))
+                     for root, _, files in os.walk(path) for f in files)
+    return max(times)
+
+#==============================================================================
+class CacheEntry:
+    """
+    Files which are evicted together from a cache folder.
+
+    Parameters
+    ----------
+    name        : str
+                  A name describing the entry
+    paths       : list of str
+                  The files and folders which make up the entry
+    last_used   : float
+                  The time (in seconds since the epoch) when the entry was
+                  last used
+    module_file : str
+                  The file which is loaded by the processes using the entry,
+                  or None if the entry is never loaded
+    in_progress : bool
+                  Indicates whether the entry is the private folder of a
+                  build, which may not be finished
+    """
+    def __init__(self, name, paths, last_used, module_file = None, in_progress = False):
+        self._name        = name
+        self._paths       = paths
+        self._last_used   = last_used
+        self._module_file = module_file
+        self._in_progress = in_progress
+        self._size        = sum(_get_size(p) for p in paths)
+
+    @property
+    def name(self):
+        """ A name describing the entry
+        """
+        return self._name
+
+    @property
+    def paths(self):
+        """ The files and folders which make up the entry
+        """
+        return self._paths
+
+    @property
+    def last_used(self):
+        """ The time when the entry was last used
+        """
+        return self._last_used
+
+    @property
+    def module_file(self):
+        """ The file which is loaded by the processes using the entry
+        """
+        return self._module_file
+
+    @property
+    def in_progress(self):
+        """ Indicates whether the entry may be a running build
+        """
+        return self._in_progress
+
+    @property
+    def size(self):
+        """ The number of bytes used by the entry
+        """
+        return self._size
+
+    def remove(self):
+        """
+        Remove the files of the entry.
+
+        Returns
+        -------
+        bool
+              False if the entry is used by a running process, in which case
+              nothing is removed
+        """
+        if self._module_file and not _remove_unused_file(self._module_file):
+            return False
+        for p in self._paths:
+            if os.path.isdir(p):
+                shutil.rmtree(p, ignore_errors=True)
+            elif os.path.exists(p):
+                os.remove(p)
+        return True
+
+#==============================================================================
+def _find_epyccel_entries(epyccel_dirpath):
+    """
+    Group the files of an '__epyccel__' folder by module.
+
+    Parameters
+    ----------
+    epyccel_dirpath : str
+                      The '__epyccel__' folder
+
+    Returns
+    -------
+    entries : list of CacheEntry
+    """
+    modules = {}
+    entries = []
+    for f in os.listdir(epyccel_dirpath):
+        path = os.path.join(epyccel_dirpath, f)
+        if f.startswith('.') and os.path.isdir(path):
+            # Private folder of a build
+            entries.append(CacheEntry(f, [path], _get_last_modification(path),
+                                      in_progress = True))
+        elif os.path.isfile(path):
+            # Module, or files left with the module by older versions of pyccel
+            modules.setdefault(f.split('.')[0], []).append(path)
+
+    # Files associated with a module: profile and Python bytecode
+    associated = {}
+    pgo_dirpath = os.path.join(epyccel_dirpath, '__pyccel__', '__pgo__')
+    if os.path.isdir(pgo_dirpath):
+        for f in os.listdir(pgo_dirpath):
+            associated.setdefault(f, []).append(os.path.join(pgo_dirpath, f))
+    pycache_dirpath = os.path.join(epyccel_dirpath, '__pycache__')
+    if os.path.isdir(pycache_dirpath):
+        for f in os.listdir(pycache_dirpath):
+            associated.setdefault(f.split('.')[0], []).append(os.path.join(pycache_dirpath, f))
+
+    for name, paths in modules.items():
+        module_files = [p for p in paths if p.endswith(ext_suffix)] or \
+                       [p for p in paths if p.endswith('.py')]
+        if module_files:
+            module_file = module_files[0]
+            last_used   = os.stat(module_file).st_atime
+        else:
+            module_file = None
+            last_used   = max(os.path.getmtime(p) for p in paths)
+        entries.append(CacheEntry(name, [*paths, *associated.pop(name, ())],
+                                  last_used, module_file))
+
+    # Profiles whose module was removed
+    for name, paths in associated.items():
+        entries.append(CacheEntry(name, paths, max(_get_last_modification(p) for p in paths)))
+
+    return entries
+
+def _find_runtime_entries(runtime_dirpath):
+    """
+    Find the runtime libraries of the cache folder.
+
+    The runtime libraries are stored in a folder for each version of
+    pyccel. Each library folder is an entry, which was last used when
+    a module was last linked with the library.
+
+    Parameters
+    ----------
+    runtime_dirpath : str
+                      The folder containing the runtime libraries
+
+    Returns
+    -------
+    entries : list of CacheEntry
+    """
+    entries = []
+    if not os.path.isdir(runtime_dirpath):
+        return entries
+    for version in os.listdir(runtime_dirpath):
+        version_dirpath = os.path.join(runtime_dirpath, version)
+        if not os.path.isdir(version_dirpath):
+            continue
+        for f in os.listdir(version_dirpath):
+            path = os.path.join(version_dirpath, f)
+            if f.startswith('.'):
+                # Private folder of a build
+                entries.append(CacheEntry(f, [path], _get_last_modification(path),
+                                          in_progress = True))
+                continue
+            libraries = [os.path.join(path, l) for l in os.listdir(path)
+                         if l.startswith('lib') and l.endswith(_library_exts)]
+            if libraries:
+                module_file = libraries[0]
+                last_used   = os.stat(module_file).st_atime
+            else:
+                module_file = None
+                last_used   = _get_last_modification(path)
+            entries.append(CacheEntry(path, [path], last_used, module_file))
+    return entries
+
+def find_cache_entries(path_dir, recursive = True):
+    """
+    Find the entries of the '__epyccel__' and '__pyccel__' folders found in
+    a folder.
+
+    Each module of an '__epyccel__' folder is an entry, which was last used
+    when it was last imported. A '__pyccel__' folder only contains the
+    intermediate files of the pyccel command, so the whole folder is an
+    entry, which was last used when it was last modified.
+
+    Parameters
+    ----------
+    path_dir  : str
+                The folder which is searched
+    recursive : bool
+                Indicates whether the sub-folders are searched
+
+    Returns
+    -------
+    entries : list of CacheEntry
+    """
+    entries = []
+    for f in os.listdir(path_dir):
+        path = os.path.join(path_dir, f)
+        if f == '__epyccel__':
+            entries.extend(_find_epyccel_entries(path))
+        elif f == '__pyccel__':
+            entries.append(CacheEntry(path, [path], _get_last_modification(path)))
+        elif recursive and os.path.isdir(path) and not os.path.islink(path):
+            entries.extend(find_cache_entries(path, recursive))
+    return entries
+
+def _evict_entries(entries, max_size, older_than):
+    """
+    Remove the least recently used entries until the entries remaining
+    are within the budget.
+
+    Parameters
+    ----------
+    entries    : list of CacheEntry
+                 The entries which can be removed
+    max_size   : int
+                 The maximum number of bytes used by the entries
+    older_than : float
+                 Entries which have not been used for this number of
+                 seconds are removed
+
+    Returns
+    -------
+    evicted : list of CacheEntry
+              The entries which were removed
+    """
+    entries = sorted(entries, key = lambda e: e.last_used)
+    total   = sum(e.size for e in entries)
+    oldest  = None if older_than is None else time.time() - older_than
+
+    evicted = []
+    for e in entries:
+        expired = oldest is not None and e.last_used < oldest
+        too_big = max_size is not None and total > max_size
+        if not (expired or too_big):
+            # The following entries are more recent and the cache is small enough
+            break
+        if e.in_progress and not expired:
+            continue
+        if e.remove():
+            total -= e.size
+            evicted.append(e)
+    return evicted
+
+def evict_cache(path_dir, recursive = True, max_size = None, older_than = None):
+    """
+    Evict the least recently used entries of the '__epyccel__' and
+    '__pyccel__' folders found in a folder.
+
+    Entries are removed, starting with the least recently used one, until
+    the entries remaining are within the budget. A module which is used by
+    a running process is never removed, nor is a build which may still be
+    running (unless it is older than older_than).
+
+    Parameters
+    ----------
+    path_dir   : str
+                 The folder which is cleaned
+    recursive  : bool
+                 Indicates whether the sub-folders are cleaned
+    max_size   : int
+                 The maximum number of bytes used by the entries
+                 Default : None (no limit)
+    older_than : float
+                 Entries which have not been used for this number of
+                 seconds are removed
+                 Default : None (no limit)
+
+    Returns
+    -------
+    evicted : list of CacheEntry
+              The entries which were removed
+    """
+    return _evict_entries(find_cache_entries(path_dir, recursive), max_size, older_than)
+
+def evict_runtime_cache(max_size = None, older_than = None):
+    """
+    Evict the least recently used runtime libraries stored in the cache
+    folder (see get_cache_dir).
+
+    The runtime libraries are shared by all the projects. A library is
+    built again when it is needed, but the modules linked with a shared
+    runtime no longer work once their library is removed. A library which
+    is used by a running process is never removed.
+
+    Parameters
+    ----------
+    max_size   : int
+                 The maximum number of bytes used by the libraries
+                 Default : None (no limit)
+    older_than : float
+                 Libraries which have not been used for this number of
+                 seconds are removed
+                 Default : None (no limit)
+
+    Returns
+    -------
+    evicted : list of CacheEntry
+              The libraries which were removed
+    """
+    entries = _find_runtime_entries(os.path.join(get_cache_dir(), runtime_dirname))
+    return _evict_entries(entries, max_size, older_than)
@@ -0,0 +1,191 @@
+#------------------------------------------------------------------------------------------#
+# This file is part of Pyccel which is released under MIT License. See the LICENSE file or #
+# go to https://github.com/pyccel/pyccel/blob/master/LICENSE for full license details.     #
+#------------------------------------------------------------------------------------------#
+""" Module containing the tools used to measure the time and memory spent
+in each stage of the translation pipeline
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
+
+from .metaclasses import Singleton
+
+__all__ = (
+    'BuildProfiler',
+    'profile_stage',
+    'record_build_profile',
+)
+
+def _peak_rss():
+    """ Get the peak resident set size (in kB) of the current process and
+    of its terminated children (e.g. the compilers), or None if it is not
+    available
+    """
+    if resource is None:
+        return None, None
+    scale = 1024 if sys.platform == 'darwin' else 1 # ru_maxrss is in bytes on macOS
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // scale,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss // scale)
+
+class BuildProfiler(metaclass=Singleton):
+    """
+    Class recording the duration of the stages of a build.
+
+    Each stage is recorded with its wall time, the CPU time of the process
+    and the peak resident set size of the process (and of the compiler
+    subprocesses) at the end of the stage. The events can be saved in the
+    Chrome trace format, which can be read by chrome://tracing or Perfetto.
+    Nothing is recorded unless the profiler is enabled.
+    """
+    def __init__(self):
+        self._enabled = False
+        self._events  = []
+        self._lock    = threading.Lock()
+        self._start   = time.perf_counter()
+
+    @property
+    def enabled(self):
+        """ Indicates whether the events are recorded
+        """
+        return self._enabled
+
+    @property
+    def events(self):
+        """ The events recorded since the profiler was enabled
+        """
+        return list(self._events)
+
+    def enable(self):
+        """ Start recording events (discarding any previous events)
+        """
+        with self._lock:
+            self._events  = []
+            self._start   = time.perf_counter()
+            self._enabled = True
+
+    def disable(self):
+        """ Stop recording events
+        """
+        self._enabled = False
+
+    def add_event(self, name, category, start, duration, **args):
+        """
+        Record an event.
+
+        Parameters
+        ----------
+        name     : str
+                   The name of the event
+        category : str
+                   The category of the event (e.g. 'stage', 'subprocess')
+        start    : float
+                   The value of time.perf_counter() at the start of the event
+        duration : float
+                   The wall time of the event (in seconds)
+        args     : dict
+                   Additional information saved with the event
+        """
+        if not self._enabled:
+            return
+        event = {'name' : name,
+                 'cat'  : category,
+                 'ph'   : 'X',
+                 'ts'   : (start - self._start) * 1e6,
+                 'dur'  : duration * 1e6,
+                 'pid'  : os.getpid(),
+                 'tid'  : threading.get_ident(),
+                 'args' : args}
+        with self._lock:
+            self._events.append(event)
+
+    @contextmanager
+    def stage(self, name, **args):
+        """
+        Context manager recording a stage of the build.
+
+        Parameters
+        ----------
+        name : str
+               The name of the stage
+        args : dict
+               Additional information saved with the event (e.g. the module)
+        """
+        if not self._enabled:
+            yield
+            return
+
+        start     = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            peak_rss, children_peak_rss = _peak_rss()
+            self.add_event(name, 'stage', start, duration,
+                           cpu_time = time.process_time() - cpu_start,
+                           peak_rss_kb = peak_rss,
+                           children_peak_rss_kb = children_peak_rss,
+                           **args)
+
+    def write(self, filename):
+        """
+        Save the recorded events in the Chrome trace format.
+
+        Parameters
+        ----------
+        filename : str
+                   The name of the JSON file
+        """
+        with self._lock:
+            data = {'traceEvents'     : list(self._events),
+                    'displayTimeUnit' : 'ms'}
+        with open(filename, 'w') as f:
+            json.dump(data, f, indent=1)
+
+def profile_stage(name, **args):
+    """
+    Get a context manager recording a stage of the build if the profiler
+    is enabled (see BuildProfiler.stage).
+
+    Parameters
+    ----------
+    name : str
+           The name of the stage
+    args : dict
+           Additional information saved with the event (e.g. the module)
+    """
+    return BuildProfiler().stage(name, **args)
+
+@contextmanager
+def record_build_profile(filename):
+    """
+    Context manager enabling the profiler and saving the recorded events
+    on exit (even if the build fails).
+
+    Parameters
+    ----------
+    filename : str
+               The name of the JSON file where the events are saved. If it
+               is None nothing is recorded
+    """
+    if filename is None:
+        yield
+        return
+
+    profiler = BuildProfiler()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.write(filename)
@@ -0,0 +1,61 @@
+# coding: utf-8
+"""
+Benchmark of the cost of calling small kernels from Python, with and without
+link-time optimisation (epyccel(..., lto=True) or pyccel --lto).
+
+Without LTO, the C wrapper calls the bind_c interface which calls the kernel
+in the generated module, and none of these calls can be inlined as each file
+is compiled separately. With LTO the three layers are optimised together.
+
+Usage: python lto_call_overhead.py [fortran|c] [number of calls]
+"""
+
+import sys
+import timeit
+
+import numpy as np
+
+from pyccel.decorators import types
+from pyccel.epyccel import epyccel
+
+@types('real', 'real')
+def add(x, y):
+    return x + y
+
+@types('real[:]', 'real[:]', 'real')
+def axpy(x, y, a):
+    y[:] = a*x + y
+
+@types('real[:,:]', 'int', 'int')
+def get_element(x, i, j):
+    return x[i,j]
+
+if __name__ == '__main__':
+    language = sys.argv[1] if len(sys.argv) > 1 else 'fortran'
+    number   = int(sys.argv[2]) if len(sys.argv) > 2 else 200000
+
+    x = np.ones(8)
+    y = np.zeros(8)
+    z = np.ones((4,4))
+    calls = {'add'         : lambda f: f(1.0, 2.0),
+             'axpy'        : lambda f: f(x, y, 2.0),
+             'get_element' : lambda f: f(z, 1, 2)}
+
+    print('{} calls ({} code)'.format(number, language))
+    print('{:<12} {:>14} {:>14} {:>8}'.format('kernel', 'default (ns)', 'lto (ns)', 'ratio'))
+    for func in (add, axpy, get_element):
+        call = calls[func.__name__]
+        variants = [epyccel(func, language=language, lto=lto) for lto in (False, True)]
+        for f in variants:
+            call(f) # Load the library before timing
+
+        # Alternate the measurements so that both variants are equally
+        # affected by the load of the machine
+        timings = [float('inf')]*len(variants)
+        for _ in range(7):
+            for i, f in enumerate(variants):
+                t = timeit.timeit(lambda: call(f), number=number)
+                timings[i] = min(timings[i], t / number * 1e9)
+
+        print('{:<12} {:>14.1f} {:>14.1f} {:>8.2f}'.format(func.__name__,
+                    *timings, timings[0] / timings[1]))
@@ -1,8 +1,11 @@
 # -*- coding: UTF-8 -*-
 #! /usr/bin/python
 
+import os
 from pathlib import Path
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py
+from setuptools.command.develop import develop
 
 # ...
 # Read library version into '__version__' variable
@@ -40,14 +43,50 @@ install_requires = [
     'numpy',
     'sympy>=1.2',
     'termcolor',
-    'textx>=1.6',
-    'filelock'
+    'textx>=1.6'
 ]
 
+# ...
+def build_header_index(package_dir, command):
+    """
+    Precompile the headers of the standard library into an index which is
+    installed with the package (see pyccel.parser.header_index).
+    The headers are parsed at their first import if this is not possible.
+    """
+    import sys
+    sys.path.insert(0, package_dir)
+    try:
+        from pyccel.parser.header_index import build_header_index as build_index
+        folder = os.path.join(package_dir, 'pyccel', 'stdlib', 'internal')
+        headers = build_index(folder)
+        command.announce('precompiled headers: {}'.format(' '.join(headers)), level=2)
+    except ImportError as e:
+        command.warn('The headers of the standard library were not precompiled: {}'.format(e))
+    finally:
+        sys.path.remove(package_dir)
+
+class BuildPyCommand(build_py):
+    """ Copy the package and precompile the headers of its standard library
+    """
+    def run(self):
+        super().run()
+        if not self.dry_run:
+            build_header_index(os.path.abspath(self.build_lib), self)
+
+class DevelopCommand(develop):
+    """ Install in development mode and precompile the headers of the standard library
+    """
+    def run(self):
+        super().run()
+        if not self.dry_run:
+            build_header_index(str(Path(__file__).parent.absolute()), self)
+# ...
+
 def setup_package():
     setup(packages=packages, \
           include_package_data=True, \
           install_requires=install_requires, \
+          cmdclass={'build_py': BuildPyCommand, 'develop': DevelopCommand}, \
           entry_points={'console_scripts': ['pyccel = pyccel.commands.console:pyccel', 'pyccel-clean = pyccel.commands.pyccel_clean:pyccel_clean_command']}, \
           **setup_args)
 
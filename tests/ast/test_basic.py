@@ -1,5 +1,8 @@
 # pylint: disable=missing-function-docstring, missing-module-docstring
+import gc
 import os
+import time
+import pytest
 
 from pyccel.parser.parser   import Parser
 from pyccel.errors.errors   import Errors
@@ -181,3 +184,114 @@ def test_recursive():
 
     fst.substitute(LiteralInteger(2), LiteralInteger(3))
 
+
+#==============================================================================
+# Comparison with a full traversal of the tree
+#==============================================================================
+
+def legacy_get_user_nodes(node, search_type, excluded_nodes = ()):
+    """ Basic.get_user_nodes without the type index
+    """
+    if node._recursion_in_progress or len(node._user_nodes) == 0:
+        return []
+    node._recursion_in_progress = True
+    results  = [p for p in node._user_nodes if isinstance(p, search_type) and not isinstance(p, excluded_nodes)]
+    results += [r for p in node._user_nodes if not Basic.ignore(node, p) and not isinstance(p, (search_type, excluded_nodes))
+                  for r in legacy_get_user_nodes(p, search_type, excluded_nodes)]
+    node._recursion_in_progress = False
+    return results
+
+def legacy_get_attribute_nodes(node, search_type, excluded_nodes = ()):
+    """ Basic.get_attribute_nodes without the type index
+    """
+    if node._recursion_in_progress:
+        return []
+    node._recursion_in_progress = True
+    results = []
+    for n in node._my_attribute_nodes:
+        v = getattr(node, n)
+        for vi in (v if isinstance(v, tuple) else (v,)):
+            if isinstance(vi, excluded_nodes):
+                continue
+            elif isinstance(vi, search_type):
+                results.append(vi)
+            elif not Basic.ignore(node, vi):
+                results.extend(legacy_get_attribute_nodes(vi, search_type, excluded_nodes))
+    node._recursion_in_progress = False
+    return results
+
+def all_nodes(node):
+    """ All the nodes which can be reached from a node (identified by their id)
+    """
+    nodes = {}
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        if id(n) not in nodes:
+            nodes[id(n)] = n
+            stack.extend(v for v in n._attribute_values() if not Basic.ignore(n, v))
+            stack.extend(v for v in n._user_values() if not Basic.ignore(n, v))
+    return list(nodes.values())
+
+queries = [(Variable, ()), (Variable, (ValuedVariable,)), ((PyccelAdd, PyccelMinus), ()),
+           ((Assign, Return), ()), (FunctionDef, ()), (LiteralInteger, (Return,)), (Basic, ())]
+
+def check_queries(node):
+    for n in all_nodes(node):
+        for search_type, excluded_nodes in queries:
+            expected = legacy_get_attribute_nodes(n, search_type, excluded_nodes)
+            result   = n.get_attribute_nodes(search_type, excluded_nodes)
+            assert [id(r) for r in result] == [id(e) for e in expected]
+            expected = legacy_get_user_nodes(n, search_type, excluded_nodes)
+            result   = n.get_user_nodes(search_type, excluded_nodes)
+            assert [id(r) for r in result] == [id(e) for e in expected]
+
+def big_function(n):
+    lines = ["def big(x : 'int', y : 'int'):",
+             "    s = 0"]
+    for i in range(n):
+        lines.append("    s = s + x * {} - y".format(i))
+    lines.append("    return s")
+    return '\n'.join(lines)
+
+def timed(func, *args):
+    gc.collect()
+    gc.disable()
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    gc.enable()
+    return elapsed
+
+def test_type_index():
+    for script in ("math.py", "cyclic_dependence.py"):
+        fst = get_functions(os.path.join(path_dir, script))[0]
+        check_queries(fst)
+
+        # The indexes are updated when the tree is modified
+        fst.substitute(LiteralInteger(1), LiteralInteger(7))
+        check_queries(fst)
+        fst.substitute(LiteralInteger(7), Variable('int', 'Z'))
+        check_queries(fst)
+
+@pytest.mark.benchmark
+def test_type_index_benchmark(tmpdir):
+    filename = str(tmpdir.join('big.py'))
+    pyccel = Parser(filename, code = big_function(10000))
+    pyccel.parse()
+    fst = list(pyccel.annotate().namespace.functions.values())[0]
+    assert not Errors().has_errors()
+
+    variables = [v for v in fst.get_attribute_nodes(Variable) if v.name == 'x']
+    def query(get_attribute_nodes, get_user_nodes):
+        for _ in range(2):
+            get_attribute_nodes(fst, Return)
+            get_attribute_nodes(fst, FunctionDef)
+        for v in variables[::250]:
+            get_user_nodes(v, Return)
+
+    query(Basic.get_attribute_nodes, Basic.get_user_nodes)
+    indexed_time = min(timed(query, Basic.get_attribute_nodes, Basic.get_user_nodes) for _ in range(3))
+    legacy_time  = timed(query, legacy_get_attribute_nodes, legacy_get_user_nodes)
+    print('queries : {:.3f}s (full traversal : {:.3f}s)'.format(indexed_time, legacy_time))
+    assert indexed_time < legacy_time
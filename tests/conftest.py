@@ -45,6 +45,16 @@ def pytest_runtest_teardown(item, nextitem):
 
 def pytest_addoption(parser):
     parser.addoption("--developer-mode", action="store_true", default=False, help="Show tracebacks when pyccel errors are raised")
+    parser.addoption("--run-benchmarks", action="store_true", default=False, help="Run the tests comparing timings, which are skipped by default")
+
+def pytest_collection_modifyitems(config, items):
+    # Timings are too noisy to be checked in the unit tests
+    if config.option.run_benchmarks:
+        return
+    skip_benchmark = pytest.mark.skip(reason="benchmarks are only run with --run-benchmarks")
+    for item in items:
+        if 'benchmark' in item.keywords:
+            item.add_marker(skip_benchmark)
 
 def pytest_sessionstart(session):
     # setup_stuff
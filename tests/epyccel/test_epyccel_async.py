@@ -0,0 +1,73 @@
+# pylint: disable=missing-function-docstring, missing-module-docstring/
+import gc
+import os
+
+from pyccel.epyccel import epyccel, EpyccelProxy
+from pyccel.decorators import types
+
+def test_async_compilation(language):
+    @types('int')
+    def f(n):
+        s = 0
+        for i in range(n):
+            s += i
+        return s
+
+    f_async = epyccel(f, language=language, asynchronous=True)
+    assert isinstance(f_async, EpyccelProxy)
+
+    # The Python function is used until the compilation is finished
+    assert f_async(10) == f(10)
+
+    assert f_async.wait() == 'ready'
+    assert f_async.error is None
+    assert f_async.compile_time >= 0
+    assert f_async(10) == f(10)
+
+    # The compiled function was swapped in
+    assert f_async._target is not f # pylint: disable=protected-access
+    assert f_async._target is epyccel(f, language=language) # pylint: disable=protected-access
+
+def test_async_compilation_failure():
+    @types('int')
+    def g(n):
+        return undefined_variable + n # pylint: disable=undefined-variable
+
+    g_async = epyccel(g, language='c', asynchronous=True)
+
+    assert g_async.wait() == 'failed'
+    assert g_async.error is not None
+    assert g_async.python_object is g
+
+def test_async_compilation_dropped():
+    @types('int')
+    def h(n):
+        return n + 1
+
+    h_async = epyccel(h, language='c', asynchronous=True)
+    process     = h_async._process     # pylint: disable=protected-access
+    result_file = h_async._result_file # pylint: disable=protected-access
+    assert os.path.exists(result_file)
+
+    # Dropping the proxy stops the compilation and removes the result file
+    del h_async
+    gc.collect()
+
+    assert process.poll() is not None
+    assert not os.path.exists(result_file)
+
+@types('int')
+def square(n):
+    return n * n
+
+def train_square(f):
+    # Run in the process which records the profile
+    for i in range(100):
+        f(i)
+
+def test_async_pgo():
+    square_async = epyccel(square, language='c', asynchronous=True, pgo_training=train_square)
+
+    assert square_async.wait() == 'ready'
+    assert square_async.error is None
+    assert square_async(7) == square(7)
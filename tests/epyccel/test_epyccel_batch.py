@@ -0,0 +1,47 @@
+# pylint: disable=missing-function-docstring, missing-module-docstring/
+import pytest
+
+from pyccel.epyccel import epyccel
+from pyccel.decorators import types
+
+@types('int')
+def square(x):
+    return x*x
+
+@types('int', 'int')
+def add(x, y):
+    return x+y
+
+@types('real')
+def half(x):
+    return x/2
+
+def test_batch_list(language):
+    funcs = epyccel([square, add, half], language=language)
+
+    assert len(funcs) == 3
+    assert funcs[0](3) == square(3)
+    assert funcs[1](3, 4) == add(3, 4)
+    assert funcs[2](3.0) == half(3.0)
+
+    # All the functions are in the same module
+    assert len({f.__module__ for f in funcs}) == 1
+
+def test_batch_dict(language):
+    funcs = epyccel({'sq' : square, 'plus' : add}, language=language)
+
+    assert set(funcs.keys()) == {'sq', 'plus'}
+    assert funcs['sq'](5) == square(5)
+    assert funcs['plus'](5, 6) == add(5, 6)
+
+def test_batch_errors():
+    def f(x):
+        return x
+    def g(x):
+        return x
+    g.__name__ = 'f'
+
+    with pytest.raises(ValueError):
+        epyccel([f, g])
+    with pytest.raises(TypeError):
+        epyccel([f, 1])
@@ -0,0 +1,186 @@
+# pylint: disable=missing-function-docstring, missing-module-docstring/
+import os
+import shutil
+import subprocess
+import sys
+import time
+import pytest
+
+from pyccel.commands.pyccel_clean import parse_size, parse_duration
+from pyccel.commands.pyccel_clean import pyccel_clean, pyccel_clean_runtime
+from pyccel.epyccel import epyccel, get_cache_key
+from pyccel.utilities.cache import evict_cache, evict_runtime_cache, ext_suffix
+from pyccel.decorators import types
+
+def test_cache_key():
+    code = 'def f(x):\n    return x\n'
+    key = get_cache_key(code, language='c', fflags=None)
+
+    assert key == get_cache_key(code, fflags=None, language='c')
+    assert key != get_cache_key(code, language='fortran', fflags=None)
+    assert key != get_cache_key(code, language='c', fflags='-O0')
+    assert key != get_cache_key(code.replace('x', 'y'), language='c', fflags=None)
+
+def test_same_function_reuses_module(language):
+    @types('int')
+    def f(x):
+        return x+1
+
+    f1 = epyccel(f, language=language)
+    f2 = epyccel(f, language=language)
+
+    assert f1(3) == f(3)
+    assert f2 is f1
+
+def test_reuse_shared_library():
+    @types('int')
+    def g(x):
+        return 2*x
+
+    g1 = epyccel(g, language='c')
+    mod_name = g1.__module__
+    mod_file = sys.modules[mod_name].__file__
+    mtime = os.path.getmtime(mod_file)
+
+    # Simulate a new process which has not imported the module yet
+    del sys.modules[mod_name]
+
+    g2 = epyccel(g, language='c')
+
+    assert g2(4) == g(4)
+    assert g2.__module__ == mod_name
+    assert os.path.getmtime(mod_file) == mtime
+
+def test_concurrent_builds(tmpdir):
+    # Several processes build the same module at the same time
+    code = ('from pyccel.decorators import types\n'
+            'from pyccel.epyccel import epyccel\n'
+            '@types("int")\n'
+            'def h(x):\n'
+            '    return 3*x\n'
+            'print(epyccel(h, language="c")(2))\n')
+    script = tmpdir.join('build_h.py')
+    script.write(code)
+
+    procs = [subprocess.Popen([sys.executable, str(script)], cwd=str(tmpdir),
+                              stdout=subprocess.PIPE, universal_newlines=True)
+             for _ in range(3)]
+    outputs = [p.communicate()[0] for p in procs]
+
+    assert all(p.returncode == 0 for p in procs)
+    assert all(out.strip() == '6' for out in outputs)
+
+    # The modules are published without locks or leftover build folders
+    epyccel_dir = tmpdir.join('__epyccel__')
+    assert not [f for f in os.listdir(str(epyccel_dir))
+                if f.endswith('.lock') or f.startswith('.')]
+
+def test_evict_cache(tmpdir):
+    @types('int')
+    def k(x):
+        return x-1
+
+    k1 = epyccel(k, language='c', folder=str(tmpdir))
+    loaded_file = sys.modules[k1.__module__].__file__
+
+    # Modules built by other processes, which are not loaded
+    epyccel_dir = tmpdir.join('__epyccel__')
+    old_file    = str(epyccel_dir.join('mod_old' + ext_suffix))
+    recent_file = str(epyccel_dir.join('mod_recent' + ext_suffix))
+    for f in (old_file, recent_file):
+        with open(f, 'wb') as lib:
+            lib.write(b'0'*1000)
+
+    ten_days_ago = time.time() - 10*86400
+    os.utime(old_file, (ten_days_ago, ten_days_ago))
+    os.utime(loaded_file, (ten_days_ago, ten_days_ago))
+
+    evicted = evict_cache(str(tmpdir), older_than = 86400)
+    assert [e.name for e in evicted] == ['mod_old']
+    assert not os.path.exists(old_file)
+    assert os.path.exists(recent_file)
+    assert os.path.exists(loaded_file)
+
+    evict_cache(str(tmpdir), max_size = 0)
+    assert not os.path.exists(recent_file)
+    assert os.path.exists(loaded_file)
+    assert k1(3) == k(3)
+
+def test_static_runtime(tmpdir, monkeypatch):
+    @types('int')
+    def total(n):
+        import numpy as np
+        x = np.ones(n)
+        s = 0.0
+        for i in range(n):
+            s += x[i]
+        return s
+
+    cache_dir = tmpdir.join('cache')
+    monkeypatch.setenv('PYCCEL_CACHE_DIR', str(cache_dir))
+    f = epyccel(total, language='c', folder=str(tmpdir))
+    assert cache_dir.join('runtime').check(dir=True)
+
+    # The module does not depend on the runtime stored in the cache folder
+    shutil.rmtree(str(cache_dir))
+    code = 'import {}\nprint({}.total(3))'.format(
+            f.__module__, f.__module__)
+    out = subprocess.check_output([sys.executable, '-c', code],
+                                  cwd=str(tmpdir.join('__epyccel__')),
+                                  universal_newlines=True)
+    assert out.strip() == '3.0'
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="Windows only uses static runtimes")
+def test_shared_runtime(tmpdir, monkeypatch):
+    @types('int')
+    def last(n):
+        import numpy as np
+        x = np.arange(n)
+        return x[n-1]
+
+    cache_dir = tmpdir.join('cache')
+    monkeypatch.setenv('PYCCEL_CACHE_DIR', str(cache_dir))
+    f = epyccel(last, language='c', folder=str(tmpdir), shared_runtime=True)
+
+    # The module loads the shared runtime from the cache folder
+    with open(sys.modules[f.__module__].__file__, 'rb') as lib:
+        assert str(cache_dir).encode() in lib.read()
+    assert f(4) == 3
+
+def test_evict_runtime(tmpdir, monkeypatch):
+    monkeypatch.setenv('PYCCEL_CACHE_DIR', str(tmpdir.join('cache')))
+    runtime_dir = tmpdir.join('cache', 'runtime')
+    old_lib    = runtime_dir.join('0.0.1', 'ndarrays_old', 'libpyccel_ndarrays.a')
+    recent_lib = runtime_dir.join('0.0.2', 'ndarrays_recent', 'libpyccel_ndarrays.a')
+    for lib in (old_lib, recent_lib):
+        lib.write(b'0'*1000, mode='wb', ensure=True)
+    ten_days_ago = time.time() - 10*86400
+    os.utime(str(old_lib), (ten_days_ago, ten_days_ago))
+
+    project_dir = tmpdir.join('project').ensure(dir=True)
+    assert evict_cache(str(project_dir), older_than = 86400) == []
+
+    evicted = evict_runtime_cache(older_than = 86400)
+    assert [e.name for e in evicted] == [str(old_lib.dirpath())]
+    assert not old_lib.dirpath().check()
+    assert recent_lib.check()
+
+def test_clean_folder_keeps_runtime(tmpdir, monkeypatch):
+    monkeypatch.setenv('PYCCEL_CACHE_DIR', str(tmpdir.join('cache')))
+    lib = tmpdir.join('cache', 'runtime', '0.0.1', 'ndarrays_old', 'libpyccel_ndarrays.a')
+    lib.write(b'0'*1000, mode='wb', ensure=True)
+
+    # Cleaning a folder never removes the runtime libraries shared by all projects
+    project_dir = tmpdir.join('project').ensure(dir=True)
+    pyccel_clean(str(project_dir), max_size = 0)
+    assert lib.check()
+
+    pyccel_clean_runtime()
+    assert not lib.check()
+
+def test_clean_budget_parsing():
+    assert parse_size('2048') == 2048
+    assert parse_size('500M') == 500*1024**2
+    assert parse_size('1.5G') == int(1.5*1024**3)
+    assert parse_duration('12h') == 12*3600
+    assert parse_duration('7') == 7*86400
@@ -373,6 +373,19 @@ def test_decorator_f22(language):
     f = epyccel(f22, language=language)
     assert f(complex(1, 2.2)) == f22(complex(1, 2.2))
 
+def test_lto(language):
+    @types('real[:]', 'real[:]', 'real')
+    def axpy_lto(x, y, a):
+        y[:] = a*x + y
+        return y[0]
+
+    f = epyccel(axpy_lto, language=language, lto=True)
+    x = np.arange(5, dtype=float)
+    y_pyc = np.ones(5)
+    y_pyt = np.ones(5)
+    assert np.isclose(f(x, y_pyc, 2.0), axpy_lto(x, y_pyt, 2.0))
+    assert np.array_equal(y_pyc, y_pyt)
+
 ##==============================================================================
 ## CLEAN UP GENERATED FILES AFTER RUNNING TESTS
 ##==============================================================================
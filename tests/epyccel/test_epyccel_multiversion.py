@@ -0,0 +1,120 @@
+# pylint: disable=missing-function-docstring, missing-module-docstring/
+import platform
+import pytest
+import numpy as np
+
+from pyccel.epyccel import epyccel
+from pyccel.errors.errors import PyccelError
+from pyccel.codegen.translation import translate_source
+from pyccel.codegen.utilities import get_isa_flags, get_isa_features
+
+multiversion_code = '''
+from pyccel.decorators import types, multiversion
+
+@multiversion
+@types('real[:]', 'real[:]')
+def dot(x, y):
+    s = 0.0
+    for i in range(x.shape[0]):
+        s += x[i]*y[i]
+    return s
+
+@multiversion('avx2', 'sse4')
+@types('real[:]', 'real')
+def scale(x, a):
+    x[:] = a*x
+
+@types('real[:]')
+def norm2(x):
+    return dot(x, x)
+'''
+
+# The versions of the function use a module variable and a private function
+# of the module
+module_code = '''
+from pyccel.decorators import types, multiversion, private
+
+#$ header variable scale float
+
+@private
+@types('real[:]')
+def accumulate(x):
+    s = 0.0
+    for xi in x:
+        s += xi
+    return s
+
+@multiversion
+@types('real[:]')
+def scaled_total(x):
+    return scale * accumulate(x)
+
+@types('real[:]')
+def scaled_mean(x):
+    return scaled_total(x) / x.shape[0]
+
+@types('real[:]')
+def scaled_sum(x):
+    return scale * accumulate(x)
+'''
+
+x86 = pytest.mark.skipif(platform.machine().lower() not in ('x86_64', 'amd64', 'i386', 'i686'),
+                         reason="Multiversioning is only available on x86")
+
+def test_isa_flags():
+    # The flags of the GNU compilers do not depend on the version of GCC
+    assert get_isa_flags('gcc', 'sse4') == ['-msse4.2', '-mpopcnt', '-mssse3']
+    assert '-mavx2' in get_isa_flags('gfortran', 'avx512')
+    assert not any(f.startswith('-march') for f in get_isa_flags('gcc', 'avx2'))
+    assert get_isa_flags('ifort', 'avx512') == ['-xCORE-AVX512']
+    assert get_isa_flags('pgfortran', 'avx512') == ['-tp=skylake-avx512']
+    assert 'avx2' in get_isa_features('avx2')
+    # A level requires the features of the less capable levels
+    assert set(get_isa_features('sse4')) < set(get_isa_features('avx2'))
+    with pytest.raises(ValueError):
+        get_isa_flags('gcc', 'neon')
+    with pytest.raises(ValueError):
+        get_isa_features('neon')
+
+@pytest.mark.parametrize( 'language', [
+        pytest.param("fortran", marks = pytest.mark.fortran),
+        pytest.param("c", marks = pytest.mark.c),
+    ]
+)
+def test_epyccel_multiversion(language):
+    mod = epyccel(multiversion_code, language=language)
+    x = np.arange(4, dtype=float)
+    assert mod.dot(x, x) == 14.0
+    assert mod.norm2(x) == 14.0
+    mod.scale(x, 2.0)
+    assert np.array_equal(x, np.arange(0, 8, 2, dtype=float))
+
+@pytest.mark.fortran
+def test_multiversion_module_variables():
+    mod = epyccel(module_code, language='fortran')
+    x = np.arange(4, dtype=float)
+    assert mod.scaled_total(x) == mod.scaled_sum(x)
+    assert mod.scaled_mean(x) == mod.scaled_sum(x) / 4
+
+@x86
+@pytest.mark.parametrize( 'language', [
+        pytest.param("fortran", marks = pytest.mark.fortran),
+        pytest.param("c", marks = pytest.mark.c),
+    ]
+)
+def test_translate_multiversion(language):
+    ext = {'fortran': 'f90', 'c': 'c'}[language]
+    with translate_source(multiversion_code, 'mod_isa', language=language,
+                          isa_levels=['avx2', 'sse4']) as translation:
+        code = translation.code
+        assert 'dot' in code['mod_isa.avx2.{}'.format(ext)]
+        assert 'scale' in code['mod_isa.sse4.{}'.format(ext)]
+        # dot only uses the levels requested for the module
+        assert 'mod_isa.avx512.{}'.format(ext) not in code
+        assert '__builtin_cpu_supports' in code['mod_isa_wrapper.c']
+        assert translation.shared_library is not None
+
+def test_unknown_isa_level():
+    code = multiversion_code.replace("multiversion('avx2', 'sse4')", "multiversion('neon')")
+    with pytest.raises(PyccelError):
+        epyccel(code)
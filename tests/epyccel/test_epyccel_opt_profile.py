@@ -0,0 +1,116 @@
+# pylint: disable=missing-function-docstring, missing-module-docstring/
+import pytest
+import numpy as np
+
+from pyccel.epyccel import epyccel
+from pyccel.decorators import types
+from pyccel.errors.errors import PyccelError
+from pyccel.codegen.translation import translate_source
+from pyccel.codegen.utilities import get_profile_flags, replace_profile_flags
+
+profile_code = '''
+from pyccel.decorators import types, opt_profile
+
+@types('real[:]')
+@opt_profile('fast')
+def total(x):
+    s = 0.0
+    for xi in x:
+        s += xi
+    return s
+
+@types('real[:]')
+def mean(x):
+    return total(x) / x.shape[0]
+
+@opt_profile('debug')
+@types('int')
+def twice(n):
+    return 2*n
+'''
+
+# The functions compiled with their own profile use a module variable and a
+# private function of the module
+module_code = '''
+from pyccel.decorators import types, opt_profile, private
+
+#$ header variable scale float
+
+@private
+@types('real[:]')
+def accumulate(x):
+    s = 0.0
+    for xi in x:
+        s += xi
+    return s
+
+@types('real[:]')
+@opt_profile('fast')
+def scaled_total(x):
+    return scale * accumulate(x)
+
+@types('real[:]')
+def scaled_mean(x):
+    return scaled_total(x) / x.shape[0]
+
+@types('real[:]')
+def scaled_sum(x):
+    return scale * accumulate(x)
+'''
+
+def test_profile_flags():
+    assert get_profile_flags('gcc', 'safe') == ['-O3']
+    assert '-march=native' in get_profile_flags('gfortran', 'native')
+    assert '-xHost' in get_profile_flags('ifort', 'native')
+    with pytest.raises(ValueError):
+        get_profile_flags('gcc', 'unknown')
+
+    flags = replace_profile_flags(['-Ofast', '-funroll-loops', '-fPIC'], 'gcc', 'fast', 'debug')
+    assert flags == ['-fPIC', '-O0', '-g']
+
+@pytest.mark.parametrize('opt_profile', ['safe', 'fast', 'native', 'debug'])
+def test_epyccel_opt_profile(opt_profile, language):
+    @types('real[:]', 'real')
+    def axpy(x, a):
+        x[:] = a*x + 1.0
+
+    f = epyccel(axpy, language=language, opt_profile=opt_profile)
+    x = np.ones(5)
+    f(x, 2.0)
+    assert np.array_equal(x, np.full(5, 3.0))
+
+@pytest.mark.parametrize( 'language', [
+        pytest.param("fortran", marks = pytest.mark.fortran),
+        pytest.param("c", marks = pytest.mark.c),
+    ]
+)
+def test_opt_profile_decorator(language):
+    mod = epyccel(profile_code, language=language, opt_profile='native')
+    x = np.arange(4, dtype=float)
+    assert mod.total(x) == 6.0
+    assert mod.mean(x) == 1.5
+    assert mod.twice(3) == 6
+
+@pytest.mark.fortran
+def test_opt_profile_module_variables():
+    mod = epyccel(module_code, language='fortran')
+    x = np.arange(4, dtype=float)
+    assert mod.scaled_total(x) == mod.scaled_sum(x)
+    assert mod.scaled_mean(x) == mod.scaled_sum(x) / 4
+
+@pytest.mark.parametrize( 'language', [
+        pytest.param("fortran", marks = pytest.mark.fortran),
+        pytest.param("c", marks = pytest.mark.c),
+    ]
+)
+def test_translate_opt_profile(language):
+    ext = {'fortran': 'f90', 'c': 'c'}[language]
+    with translate_source(profile_code, 'mod_profiles', language=language) as translation:
+        assert 'total' in translation.code['mod_profiles.fast.{}'.format(ext)]
+        assert 'twice' in translation.code['mod_profiles.debug.{}'.format(ext)]
+        assert translation.shared_library is not None
+
+def test_unknown_opt_profile():
+    code = profile_code.replace("opt_profile('fast')", "opt_profile('fastest')")
+    with pytest.raises(PyccelError):
+        epyccel(code)
@@ -0,0 +1,80 @@
+# pylint: disable=missing-function-docstring, missing-module-docstring/
+import os
+import subprocess
+import sys
+import pytest
+import numpy as np
+
+from pyccel.epyccel import epyccel
+from pyccel.decorators import types
+
+@types('real[:]', 'real')
+def push(x, lim):
+    n = 0
+    for i in range(x.shape[0]):
+        if x[i] > lim:
+            x[i] = x[i] - 1.0
+            n = n + 1
+        else:
+            x[i] = x[i] + 0.5
+    return n
+
+def train_push(f):
+    # Run in the process which records the profile
+    x = np.linspace(0, 1, 1000)
+    for _ in range(10):
+        f(x, 0.5)
+
+@pytest.mark.parametrize( 'language', [
+        pytest.param("fortran", marks = pytest.mark.fortran),
+        pytest.param("c", marks = pytest.mark.c),
+    ]
+)
+def test_pgo(language):
+    f = epyccel(push, language=language, pgo_training=train_push)
+
+    x_pyc = np.linspace(0, 1, 11)
+    x_pyt = x_pyc.copy()
+    assert f(x_pyc, 0.5) == push(x_pyt, 0.5)
+    assert np.array_equal(x_pyc, x_pyt)
+
+    # The profile is kept with the build artefacts
+    module = sys.modules[f.__module__]
+    profile_dir = os.path.join(os.path.dirname(module.__file__), '__pyccel__', '__pgo__',
+                               module.__name__)
+    assert os.path.isfile(os.path.join(profile_dir, 'profile.key'))
+    assert any(name.endswith('.gcda') for _, _, files in os.walk(profile_dir) for name in files)
+
+def test_pgo_local_training():
+    def train(f):
+        f(np.ones(3), 0.5)
+
+    @types('real[:]', 'real')
+    def push_local(x, lim):
+        x[:] = x + lim
+
+    with pytest.raises(TypeError):
+        epyccel(push_local, pgo_training=train)
+
+def test_pgo_main_training(tmpdir):
+    # The training function is defined in the script which is run
+    code = ('import numpy as np\n'
+            'from pyccel.decorators import types\n'
+            'from pyccel.epyccel import epyccel\n'
+            '@types("real[:]")\n'
+            'def scale(x):\n'
+            '    x[:] = 2.0 * x\n'
+            'def train(f):\n'
+            '    f(np.ones(100))\n'
+            'if __name__ == "__main__":\n'
+            '    x = np.ones(3)\n'
+            '    epyccel(scale, language="c", pgo_training=train)(x)\n'
+            '    print(x.sum())\n')
+    script = tmpdir.join('train_main.py')
+    script.write(code)
+
+    p = subprocess.run([sys.executable, str(script)], cwd=str(tmpdir),
+                       stdout=subprocess.PIPE, universal_newlines=True)
+
+    assert p.returncode == 0
+    assert p.stdout.strip() == '6.0'
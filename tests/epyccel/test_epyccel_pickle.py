@@ -0,0 +1,77 @@
+# pylint: disable=missing-function-docstring, missing-module-docstring/
+import math
+import multiprocessing
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.reduction import ForkingPickler
+import pytest
+import numpy as np
+
+from pyccel.epyccel import epyccel
+from pyccel.decorators import types
+from pyccel.jit import jit
+
+sum_squares_code = """
+from pyccel.decorators import types
+
+# Sum of squares ({})
+@types('real[:]')
+def sum_squares(x):
+    s = 0.0
+    for xi in x:
+        s += xi*xi
+    return s
+"""
+
+@jit
+def add_jit(x, y):
+    return x + y
+
+def test_pickle_compiled_function(language):
+    @types('int', 'int')
+    def add_ints(x, y):
+        return x + y
+
+    f = epyccel(add_ints, language=language)
+    g = pickle.loads(pickle.dumps(f))
+    assert g is f
+    assert g(2, 3) == 5
+
+@pytest.mark.parametrize( 'language', [
+        pytest.param("fortran", marks = pytest.mark.fortran),
+        pytest.param("c", marks = pytest.mark.c),
+    ]
+)
+@pytest.mark.parametrize('start_method', ['spawn', 'forkserver'])
+def test_compiled_function_in_pool(language, start_method):
+    # The start method is part of the code so that each test builds its own
+    # module (the folder is cleaned between the tests)
+    code = sum_squares_code.format(start_method)
+    f = epyccel(code, language=language).sum_squares
+    chunks = np.split(np.arange(8, dtype=float), 4)
+
+    context = multiprocessing.get_context(start_method)
+    with ProcessPoolExecutor(max_workers=2, mp_context=context) as pool:
+        results = list(pool.map(f, chunks))
+
+    assert np.allclose(results, [np.sum(c*c) for c in chunks])
+
+def test_pickle_scope(language):
+    @types('int')
+    def twice(x):
+        return 2*x
+
+    f = epyccel(twice, language=language)
+    # The folders of the module are not left in sys.path
+    assert not any('__epyccel__' in p for p in sys.path)
+    # Only the compiled functions are pickled with the path to their module
+    assert pickle.loads(ForkingPickler.dumps(f)) is f
+    assert ForkingPickler.dumps(math.sqrt) == pickle.dumps(math.sqrt)
+    assert math.sqrt.__class__ not in ForkingPickler._extra_reducers # pylint: disable=protected-access
+
+def test_pickle_jit_function():
+    assert add_jit(1, 2) == 3
+    g = pickle.loads(pickle.dumps(add_jit))
+    assert g is add_jit
+    assert g(1.0, 2.0) == 3.0
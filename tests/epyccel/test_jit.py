@@ -0,0 +1,104 @@
+# pylint: disable=missing-function-docstring, missing-module-docstring/
+import ast
+import os
+import sys
+import numpy as np
+import pytest
+
+from pyccel.decorators import pure
+from pyccel.jit import jit, get_type_annotation, _get_specialised_source
+
+decorated_code = '''@pure
+# A comment between the decorators
+@jit(
+    language = 'c', # The options of the jit decorator
+)
+@types('int')
+def f(x):
+    return x + 1
+'''
+
+def test_type_annotation():
+    assert get_type_annotation(1) == 'int'
+    assert get_type_annotation(1.0) == 'real'
+    assert get_type_annotation(True) == 'bool'
+    assert get_type_annotation(np.float32(1)) == 'float32'
+    assert get_type_annotation(np.ones(3, dtype=np.int32)) == 'int32[:]'
+    assert get_type_annotation(np.ones((2,3))) == 'float64[:,:]'
+    assert get_type_annotation(np.ones((2,3), order='F')) == 'float64[:,:](order=F)'
+    assert get_type_annotation(np.ones((4,3))[::2]) is None
+    assert get_type_annotation('a') is None
+
+def test_jit_specialisations(language):
+    def axpy(a, x, y):
+        y[:] = a*x + y
+    f = jit(axpy, language=language)
+
+    x = np.arange(5, dtype=float)
+    y = np.ones(5)
+    y_pyt = y.copy()
+    f(2.0, x, y)
+    axpy(2.0, x, y_pyt)
+    assert np.array_equal(y, y_pyt)
+    assert f.signatures == [('real', 'float64[:]', 'float64[:]')]
+
+    xi = np.arange(5, dtype=np.int32)
+    yi = np.zeros(5, dtype=np.int32)
+    f(3, xi, yi)
+    assert np.array_equal(yi, 3*xi)
+    assert len(f.signatures) == 2
+
+def test_jit_python_fallback():
+    @jit(language='c')
+    def add(x, y):
+        return x + y
+
+    assert add(x = 'a', y = 'b') == 'ab'
+    assert add('a', 'b') == 'ab'
+    assert add.signatures == []
+    assert add(1, 2) == 3
+    assert add.signatures == [('int', 'int')]
+
+def test_jit_folder(tmpdir, monkeypatch):
+    @jit(language='c')
+    def sub(x, y):
+        return x - y
+
+    # The specialisations are stored next to the module defining the function
+    monkeypatch.chdir(tmpdir)
+    assert sub(3, 1) == 2
+    module_file = sys.modules[sub.compile('int', 'int').__module__].__file__
+    assert os.path.dirname(module_file) == os.path.join(os.path.dirname(__file__), '__epyccel__')
+    assert not tmpdir.join('__epyccel__').check()
+
+@pytest.mark.parametrize('def_lineno', [True, False])
+def test_jit_specialised_source(monkeypatch, def_lineno):
+    if not def_lineno:
+        # Before python 3.8 the line number of a function points to its
+        # first decorator
+        parse = ast.parse
+        def old_parse(*args, **kwargs):
+            tree = parse(*args, **kwargs)
+            for func_def in tree.body:
+                if isinstance(func_def, ast.FunctionDef) and func_def.decorator_list:
+                    func_def.lineno = func_def.decorator_list[0].lineno
+            return tree
+        monkeypatch.setattr(ast, 'parse', old_parse)
+
+    assert _get_specialised_source(decorated_code, ('real',)) == \
+            "@types('real')\n@pure\n# A comment between the decorators\n" \
+            "def f(x):\n    return x + 1\n"
+    assert _get_specialised_source('def f(x):\n    return x\n', ('int',)) == \
+            "@types('int')\ndef f(x):\n    return x\n"
+
+def test_jit_decorators(language):
+    @pure
+    @jit(
+        language = language,
+    )
+    def add(x, y):
+        return x + y
+
+    assert add(1, 2) == 3
+    assert add(1.5, 2.0) == 3.5
+    assert add.signatures == [('int', 'int'), ('real', 'real')]
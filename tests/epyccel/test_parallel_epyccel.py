@@ -70,3 +70,31 @@ def test_function(language):
     h_fast(x)
 
     assert np.array_equal(x, x_expected)
+
+#==============================================================================
+@pytest.mark.parallel
+def test_node_local(language, tmpdir):
+    import sys
+    from pyccel.decorators import types
+
+    @types('real[:]')
+    def add_rank(x):
+        x[:] = x + 2.0
+
+    comm = MPI.COMM_WORLD
+    local_dir = comm.bcast(str(tmpdir), root=0)
+
+    f_fast = epyccel(add_rank, comm=comm, language=language,
+                     node_local=True, local_dir=local_dir)
+
+    # Processes other than root import the module from the node-local folder
+    if comm.rank != 0:
+        assert sys.modules[f_fast.__module__].__file__.startswith(local_dir)
+
+    x_expected = np.zeros(3)
+    add_rank(x_expected)
+
+    x = np.zeros(3)
+    f_fast(x)
+
+    assert np.array_equal(x, x_expected)
@@ -0,0 +1,78 @@
+# pylint: disable=missing-function-docstring, missing-module-docstring/
+import importlib.util
+import os
+import threading
+import pytest
+import numpy as np
+
+from pyccel.codegen.translation import translate_source
+
+code = '''
+from pyccel.decorators import types
+
+@types('real[:]', 'real')
+def scale(x, a):
+    x[:] = a*x
+
+@types('int')
+def shift(x):
+    return x+{shift}
+'''
+
+def import_shared_library(translation):
+    spec = importlib.util.spec_from_file_location(translation.module_name,
+                                                  translation.shared_library)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+def test_translate_code_only(language):
+    cwd = os.getcwd()
+    with translate_source(code.format(shift=1), 'mod_code_only', language=language,
+                          build=False) as translation:
+        assert translation.shared_library is None
+        ext = {'fortran': '.f90', 'c': '.c', 'python': '.py'}[language]
+        assert 'shift' in translation.code['mod_code_only' + ext]
+        folder = translation.folder
+
+    assert not os.path.exists(folder)
+    assert os.getcwd() == cwd
+
+@pytest.mark.parametrize( 'language', [
+        pytest.param("fortran", marks = pytest.mark.fortran),
+        pytest.param("c", marks = pytest.mark.c),
+    ]
+)
+def test_translate_in_threads(language):
+    cwd = os.getcwd()
+    results = {}
+    failures = []
+
+    def translate(shift):
+        try:
+            with translate_source(code.format(shift=shift), 'mod_thread{}'.format(shift),
+                                  language=language) as translation:
+                mod = import_shared_library(translation)
+            x = np.ones(3)
+            mod.scale(x, 2.0)
+            results[shift] = (mod.shift(1), x)
+        except Exception as e: # pylint: disable=broad-except
+            failures.append(e)
+
+    threads = [threading.Thread(target=translate, args=(i,)) for i in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not failures
+    assert os.getcwd() == cwd
+    for i in range(3):
+        assert results[i][0] == 1+i
+        assert np.array_equal(results[i][1], np.full(3, 2.0))
+
+def test_translate_import_error(tmpdir, monkeypatch):
+    tmpdir.join('local_module.py').write('def f():\n    return 1\n')
+    monkeypatch.chdir(tmpdir)
+    with pytest.raises(ValueError):
+        translate_source('from local_module import f\n', 'mod_import')
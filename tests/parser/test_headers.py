@@ -2,6 +2,7 @@
 # coding: utf-8
 
 from pyccel.parser.syntax.headers import parse
+from pyccel.parser.syntactic import SyntaxParser
 
 def test_variable():
     print (parse(stmts='#$ header variable x :: int'))
@@ -28,6 +29,19 @@ def test_macro():
     print (parse(stmts='#$ header macro (a, b), _f(x) := f(x.shape, x, a, b)'))
     print (parse(stmts='#$ header macro _dswap(x, incx) := dswap(x.shape, x, incx)'))
     print (parse(stmts="#$ header macro _dswap(x, incx=1) := dswap(x.shape, x, incx)"))
+
+def test_pickled_header_parsers(tmpdir):
+    # A header file is pickled into a .pyccel file
+    tmpdir.join('funcs.pyh').write('#$ header function twice(int)\n')
+    filename = str(tmpdir.join('funcs.pyh'))
+
+    first  = SyntaxParser(filename)
+    assert tmpdir.join('funcs.pyccel').check()
+    second = SyntaxParser(filename)
+    # Each parser gets its own copy, as the semantic stage modifies it
+    assert second.namespace is not first.namespace
+    assert second.ast is not first.ast
+    assert second.syntax_done
     print (parse(stmts='#$ header macro _dswap(x, y, incx=1, incy=1) := dswap(x.shape, x, incx, y, incy)'))
 
 ######################
@@ -0,0 +1,84 @@
+# pylint: disable=missing-function-docstring, missing-module-docstring/
+import os
+import shutil
+
+from pyccel.ast.headers import FunctionHeader
+from pyccel.errors.errors import Errors
+from pyccel.parser.header_index import build_header_index, find_indexed_header
+from pyccel.parser.parser import Parser
+
+stdlib_folder = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(
+                    os.path.abspath(__file__)))), 'pyccel', 'stdlib', 'internal')
+
+first_code = '''
+from pyccel.decorators import types
+from lapack import dgetrf
+
+@types('real[:,:](order=F)', 'int[:]')
+def factorise(a, piv):
+    n = a.shape[0]
+    info = -1
+    dgetrf(n, n, a, n, piv, info)
+'''
+
+second_code = '''
+from lapack import dgetrs
+from first import factorise
+'''
+
+#==============================================================================
+# UTILITIES
+#==============================================================================
+
+def copy_headers(folder, *names):
+    for name in names:
+        shutil.copy(os.path.join(stdlib_folder, name), str(folder))
+
+#------------------------------------------------------------------------------
+def header_names(parser):
+    return sorted(str(s.name) for s in parser.syntax_parser.ast.body
+                              if isinstance(s, FunctionHeader))
+
+#==============================================================================
+# TESTS
+#==============================================================================
+
+def test_build_header_index(tmpdir):
+    copy_headers(tmpdir, 'lapack.pyh', 'blas.pyh')
+    tmpdir.join('broken.pyh').write('#$ header function f(\n')
+
+    assert build_header_index(str(tmpdir)) == ['blas.pyh', 'lapack.pyh']
+    assert tmpdir.join('headers.index').check()
+    assert tmpdir.listdir(lambda f: f.ext == '.pyccel') == []
+
+    filename = str(tmpdir.join('lapack.pyh'))
+    code     = tmpdir.join('lapack.pyh').read()
+    header   = find_indexed_header(filename, code)
+    assert 'dgetrf' in header.symbols
+    assert header.metavars['ignore_at_import'] == 'True'
+    # Both signatures of the interface are read
+    assert [s.name for s in header.read(['dgetrf', 'unknown'])] == ['dgetrf', 'dgetrf']
+
+    # A header which was modified is not read from the index
+    assert find_indexed_header(filename, code + '\n') is None
+
+#------------------------------------------------------------------------------
+def test_lazy_header_symbols(tmpdir, monkeypatch):
+    copy_headers(tmpdir, 'lapack.pyh')
+    build_header_index(str(tmpdir))
+    tmpdir.join('first.py').write(first_code)
+    tmpdir.join('second.py').write(second_code)
+    monkeypatch.chdir(tmpdir)
+
+    parser = Parser(str(tmpdir.join('second.py')))
+    parser.parse()
+    lapack = parser.d_parsers['lapack']
+
+    # Only the imported symbols are read from the index, whichever module
+    # imports them
+    assert header_names(lapack) == ['dgetrf', 'dgetrf', 'dgetrs', 'dgetrs']
+    assert tmpdir.listdir(lambda f: f.ext == '.pyccel') == []
+
+    parser.annotate()
+    assert not Errors().has_errors()
+    assert sorted(lapack.namespace.functions) == ['dgetrf', 'dgetrs']
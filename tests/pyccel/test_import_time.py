@@ -0,0 +1,55 @@
+# pylint: disable=missing-function-docstring, missing-module-docstring/
+import subprocess
+import sys
+import pytest
+
+from pyccel.parser.syntax.basic import get_metamodel
+from pyccel.parser.syntax.openmp import omp_classes, parse as omp_parse
+
+#==============================================================================
+# UTILITIES
+#==============================================================================
+
+def run_python(code, *options):
+    """ Run some code in a fresh interpreter and return its output
+    """
+    p = subprocess.run([sys.executable, *options, '-c', code],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            universal_newlines=True, check=True)
+    return p.stdout, p.stderr
+
+#------------------------------------------------------------------------------
+def import_time(module):
+    """ Cumulative time (in us) spent importing a module in a fresh interpreter
+    """
+    _, timings = run_python('import {}'.format(module), '-X', 'importtime')
+    for line in timings.splitlines():
+        _, _, cumulative, name = (s.strip() for s in line.replace(':','|').split('|'))
+        if name == module:
+            return int(cumulative)
+    raise ValueError("{} was not imported".format(module))
+
+#==============================================================================
+# TESTS
+#==============================================================================
+
+def test_lazy_imports():
+    out, _ = run_python('import sys, pyccel.epyccel, pyccel.commands.console;'
+                        'print(*[m for m in ("sympy", "textx") if m in sys.modules])')
+    assert out.split() == []
+
+#------------------------------------------------------------------------------
+@pytest.mark.benchmark
+def test_import_time_benchmark():
+    # Importing pyccel must be cheaper than importing sympy alone
+    pyccel_time = import_time('pyccel.epyccel')
+    sympy_time  = import_time('sympy')
+    print('pyccel.epyccel : {:.3f}s'.format(pyccel_time*1e-6))
+    print('sympy          : {:.3f}s'.format(sympy_time*1e-6))
+    assert pyccel_time < sympy_time
+
+#------------------------------------------------------------------------------
+def test_metamodel_cache():
+    omp_parse(stmts='#$ omp parallel')
+    meta = get_metamodel('openmp.tx', omp_classes)
+    assert get_metamodel('openmp.tx', omp_classes) is meta
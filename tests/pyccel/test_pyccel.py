@@ -1,5 +1,6 @@
 # pylint: disable=missing-function-docstring, missing-module-docstring/
 import subprocess
+import json
 import os
 import shutil
 import sys
@@ -306,6 +307,173 @@ def test_imports(language):
     pyccel_test("scripts/runtest_imports.py","scripts/funcs.py",
             language = language)
 
+#------------------------------------------------------------------------------
+@pytest.mark.xdist_incompatible
+def test_imports_not_compiled(language):
+    # The imported module is generated and compiled with the program
+    pyccel_test("scripts/runtest_imports.py", language = language,
+            pyccel_commands = "-j 2")
+
+#------------------------------------------------------------------------------
+def test_incremental_rebuild(tmp_path, language):
+    dep_code = ("from pyccel.decorators import types\n"
+                "@types('int')\n"
+                "def f(x):\n"
+                "    return x+{}\n")
+    (tmp_path / "incr_funcs.py").write_text(dep_code.format(1))
+    (tmp_path / "incr_main.py").write_text("from incr_funcs import f\nprint(f(3))\n")
+    main_file = str(tmp_path / "incr_main.py")
+    language_opt = '--language={}'.format(language)
+
+    compile_pyccel(str(tmp_path), "incr_main.py", language_opt)
+    exe = get_exe(main_file)
+    mtime = os.path.getmtime(exe)
+    assert get_lang_output(exe).strip() == '4'
+
+    # Nothing has changed so nothing is rebuilt
+    compile_pyccel(str(tmp_path), "incr_main.py", language_opt)
+    assert os.path.getmtime(exe) == mtime
+
+    # The program is rebuilt when an import changes
+    (tmp_path / "incr_funcs.py").write_text(dep_code.format(2))
+    compile_pyccel(str(tmp_path), "incr_main.py", language_opt)
+    assert get_lang_output(exe).strip() == '5'
+
+#------------------------------------------------------------------------------
+def test_dependency_rebuild(tmp_path, language):
+    (tmp_path / "drb_funcs.py").write_text("from pyccel.decorators import types\n"
+                                           "@types('int')\n"
+                                           "def f(x):\n"
+                                           "    return x+1\n")
+    (tmp_path / "drb_main.py").write_text("from drb_funcs import f\nprint(f(3))\n")
+    dep_obj = tmp_path / "__pyccel__" / "drb_funcs.o"
+    language_opt = '--language={}'.format(language)
+
+    compile_pyccel(str(tmp_path), "drb_main.py", language_opt)
+    mtime = dep_obj.stat().st_mtime_ns
+
+    # The object of the imported module is rebuilt when the flags change
+    compile_pyccel(str(tmp_path), "drb_main.py", language_opt + " --debug")
+    assert dep_obj.stat().st_mtime_ns != mtime
+    mtime = dep_obj.stat().st_mtime_ns
+
+    compile_pyccel(str(tmp_path), "drb_main.py", language_opt + " --debug")
+    assert dep_obj.stat().st_mtime_ns == mtime
+
+    # An object which is not described by the manifest is rebuilt
+    (tmp_path / "__pyccel__" / "manifest.json").unlink()
+    compile_pyccel(str(tmp_path), "drb_main.py", language_opt + " --debug")
+    assert dep_obj.stat().st_mtime_ns != mtime
+    assert get_lang_output(get_exe(str(tmp_path / "drb_main.py"))).strip() == '4'
+
+#------------------------------------------------------------------------------
+def test_multiple_files(tmp_path, language):
+    code = ("from pyccel.decorators import types\n"
+            "@types('int')\n"
+            "def {name}(x):\n"
+            "    return x+{value}\n")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "mult_a.py").write_text(code.format(name='fa', value=1))
+    (tmp_path / "sub" / "mult_b.py").write_text(code.format(name='fb', value=2))
+
+    # A file and a folder are built by the same command
+    compile_pyccel(str(tmp_path), "mult_a.py", "sub --language={}".format(language))
+
+    p = subprocess.Popen([sys.executable, "-c",
+            "import sys; sys.path.insert(0, 'sub'); import mult_a, mult_b; "
+            "print(mult_a.fa(1), mult_b.fb(1)); print(mult_a.__file__, mult_b.__file__)"],
+            stdout=subprocess.PIPE, universal_newlines=True, cwd=str(tmp_path))
+    out, _ = p.communicate()
+    assert p.returncode == 0
+    values, files = out.split('\n')[:2]
+    assert values == '2 3'
+    assert not any(f.endswith('.py') for f in files.split())
+
+#------------------------------------------------------------------------------
+def test_profile_build(tmp_path, language):
+    code = ("from pyccel.decorators import types\n"
+            "@types('int')\n"
+            "def f(x):\n"
+            "    return x+1\n")
+    (tmp_path / "prof_mod.py").write_text(code)
+
+    compile_pyccel(str(tmp_path), "prof_mod.py",
+            "--language={} --profile-build=trace.json".format(language))
+
+    with open(str(tmp_path / "trace.json")) as f:
+        events = json.load(f)['traceEvents']
+    stages = {e['name'] for e in events if e['cat'] == 'stage'}
+
+    assert {'build', 'syntax', 'semantic', 'codegen'} <= stages
+    assert all(e['ph'] == 'X' and e['dur'] >= 0 for e in events)
+    if language != 'python':
+        assert {'compilation', 'wrapper'} <= stages
+        assert any(e['cat'] == 'subprocess' for e in events)
+
+#------------------------------------------------------------------------------
+def test_pgo_build(tmp_path, language):
+    code = ("from pyccel.decorators import types\n"
+            "@types('int')\n"
+            "def f(x):\n"
+            "    return x+1 if x > 2 else x-1\n")
+    train = ("from pgo_mod import f\n"
+             "print(sum(f(i) for i in range(100)))\n")
+    (tmp_path / "pgo_mod.py").write_text(code)
+    (tmp_path / "train.py").write_text(train)
+
+    compile_pyccel(str(tmp_path), "pgo_mod.py",
+            "--language={} --pgo-train=train.py".format(language))
+
+    profile_dir = tmp_path / "__pyccel__" / "__pgo__" / "pgo_mod"
+    assert (profile_dir / "profile.key").exists()
+    assert any(profile_dir.glob('**/*.gcda'))
+    assert get_python_output(str(tmp_path / "train.py"), cwd=str(tmp_path)).strip() == '5044'
+
+#------------------------------------------------------------------------------
+def test_toolchain_cache(tmp_path):
+    code = ("import json\n"
+            "from pyccel.codegen.toolchain import Toolchain\n"
+            "print(json.dumps(Toolchain().get_compiler_info('gcc')))\n")
+    env = dict(os.environ, PYCCEL_CACHE_DIR = str(tmp_path))
+    cache_file = tmp_path / 'toolchains.json'
+
+    first = json.loads(subprocess.check_output([sys.executable, '-c', code], env=env))
+    assert first['path'] == shutil.which('gcc')
+    assert '-fopenmp' in first['openmp_flags']
+    assert cache_file.exists()
+    mtime = cache_file.stat().st_mtime_ns
+
+    # The second run reads the information from the cache
+    second = json.loads(subprocess.check_output([sys.executable, '-c', code], env=env))
+    assert second == first
+    assert cache_file.stat().st_mtime_ns == mtime
+
+#------------------------------------------------------------------------------
+def test_python_build_environment(tmp_path):
+    code = ("import json\n"
+            "from pyccel.codegen.toolchain import Toolchain\n"
+            "print(json.dumps(Toolchain().get_python_info()))\n")
+    env = dict(os.environ, PYCCEL_CACHE_DIR = str(tmp_path))
+    for var in ('CC', 'LDSHARED', 'CFLAGS', 'CPPFLAGS', 'LDFLAGS'):
+        env.pop(var, None)
+    default = json.loads(subprocess.check_output([sys.executable, '-c', code], env=env))
+
+    # The environment variables are applied on top of the configuration
+    # of the Python installation, as in distutils
+    env.update(CC = 'gcc -DPYCCEL_CC', CFLAGS = '-DPYCCEL_CFLAGS',
+               LDFLAGS = '-L/pyccel/ldflags')
+    custom = json.loads(subprocess.check_output([sys.executable, '-c', code], env=env))
+    assert custom['cc'] == ['gcc', '-DPYCCEL_CC']
+    assert custom['cflags'] == default['cflags'] + ['-DPYCCEL_CFLAGS']
+    assert custom['ldshared'][-2:] == ['-L/pyccel/ldflags', '-DPYCCEL_CFLAGS']
+
+    env['LDSHARED'] = 'gcc -shared'
+    custom = json.loads(subprocess.check_output([sys.executable, '-c', code], env=env))
+    assert custom['ldshared'] == ['gcc', '-shared', '-L/pyccel/ldflags', '-DPYCCEL_CFLAGS']
+
+    # The overrides are not saved in the cache
+    assert 'PYCCEL' not in (tmp_path / 'toolchains.json').read_text()
+
 #------------------------------------------------------------------------------
 @pytest.mark.xdist_incompatible
 def test_folder_imports_python_accessible_folder(language):
@@ -0,0 +1,126 @@
+# pylint: disable=missing-function-docstring, missing-module-docstring/
+import importlib
+import os
+import sys
+import pytest
+import numpy as np
+
+from pyccel.codegen.pipeline import execute_pyccel
+from pyccel.parser.parser import Parser
+from pyccel.parser.semantic import SemanticParser
+
+util_code = '''
+from pyccel.decorators import types, template
+
+@types('real[:]')
+def total(x):
+    s = 0.0
+    for xi in x:
+        s += xi
+    if s < 0.0:
+        print('negative total')
+    return s
+
+@template('T', types=['int', 'real'])
+@types('T')
+def twice(a):
+    return {factor}*a
+'''
+
+main_code = '''
+from pyccel.decorators import types
+from {util} import total, twice
+
+@types('real[:]')
+def mean(x):
+    return total(x) / x.shape[0] + twice(1)
+'''
+
+#==============================================================================
+# UTILITIES
+#==============================================================================
+
+def write_modules(folder, util, factor=2):
+    folder.join(util+'.py').write(util_code.format(factor=factor))
+    folder.join('main_'+util+'.py').write(main_code.format(util=util))
+    return str(folder.join('main_'+util+'.py'))
+
+#------------------------------------------------------------------------------
+def annotate(filename):
+    parser = Parser(filename)
+    parser.parse()
+    parser.annotate()
+    return parser
+
+#------------------------------------------------------------------------------
+@pytest.fixture
+def count_annotations(monkeypatch):
+    """ Count the number of modules annotated by the semantic stage
+    """
+    annotated = []
+    annotate_module = SemanticParser.annotate
+    def counted_annotate(self, **settings):
+        annotated.append(os.path.basename(self.filename))
+        return annotate_module(self, **settings)
+    monkeypatch.setattr(SemanticParser, 'annotate', counted_annotate)
+    return annotated
+
+#==============================================================================
+# TESTS
+#==============================================================================
+
+# The semantic stage is only cached from python 3.8
+pytestmark = pytest.mark.skipif(sys.version_info < (3, 8),
+                                reason = "Requires Pickler.reducer_override")
+
+def test_semantic_cache(tmpdir, count_annotations):
+    filename = write_modules(tmpdir, 'util_cache')
+    parser = annotate(filename)
+    assert count_annotations == ['util_cache.py', 'main_util_cache.py']
+    assert tmpdir.join('__pyccel__', 'util_cache.semantic').check()
+    functions = list(parser.sons[0].namespace.functions)
+
+    # Only the imported modules are cached
+    assert not tmpdir.join('__pyccel__', 'main_util_cache.semantic').check()
+
+    # The sons are read from the cache
+    count_annotations.clear()
+    parser = annotate(filename)
+    assert count_annotations == ['main_util_cache.py']
+    assert list(parser.sons[0].namespace.functions) == functions
+    assert 'mean' in parser.namespace.functions
+
+    # A change in an imported file invalidates the dependent caches
+    write_modules(tmpdir, 'util_cache', factor=3)
+    count_annotations.clear()
+    annotate(filename)
+    assert count_annotations == ['util_cache.py', 'main_util_cache.py']
+
+#------------------------------------------------------------------------------
+@pytest.mark.parametrize( 'language', [
+        pytest.param("fortran", marks = pytest.mark.fortran),
+        pytest.param("c", marks = pytest.mark.c),
+    ]
+)
+def test_build_from_semantic_cache(tmpdir, monkeypatch, language, count_annotations):
+    util = 'util_build_' + language
+    filename = write_modules(tmpdir, util)
+    monkeypatch.chdir(tmpdir)
+    monkeypatch.syspath_prepend(str(tmpdir))
+
+    execute_pyccel(filename, language=language)
+    assert len(count_annotations) == 2
+
+    # Remove the build products so that the code is generated again from
+    # the cached trees
+    for f in tmpdir.listdir(lambda f: f.ext == '.so'):
+        f.remove()
+    for f in tmpdir.join('__pyccel__').listdir(lambda f: f.ext in ('.o', '.json')):
+        f.remove()
+    count_annotations.clear()
+    execute_pyccel(filename, language=language)
+    assert count_annotations == ['main_'+util+'.py']
+
+    mod = importlib.import_module('main_'+util)
+    assert mod.mean(np.arange(4.0)) == 3.5
+    del sys.modules['main_'+util]
@@ -0,0 +1,202 @@
+# pylint: disable=missing-function-docstring, missing-module-docstring/
+import gc
+import time
+import pytest
+
+from pyccel.ast.basic import Basic, Visitor
+from pyccel.codegen.codegen import Codegen, printer_registry
+from pyccel.codegen.printing.codeprinter import CodePrinter
+from pyccel.codegen.python_wrapper import generate_wrapper_files
+from pyccel.errors.errors import Errors
+from pyccel.parser.parser import Parser
+from pyccel.parser.semantic import SemanticParser
+
+#==============================================================================
+# UTILITIES
+#==============================================================================
+
+def synthetic_module(n):
+    """ Code of a module containing n similar functions
+    """
+    lines = ['from pyccel.decorators import types']
+    for i in range(n):
+        lines += ["@types('real[:]', 'int')",
+                  "def f{}(x, n):".format(i),
+                  "    s = 0.0",
+                  "    for j in range(n):",
+                  "        if x[j] > {}.0:".format(i),
+                  "            s += x[j]*2.0 - {}.0/(j+1)".format(i),
+                  "        else:",
+                  "            s -= abs(x[j]) + j % 3",
+                  "    return s",
+                  ""]
+    return '\n'.join(lines)
+
+#------------------------------------------------------------------------------
+def timed(func, *args):
+    """ Call a function and return the elapsed time
+    """
+    gc.collect()
+    gc.disable()
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    gc.enable()
+    return elapsed
+
+#------------------------------------------------------------------------------
+def translate(folder, code, language):
+    """ Translate a module and print its wrapper. Return the code generator
+    """
+    name = 'dispatch_{}'.format(language)
+    # The code is passed as a string so that the semantic stage is not cached
+    parser = Parser(str(folder.join(name + '.py')), code = code)
+    parser.parse()
+    parser.annotate()
+    codegen = Codegen(parser.semantic_parser, name)
+    codegen.export(str(folder.join(name)), language = language)
+    generate_wrapper_files(codegen, language, str(folder))
+    assert not Errors().has_errors()
+    return codegen
+
+#------------------------------------------------------------------------------
+def read_outputs(folder):
+    """ Lines of the generated files. The order of the lines is not
+    significant as the order of some imports is not deterministic
+    """
+    return {f.basename : sorted(f.readlines()) for f in
+            folder.listdir(lambda f: f.ext in ('.f90', '.c', '.h', '.py'))}
+
+#------------------------------------------------------------------------------
+def walk(node):
+    """ All the nodes of a tree
+    """
+    yield node
+    for name in node._attribute_nodes:
+        attr = getattr(node, name)
+        for n in (attr if isinstance(attr, tuple) else (attr,)):
+            if isinstance(n, Basic):
+                yield from walk(n)
+
+#------------------------------------------------------------------------------
+def find_methods(visitor, nodes):
+    """ Find the method used for each node with the dispatch table
+    """
+    for n in nodes:
+        try:
+            visitor._dispatch_table[type(n)]
+        except KeyError:
+            visitor._add_to_dispatch_table(type(n))
+
+def legacy_find_methods(visitor, nodes):
+    """ Find the method used for each node by searching the method
+    resolution order
+    """
+    for n in nodes:
+        for cls in type(n).__mro__:
+            if hasattr(visitor, visitor._visitor_prefix + cls.__name__):
+                break
+
+#------------------------------------------------------------------------------
+def legacy_print(self, expr):
+    """ CodePrinter._print without dispatch table
+    """
+    for cls in type(expr).__mro__:
+        print_method = '_print_' + cls.__name__
+        if hasattr(self, print_method):
+            return getattr(self, print_method)(expr)
+    return self._print_not_supported(expr)
+
+def legacy_visit(self, expr, **settings):
+    """ SemanticParser._visit without dispatch table
+    """
+    current_fst = self._current_fst_node
+    if hasattr(expr,'fst') and expr.fst is not None:
+        self._current_fst_node = expr.fst
+    for cls in type(expr).__mro__:
+        annotation_method = '_visit_' + cls.__name__
+        if hasattr(self, annotation_method):
+            obj = getattr(self, annotation_method)(expr, **settings)
+            if isinstance(obj, Basic) and self._current_fst_node:
+                obj.set_fst(self._current_fst_node)
+            self._current_fst_node = current_fst
+            return obj
+    raise NotImplementedError(type(expr))
+
+#==============================================================================
+# TESTS
+#==============================================================================
+
+def test_dispatch_table():
+    class Node(Basic):
+        __slots__ = ()
+        _attribute_nodes = ()
+    class SubNode(Node):
+        __slots__ = ()
+    class Printer(Visitor):
+        _visitor_prefix = '_print_'
+        def _print_Node(self, expr):
+            return 'Node'
+    class SubPrinter(Printer):
+        def _print_SubNode(self, expr):
+            return 'SubNode'
+
+    assert Printer._add_to_dispatch_table(SubNode) is Printer._print_Node
+    assert Printer._add_to_dispatch_table(int) is None
+    assert SubPrinter._add_to_dispatch_table(SubNode) is SubPrinter._print_SubNode
+    # Each class has its own table
+    assert Printer._dispatch_table == {SubNode : Printer._print_Node, int : None}
+    assert SubPrinter._dispatch_table == {SubNode : SubPrinter._print_SubNode}
+
+#------------------------------------------------------------------------------
+@pytest.mark.parametrize( 'language', [
+        pytest.param("fortran", marks = pytest.mark.fortran),
+        pytest.param("c", marks = pytest.mark.c),
+    ]
+)
+def test_dispatch_outputs(tmpdir, monkeypatch, language):
+    code = synthetic_module(20)
+
+    translate(tmpdir, code, language)
+    outputs = read_outputs(tmpdir)
+
+    with monkeypatch.context() as m:
+        m.setattr(CodePrinter, '_print', legacy_print)
+        m.setattr(SemanticParser, '_visit', legacy_visit)
+        translate(tmpdir, code, language)
+        legacy_outputs = read_outputs(tmpdir)
+
+    assert outputs == legacy_outputs
+
+#------------------------------------------------------------------------------
+@pytest.mark.benchmark
+@pytest.mark.parametrize( 'language', [
+        pytest.param("fortran", marks = pytest.mark.fortran),
+        pytest.param("c", marks = pytest.mark.c),
+    ]
+)
+def test_dispatch_benchmark(tmpdir, monkeypatch, language):
+    code = synthetic_module(150)
+
+    # The first translation builds the dispatch tables
+    translate(tmpdir, code, language)
+    translation_time = timed(translate, tmpdir, code, language)
+
+    with monkeypatch.context() as m:
+        m.setattr(CodePrinter, '_print', legacy_print)
+        m.setattr(SemanticParser, '_visit', legacy_visit)
+        legacy_translation_time = timed(translate, tmpdir, code, language)
+        codegen                 = translate(tmpdir, code, language)
+
+    print('translation : {:.3f}s (legacy dispatch : {:.3f}s)'.format(
+            translation_time, legacy_translation_time))
+
+    # The translation time is too noisy to be compared reliably, so the
+    # time spent finding the methods is measured on the nodes of the module
+    nodes   = list(walk(codegen.expr)) * 10
+    printer = printer_registry[language]
+    dispatch_time        = min(timed(find_methods, printer, nodes) for _ in range(3))
+    legacy_dispatch_time = min(timed(legacy_find_methods, printer, nodes) for _ in range(3))
+    print('dispatch of {} nodes : {:.3f}s (legacy dispatch : {:.3f}s)'.format(
+            len(nodes), dispatch_time, legacy_dispatch_time))
+    assert dispatch_time < legacy_dispatch_time